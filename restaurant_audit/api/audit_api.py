@@ -3,9 +3,31 @@
 
 import frappe
 from frappe import _
-from frappe.utils import getdate, add_days, nowdate, get_weekday
+from frappe.utils import getdate, add_days, nowdate, get_weekday, cint
 from datetime import datetime, timedelta
 
+from restaurant_audit.auditor_context import get_auditor_context, get_open_progress
+from restaurant_audit.restaurant_audit.doctype.auditor_dashboard_stats.auditor_dashboard_stats import get_dashboard_stats
+from restaurant_audit.restaurant_audit.doctype.daily_audit_template.daily_audit_template import record_template_use
+from restaurant_audit.restaurant_audit.doctype.location_check_log.location_check_log import buffer_location_check
+from restaurant_audit.geo import (
+    get_assigned_restaurants,
+    get_distances,
+    get_nearest_restaurant,
+    get_restaurant_coordinates,
+    haversine,
+)
+from restaurant_audit.scoring import get_scoring_plan, score_answers
+from restaurant_audit.week_calendar import get_user_week, get_week_start_day, get_week_windows
+
+MAX_SCHEDULE_BATCH = 50
+SCHEDULED_VISIT_COLUMNS = [
+    "name", "creation", "modified", "owner", "modified_by", "docstatus",
+    "restaurant", "restaurant_name", "auditor", "visit_date",
+    "week_start_date", "week_end_date", "status", "notified", "overdue_notified"
+]
+MAX_SUMMARY_WEEKS = 52
+
 @frappe.whitelist()
 def schedule_audit_visit(restaurant, visit_date):
     """Create a new scheduled audit visit"""
@@ -100,19 +122,8 @@ def get_my_scheduled_visits():
     try:
         current_user = frappe.session.user
         
-        # Get current user's employee record to determine week start
-        employee_id = frappe.db.get_value("Employee", {"user_id": current_user}, "name")
-        if not employee_id:
-            # Fallback to Monday if no employee record
-            today = getdate()
-            days_since_monday = today.weekday()
-            week_start = add_days(today, -days_since_monday)
-            week_end = add_days(week_start, 6)
-        else:
-            # Use employee's flexible week start
-            today = getdate()
-            week_start = get_week_start_for_employee_inline(employee_id, today)
-            week_end = get_week_end_for_employee_inline(employee_id, week_start)
+        # Current week under the employee's week start day (Monday without one)
+        week_start, week_end = get_user_week(current_user)
         
         # Get scheduled visits for current week (exclude cancelled)
         visits = frappe.get_all("Scheduled Audit Visit",
@@ -151,9 +162,7 @@ def get_scheduled_visits_by_week(week_start=None):
         
         # If no week_start provided, use current week
         if not week_start:
-            today = getdate()
-            days_since_monday = today.weekday()
-            week_start = add_days(today, -days_since_monday)
+            week_start, _ = get_user_week(current_user)
         else:
             week_start = getdate(week_start)
         
@@ -194,108 +203,15 @@ def get_scheduled_visits_by_week(week_start=None):
 def get_restaurants():
     """Get restaurants assigned to current user - with status checking"""
     try:
-        current_user = frappe.session.user
-        
-        # Check if User is enabled in ERPNext
-        user_enabled = frappe.db.get_value("User", current_user, "enabled")
-        if not user_enabled:
-            return {
-                "success": True,
-                "restaurants": [],
-                "message": "User account is disabled"
-            }
-        
-        # Get employee record for current user
-        employee = frappe.db.get_value("Employee", {"user_id": current_user}, "name")
-        
-        if not employee:
-            return {
-                "success": True,
-                "restaurants": [],
-                "message": "No employee record found for current user"
-            }
+        context = get_auditor_context()
         
-        # Check if Employee is active in ERPNext
-        employee_status = frappe.db.get_value("Employee", employee, "status")
-        if employee_status != "Active":
-            return {
-                "success": True,
-                "restaurants": [],
-                "message": f"Employee status is {employee_status}"
-            }
-        
-        # Get restaurants assigned to this employee
-        assigned_restaurants = frappe.get_all("Restaurant Employee",
-            filters={"employee": employee},
-            fields=["parent", "is_active", "employee_status"]
-        )
-        
-        if not assigned_restaurants:
-            return {
-                "success": True,
-                "restaurants": [],
-                "message": "No restaurants assigned to this employee"
-            }
-        
-        # Filter only active assignments
-        active_restaurant_ids = [
-            r.parent for r in assigned_restaurants 
-            if r.is_active and r.employee_status == "Active"
-        ]
-        
-        if not active_restaurant_ids:
-            return {
-                "success": True,
-                "restaurants": [],
-                "message": "No active restaurant assignments found"
-            }
-        
-        # Get restaurant details
-        restaurants = frappe.get_all("Restaurant",
-            filters={"name": ["in", active_restaurant_ids]},
-            fields=[
-                "name", "restaurant_name", "address", "latitude", "longitude",
-                "location_radius", "restaurant_manager"
-            ]
-        )
-        
-        # Add additional data for each restaurant
-        for restaurant in restaurants:
-            # Get employee details
-            employee_doc = frappe.get_doc("Employee", employee)
-            restaurant.employee_name = employee_doc.employee_name
-            restaurant.designation = employee_doc.designation
-            
-            # Get last audit date
-            last_audit = frappe.db.get_value("Audit Submission",
-                filters={"restaurant": restaurant.name},
-                fieldname="audit_date",
-                order_by="audit_date desc"
-            )
-            
-            restaurant.last_audit_date = last_audit
-            
-            # Get total audits count
-            restaurant.total_audits = frappe.db.count("Audit Submission",
-                filters={"restaurant": restaurant.name}
-            )
-            
-            # Get my audits count
-            restaurant.my_audits = frappe.db.count("Audit Submission",
-                filters={"restaurant": restaurant.name, "auditor": current_user}
-            )
-            
-            # Check for pending progress
-            restaurant.has_progress = frappe.db.get_value("Audit Progress", {
-                "restaurant": restaurant.name,
-                "auditor": current_user,
-                "is_completed": 0
-            }, "name") is not None
-        
-        return {
+        response = {
             "success": True,
-            "restaurants": restaurants
+            "restaurants": get_restaurant_cards(context)
         }
+        if context.message:
+            response["message"] = context.message
+        return response
         
     except Exception as e:
         frappe.log_error(f"Error getting restaurants: {str(e)}", "Get Restaurants")
@@ -305,6 +221,50 @@ def get_restaurants():
             "restaurants": []
         }
 
+def get_restaurant_cards(context):
+    """Assigned restaurants with audit counters and the auditor's open progress"""
+    if not context.restaurants:
+        return []
+    
+    # Get restaurant details; audit totals are counters kept by Audit Submission
+    restaurants = frappe.get_all("Restaurant",
+        filters={"name": ["in", context.restaurants]},
+        fields=[
+            "name", "restaurant_name", "address", "latitude", "longitude",
+            "location_radius", "restaurant_manager", "last_audit_date", "total_audits"
+        ]
+    )
+    
+    # Per-auditor counters and open progress for all restaurants at once
+    my_audits = dict(frappe.get_all("Restaurant Auditor Stats",
+        filters={"restaurant": ["in", context.restaurants], "auditor": context.user},
+        fields=["restaurant", "audit_count"],
+        as_list=True
+    ))
+    
+    progress_by_restaurant = {}
+    for progress in get_open_progress(context.user):
+        progress_by_restaurant.setdefault(progress.restaurant, progress)
+    
+    # Add additional data for each restaurant
+    for restaurant in restaurants:
+        restaurant.employee_name = context.employee.employee_name
+        restaurant.designation = context.employee.designation
+        restaurant.total_audits = restaurant.total_audits or 0
+        restaurant.my_audits = my_audits.get(restaurant.name, 0)
+        
+        progress = progress_by_restaurant.get(restaurant.name)
+        restaurant.has_progress = bool(progress)
+        if progress:
+            restaurant.progress_data = {
+                "progress_id": progress.name,
+                "last_updated": progress.last_updated,
+                "completion_percentage": progress.completion_percentage,
+                "answers": frappe.parse_json(progress.answers_json or "{}")
+            }
+    
+    return restaurants
+
 # Add this method to check user can start audit
 @frappe.whitelist()
 def can_start_audit(restaurant_id):
@@ -414,51 +374,12 @@ def get_template_status(template_name):
         }
 
 @frappe.whitelist()
-def get_user_dashboard():
-    """Get dashboard data for current user"""
+def get_user_dashboard(window=None):
+    """Get dashboard data for current user; `window` (30 or 90) limits the stats to recent days"""
     try:
-        current_user = frappe.session.user
-        
-        # Get user details
-        user_doc = frappe.get_doc("User", current_user)
-        
-        # Get employee record
-        employee = frappe.db.get_value("Employee", {"user_id": current_user}, 
-            ["name", "employee_name", "designation"], as_dict=True)
-        
-        # Get audit statistics
-        total_audits = frappe.db.count("Audit Submission", {"auditor": current_user})
-        
-        # Get average score
-        avg_score_result = frappe.db.sql("""
-            SELECT AVG(average_score) as avg_score 
-            FROM `tabAudit Submission` 
-            WHERE auditor = %s AND average_score IS NOT NULL
-        """, (current_user,))
-        
-        avg_score = avg_score_result[0][0] if avg_score_result and avg_score_result[0][0] else 0
-        
-        # Get pending progress
-        pending_progress = frappe.get_all("Audit Progress",
-            filters={"auditor": current_user, "is_completed": 0},
-            fields=["name", "restaurant", "completion_percentage"]
-        )
-        
         return {
             "success": True,
-            "dashboard": {
-                "user": {
-                    "name": current_user,
-                    "full_name": user_doc.full_name,
-                    "email": user_doc.email
-                },
-                "employee": employee,
-                "stats": {
-                    "total_audits": total_audits,
-                    "avg_score": round(avg_score, 1) if avg_score else 0
-                },
-                "pending_progress": pending_progress
-            }
+            "dashboard": get_dashboard(get_auditor_context(), window)
         }
         
     except Exception as e:
@@ -468,77 +389,33 @@ def get_user_dashboard():
             "message": f"Error loading dashboard: {str(e)}"
         }
 
+def get_dashboard(context, window=None):
+    """User, employee and audit statistics of the auditor"""
+    user_info = context.user_info or frappe._dict(name=context.user)
+    employee = context.employee
+    
+    return {
+        "user": {
+            "name": context.user,
+            "full_name": user_info.full_name,
+            "email": user_info.email
+        },
+        "employee": {
+            "name": employee.name,
+            "employee_name": employee.employee_name,
+            "designation": employee.designation
+        } if employee else None,
+        # Maintained by Audit Submission / Audit Progress hooks, one row per user
+        "stats": get_dashboard_stats(context.user, window)
+    }
+
 # Add these methods to your existing audit_api.py file
 
 @frappe.whitelist()
 def get_daily_audit_questions(template_name):
     """Get daily audit questions from Daily Audit Template's question_template"""
     try:
-        # Get the template
-        template = frappe.get_doc("Daily Audit Template", template_name)
-        
-        if not template.is_currently_open():
-            return {
-                "success": False,
-                "message": "Template is currently closed",
-                "questions": []
-            }
-        
-        # Get the linked question template (Checklist Category)
-        if not template.question_template:
-            return {
-                "success": False,
-                "message": "No question template linked to this daily audit template",
-                "questions": []
-            }
-        
-        # Get the category document
-        category_doc = frappe.get_doc("Checklist Category", template.question_template)
-        
-        # Verify it's a daily audit category
-        if not category_doc.is_daily_audit:
-            return {
-                "success": False,
-                "message": "Linked template is not configured for daily audit",
-                "questions": []
-            }
-        
-        # Get questions from the category
-        category_questions = []
-        if hasattr(category_doc, 'questions') and category_doc.questions:
-            for question_row in category_doc.questions:
-                category_questions.append({
-                    "name": question_row.name,
-                    "question_text": question_row.question_text,
-                    "answer_type": question_row.answer_type,
-                    "options": question_row.options.split(',') if question_row.options else [],
-                    "allow_image_upload": question_row.allow_image_upload,
-                    "is_mandatory": question_row.is_mandatory,
-                    "question_comment": question_row.question_comment or ""
-                })
-        
-        # Format as expected by frontend (same structure as regular audit)
-        questions_data = [{
-            "category": {
-                "name": category_doc.name,
-                "category_name": category_doc.category_name,
-                "restaurant": category_doc.restaurant,
-                "overall_category_comment": category_doc.overall_category_comment
-            },
-            "questions": category_questions
-        }]
-        
-        return {
-            "success": True,
-            "template": {
-                "name": template.name,
-                "template_name": template.template_name,
-                "description": template.description,
-                "estimated_duration": template.estimated_duration
-            },
-            "questions_data": questions_data,
-            "total_questions": len(category_questions)
-        }
+        return build_daily_audit_questions(frappe.get_cached_doc("Daily Audit Template", template_name))
         
     except Exception as e:
         frappe.log_error(f"Error getting daily audit questions: {str(e)}", "Get Daily Audit Questions")
@@ -548,16 +425,81 @@ def get_daily_audit_questions(template_name):
             "questions": []
         }
 
+def build_daily_audit_questions(template):
+    """Question payload of an already loaded Daily Audit Template"""
+    if not template.is_currently_open():
+        return {
+            "success": False,
+            "message": "Template is currently closed",
+            "questions": []
+        }
+    
+    # Get the linked question template (Checklist Category)
+    if not template.question_template:
+        return {
+            "success": False,
+            "message": "No question template linked to this daily audit template",
+            "questions": []
+        }
+    
+    # Get the category document
+    category_doc = frappe.get_cached_doc("Checklist Category", template.question_template)
+    
+    # Verify it's a daily audit category
+    if not category_doc.is_daily_audit:
+        return {
+            "success": False,
+            "message": "Linked template is not configured for daily audit",
+            "questions": []
+        }
+    
+    # Get questions from the category
+    category_questions = []
+    if hasattr(category_doc, 'questions') and category_doc.questions:
+        for question_row in category_doc.questions:
+            category_questions.append({
+                "name": question_row.name,
+                "question_text": question_row.question_text,
+                "answer_type": question_row.answer_type,
+                "options": question_row.options.split(',') if question_row.options else [],
+                "allow_image_upload": question_row.allow_image_upload,
+                "is_mandatory": question_row.is_mandatory,
+                "question_comment": question_row.question_comment or ""
+            })
+    
+    # Format as expected by frontend (same structure as regular audit)
+    questions_data = [{
+        "category": {
+            "name": category_doc.name,
+            "category_name": category_doc.category_name,
+            "restaurant": category_doc.restaurant,
+            "overall_category_comment": category_doc.overall_category_comment
+        },
+        "questions": category_questions
+    }]
+    
+    return {
+        "success": True,
+        "template": {
+            "name": template.name,
+            "template_name": template.template_name,
+            "description": template.description,
+            "estimated_duration": template.estimated_duration
+        },
+        "questions_data": questions_data,
+        "total_questions": len(category_questions)
+    }
+
 # Fixed version - replace the start_daily_audit method in audit_api.py
 
 @frappe.whitelist()
-def start_daily_audit(template_name):
+def start_daily_audit(template_name, user_latitude=None, user_longitude=None):
     """Start a daily audit session"""
     try:
         current_user = frappe.session.user
         
         # Get template first to determine restaurant
-        template = frappe.get_doc("Daily Audit Template", template_name)
+        template = frappe.get_cached_doc("Daily Audit Template", template_name)
         
         if not template.is_currently_open():
             return {
@@ -566,30 +508,16 @@ def start_daily_audit(template_name):
             }
         
         # Determine which restaurant to use
-        restaurant = None
-        
-        if template.applies_to_all_restaurants:
-            # If applies to all, get user's first assigned restaurant
-            user_restaurants = get_restaurants()
-            if user_restaurants["success"] and user_restaurants["restaurants"]:
-                restaurant = user_restaurants["restaurants"][0]["name"]
-        elif template.restaurant:
-            # If template has specific restaurant, use that
-            restaurant = template.restaurant
-        else:
-            # Fallback: get user's first assigned restaurant
-            user_restaurants = get_restaurants()
-            if user_restaurants["success"] and user_restaurants["restaurants"]:
-                restaurant = user_restaurants["restaurants"][0]["name"]
+        restaurant, message = resolve_daily_audit_restaurant(template, user_latitude, user_longitude)
         
         if not restaurant:
             return {
                 "success": False,
-                "message": "No restaurant available for daily audit"
+                "message": message
             }
         
-        # Get template and questions
-        questions_response = get_daily_audit_questions(template_name)
+        # Get questions from the template already loaded
+        questions_response = build_daily_audit_questions(template)
         
         if not questions_response["success"]:
             return questions_response
@@ -616,12 +544,8 @@ def start_daily_audit(template_name):
         
         progress.insert(ignore_permissions=True)
         
-        # Update template last used date
-        try:
-            template.update_last_used()
-        except:
-            # If update_last_used method doesn't exist, just continue
-            pass
+        # Count the use in Redis; written to the template by flush_template_usage
+        record_template_use(template.name)
         
         return {
             "success": True,
@@ -718,8 +642,9 @@ def get_checklist_template(restaurant_id):
 def validate_location(restaurant_id, user_latitude, user_longitude):
     """Validate user location against restaurant location"""
     try:
-        # Get restaurant location details
-        restaurant = frappe.get_doc("Restaurant", restaurant_id)
+        # Get restaurant location details (served from the document cache)
+        restaurant = frappe.get_cached_value("Restaurant", restaurant_id,
+            ["latitude", "longitude", "location_radius"], as_dict=True)
         
         if not restaurant.latitude or not restaurant.longitude:
             return {
@@ -730,33 +655,14 @@ def validate_location(restaurant_id, user_latitude, user_longitude):
             }
         
         # Calculate distance using Haversine formula
-        from math import radians, cos, sin, asin, sqrt
-        
-        # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(radians, [
-            float(user_latitude), 
-            float(user_longitude),
-            float(restaurant.latitude), 
-            float(restaurant.longitude)
-        ])
-        
-        # Haversine formula
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        
-        # Radius of earth in meters
-        r = 6371000
-        distance = c * r
+        distance = float(haversine(user_latitude, user_longitude, [restaurant.latitude], [restaurant.longitude])[0])
         
         allowed_radius = restaurant.location_radius or 100
         is_within_range = distance <= allowed_radius
         
-        # Log location check
+        # Log location check; buffered in Redis and bulk-inserted by a scheduled flush
         try:
-            frappe.get_doc({
-                "doctype": "Location Check Log",
+            buffer_location_check({
                 "restaurant": restaurant_id,
                 "user": frappe.session.user,
                 "check_time": frappe.utils.now(),
@@ -767,7 +673,7 @@ def validate_location(restaurant_id, user_latitude, user_longitude):
                 "restaurant_latitude": restaurant.latitude,
                 "restaurant_longitude": restaurant.longitude,
                 "allowed_radius": allowed_radius
-            }).insert(ignore_permissions=True)
+            })
         except Exception as log_error:
             # Don't fail location validation if logging fails
             frappe.log_error(f"Failed to log location check: {str(log_error)}", "Location Check Logging")
@@ -788,6 +694,26 @@ def validate_location(restaurant_id, user_latitude, user_longitude):
         }
 
 
+@frappe.whitelist()
+def get_restaurant_distances(user_latitude, user_longitude):
+    """Distance from one GPS fix to every restaurant assigned to the current user, nearest first"""
+    try:
+        restaurants = get_assigned_restaurants()
+        
+        return {
+            "success": True,
+            "restaurants": get_distances(user_latitude, user_longitude, restaurants)
+        }
+        
+    except Exception as e:
+        frappe.log_error(f"Error getting restaurant distances: {str(e)}", "Restaurant Distances")
+        return {
+            "success": False,
+            "message": f"Error calculating distances: {str(e)}",
+            "restaurants": []
+        }
+
+
 @frappe.whitelist()
 def submit_audit(restaurant_id, answers, overall_comment=""):
     """Submit completed audit"""
@@ -814,40 +740,16 @@ def submit_audit(restaurant_id, answers, overall_comment=""):
             "answers": []
         })
         
-        total_score = 0
-        max_possible_score = 0
+        # Score all answers against the cached scoring plan of their categories
+        plan = get_scoring_plan(a.get("category") for a in answers_data)
+        result = score_answers(answers_data, plan)
+        
         questions_with_images = 0
         questions_with_comments = 0
         
         # Process each answer
-        for answer_data in answers_data:
-            # Find the question in the checklist categories
-            question_text = ""
-            answer_type = "Text"
-            category_name = answer_data.get("category", "")
-            
-            try:
-                # Try to get question details from Audit Question child table
-                # Since answer_data["question_id"] is the child table row name
-                question_row = frappe.db.get_value("Audit Question", answer_data["question_id"], 
-                    ["question_text", "answer_type"], as_dict=True)
-                if question_row:
-                    question_text = question_row.question_text
-                    answer_type = question_row.answer_type
-            except:
-                question_text = f"Question {answer_data['question_id']}"
-            
-            # Calculate score
-            score = 0
-            if answer_data["answer_value"] == "Yes" or answer_data["answer_value"] == "True":
-                score = 5
-            elif answer_data["answer_value"] == "No" or answer_data["answer_value"] == "False":
-                score = 1
-            elif str(answer_data.get("answer_value", "")).isdigit():
-                score = int(answer_data["answer_value"])
-            
-            total_score += score
-            max_possible_score += 5
+        for answer_data, scored in zip(answers_data, result["answers"]):
+            question = plan.get(answer_data["question_id"]) or {}
             
             if answer_data.get("image_data"):
                 questions_with_images += 1
@@ -857,23 +759,24 @@ def submit_audit(restaurant_id, answers, overall_comment=""):
             # Add answer to submission
             audit_submission.append("answers", {
                 "question": answer_data["question_id"],
-                "question_text": question_text,
-                "category": category_name,
-                "answer_type": answer_type,
+                "question_text": question.get("question_text") or f"Question {answer_data['question_id']}",
+                "category": question.get("category") or answer_data.get("category", ""),
+                "answer_type": question.get("answer_type") or "Text",
                 "answer_value": str(answer_data["answer_value"]),
-                "numeric_score": score,
+                "numeric_score": scored["score"],
                 "selected_options": json.dumps(answer_data.get("selected_options", [])),
                 "answer_comment": answer_data.get("answer_comment", ""),
                 "image_attachment": "", # Handle file upload separately
-                "is_critical": score <= 2,
-                "requires_action": score <= 2,
+                "is_critical": scored["is_critical"],
+                "requires_action": scored["is_critical"],
                 "follow_up_required": bool(answer_data.get("answer_comment"))
             })
         
         # Calculate final scores
-        audit_submission.total_score = total_score
-        audit_submission.max_possible_score = max_possible_score
-        audit_submission.average_score = (total_score / max_possible_score * 100) if max_possible_score > 0 else 0
+        audit_submission.total_score = result["total_score"]
+        audit_submission.max_possible_score = result["max_possible_score"]
+        audit_submission.average_score = result["average_score"]
+        audit_submission.category_scores = json.dumps(result["category_scores"])
         audit_submission.total_questions = len(answers_data)
         audit_submission.questions_with_images = questions_with_images
         audit_submission.questions_with_comments = questions_with_comments
@@ -919,93 +822,11 @@ def submit_audit(restaurant_id, answers, overall_comment=""):
 def get_weekly_scheduled_audits():
     """Get scheduled audits for current week and next week only"""
     try:
-        from frappe.utils import getdate, add_days
-        
-        current_user = frappe.session.user
-        today = getdate()
-        
-        # Get current user's employee record to determine week start
-        employee_id = frappe.db.get_value("Employee", {"user_id": current_user}, "name")
-        if not employee_id:
-            # Fallback to Monday if no employee record
-            days_since_monday = today.weekday()
-            current_week_start = add_days(today, -days_since_monday)
-            current_week_end = add_days(current_week_start, 6)
-        else:
-            # Use employee's flexible week start
-            current_week_start = get_week_start_for_employee_inline(employee_id, today)
-            current_week_end = get_week_end_for_employee_inline(employee_id, current_week_start)
-        
-        # Calculate next week
-        next_week_start = add_days(current_week_end, 1)
-        next_week_end = add_days(next_week_start, 6)
-        
-        # Get currently assigned restaurants for this user
-        active_assignments = frappe.get_all("Restaurant Employee",
-            filters={
-                "employee": employee_id,
-                "is_active": 1,
-                "employee_status": "Active"
-            },
-            fields=["parent"]
-        )
-        
-        active_restaurant_ids = [a.parent for a in active_assignments]
-        
-        if not active_restaurant_ids:
-            # User has no assigned restaurants
-            return {
-                "success": True,
-                "current_week": {
-                    "start": current_week_start,
-                    "end": current_week_end,
-                    "scheduled_audits": []
-                },
-                "next_week": {
-                    "start": next_week_start,
-                    "end": next_week_end,
-                    "scheduled_audits": []
-                }
-            }
-        
-        # Get scheduled audits for current and next week only (exclude cancelled and unassigned restaurants)
-        scheduled_audits = frappe.get_all("Scheduled Audit Visit",
-            filters={
-                "auditor": current_user,
-                "restaurant": ["in", active_restaurant_ids],  # Only assigned restaurants
-                "visit_date": ["between", [current_week_start, next_week_end]],
-                "status": ["!=", "Cancelled"]  # Exclude cancelled visits
-            },
-            fields=[
-                "name", "restaurant", "restaurant_name", "visit_date", 
-                "status", "week_start_date", "week_end_date"
-            ],
-            order_by="visit_date asc"
-        )
-        
-        # Separate by week
-        current_week_audits = [
-            a for a in scheduled_audits 
-            if current_week_start <= getdate(a.visit_date) <= current_week_end
-        ]
-        
-        next_week_audits = [
-            a for a in scheduled_audits 
-            if next_week_start <= getdate(a.visit_date) <= next_week_end
-        ]
+        context = get_auditor_context()
         
         return {
             "success": True,
-            "current_week": {
-                "start": current_week_start,
-                "end": current_week_end,
-                "scheduled_audits": current_week_audits
-            },
-            "next_week": {
-                "start": next_week_start,
-                "end": next_week_end,
-                "scheduled_audits": next_week_audits
-            }
+            **split_visits_by_week(context, get_weekly_visits(context), "scheduled_audits")
         }
         
     except Exception as e:
@@ -1015,96 +836,48 @@ def get_weekly_scheduled_audits():
             "message": f"Error loading weekly scheduled audits: {str(e)}"
         }
 
+def get_weekly_visits(context):
+    """The auditor's visits in the current and next week at assigned restaurants, excluding cancelled"""
+    if not context.restaurants:
+        return []
+    
+    return frappe.get_all("Scheduled Audit Visit",
+        filters={
+            "auditor": context.user,
+            "restaurant": ["in", context.restaurants],
+            "visit_date": ["between", [context.current_week_start, context.next_week_end]],
+            "status": ["!=", "Cancelled"]
+        },
+        fields=[
+            "name", "restaurant", "restaurant_name", "visit_date",
+            "status", "week_start_date", "week_end_date"
+        ],
+        order_by="visit_date asc"
+    )
+
+def split_visits_by_week(context, visits, key):
+    """{"current_week": {start, end, <key>: [...]}, "next_week": {...}}"""
+    weeks = {}
+    for week, start, end in (
+        ("current_week", context.current_week_start, context.current_week_end),
+        ("next_week", context.next_week_start, context.next_week_end)
+    ):
+        weeks[week] = {
+            "start": start,
+            "end": end,
+            key: [v for v in visits if start <= getdate(v.visit_date) <= end]
+        }
+    return weeks
+
 @frappe.whitelist()
 def get_my_weekly_visits():
     """Get current user's scheduled visits for current and next week only"""
     try:
-        from frappe.utils import getdate, add_days
-        
-        current_user = frappe.session.user
-        today = getdate()
-        
-        # Get current user's employee record to determine week start
-        employee_id = frappe.db.get_value("Employee", {"user_id": current_user}, "name")
-        if not employee_id:
-            # Fallback to Monday if no employee record
-            days_since_monday = today.weekday()
-            current_week_start = add_days(today, -days_since_monday)
-            current_week_end = add_days(current_week_start, 6)
-        else:
-            # Use employee's flexible week start
-            current_week_start = get_week_start_for_employee_inline(employee_id, today)
-            current_week_end = get_week_end_for_employee_inline(employee_id, current_week_start)
-        
-        # Calculate next week
-        next_week_start = add_days(current_week_end, 1)
-        next_week_end = add_days(next_week_start, 6)
-        
-        # Get currently assigned restaurants for this user
-        active_assignments = frappe.get_all("Restaurant Employee",
-            filters={
-                "employee": employee_id,
-                "is_active": 1,
-                "employee_status": "Active"
-            },
-            fields=["parent"]
-        )
-        
-        active_restaurant_ids = [a.parent for a in active_assignments]
-        
-        if not active_restaurant_ids:
-            # User has no assigned restaurants
-            return {
-                "success": True,
-                "current_week": {
-                    "start": current_week_start,
-                    "end": current_week_end,
-                    "visits": []
-                },
-                "next_week": {
-                    "start": next_week_start,
-                    "end": next_week_end,
-                    "visits": []
-                }
-            }
-        
-        # Get visits for current and next week only (exclude cancelled and unassigned restaurants)
-        visits = frappe.get_all("Scheduled Audit Visit",
-            filters={
-                "auditor": current_user,
-                "restaurant": ["in", active_restaurant_ids],  # Only assigned restaurants
-                "visit_date": ["between", [current_week_start, next_week_end]],
-                "status": ["!=", "Cancelled"]  # Exclude cancelled visits
-            },
-            fields=[
-                "name", "restaurant_name", "visit_date", "status"
-            ],
-            order_by="visit_date asc"
-        )
-        
-        # Separate by week
-        current_week_visits = [
-            v for v in visits 
-            if current_week_start <= getdate(v.visit_date) <= current_week_end
-        ]
-        
-        next_week_visits = [
-            v for v in visits 
-            if next_week_start <= getdate(v.visit_date) <= next_week_end
-        ]
+        context = get_auditor_context()
         
         return {
             "success": True,
-            "current_week": {
-                "start": current_week_start,
-                "end": current_week_end,
-                "visits": current_week_visits
-            },
-            "next_week": {
-                "start": next_week_start,
-                "end": next_week_end,
-                "visits": next_week_visits
-            }
+            **split_visits_by_week(context, get_weekly_visits(context), "visits")
         }
         
     except Exception as e:
@@ -1116,59 +889,15 @@ def get_my_weekly_visits():
 
 @frappe.whitelist()
 def process_last_week_status():
-    """Mark last week's pending audits as Overdue"""
+    """Outcome of marking last week's pending audits as Overdue.
+
+    The marking itself is done by the daily scheduler job
+    (`restaurant_audit.tasks.daily_audit_status_update`); this only reads the result.
+    """
     try:
-        from frappe.utils import getdate, add_days
+        from restaurant_audit.week_rollover import get_last_week_status
         
-        today = getdate()
-        days_since_monday = today.weekday()
-        current_week_start = add_days(today, -days_since_monday)
-        
-        # Calculate last week
-        last_week_start = add_days(current_week_start, -7)
-        last_week_end = add_days(last_week_start, 6)
-        
-        # Find pending scheduled audits from last week
-        pending_audits = frappe.get_all("Scheduled Audit Visit",
-            filters={
-                "visit_date": ["between", [last_week_start, last_week_end]],
-                "status": "Pending"
-            },
-            fields=["name", "restaurant_name", "auditor", "visit_date"]
-        )
-        
-        updates_made = 0
-        
-        # Update status to Overdue
-        for audit in pending_audits:
-            try:
-                audit_doc = frappe.get_doc("Scheduled Audit Visit", audit.name)
-                audit_doc.status = "Overdue"
-                audit_doc.overdue_notified = 1
-                audit_doc.save(ignore_permissions=True)
-                updates_made += 1
-            except Exception as e:
-                frappe.log_error(f"Error updating audit {audit.name}: {str(e)}", "Update Audit Status")
-        
-        # Also check for incomplete daily audits from last week
-        incomplete_daily = frappe.get_all("Audit Progress",
-            filters={
-                "start_time": ["between", [
-                    f"{last_week_start} 00:00:00", 
-                    f"{last_week_end} 23:59:59"
-                ]],
-                "is_completed": 0
-            }
-        )
-        
-        return {
-            "success": True,
-            "updates_made": updates_made,
-            "overdue_scheduled": updates_made,
-            "incomplete_daily": len(incomplete_daily),
-            "last_week_start": last_week_start,
-            "last_week_end": last_week_end
-        }
+        return get_last_week_status()
         
     except Exception as e:
         frappe.log_error(f"Error processing last week status: {str(e)}", "Process Last Week")
@@ -1178,82 +907,96 @@ def process_last_week_status():
         }
 
 @frappe.whitelist()
-def get_weekly_audit_summary():
-    """Get summary of audits for current and next week"""
+def get_weekly_audit_summary(weeks=2, offset=0):
+    """Get summary of audits for `weeks` consecutive weeks.
+
+    The first week is `offset` weeks from the current one, so the default
+    covers the current and next week and `weeks=12, offset=-11` gives the
+    last twelve weeks for a trend.
+    """
     try:
-        from frappe.utils import getdate, add_days
-        
-        current_user = frappe.session.user
-        today = getdate()
-        
-        # Calculate weeks
-        days_since_monday = today.weekday()
-        current_week_start = add_days(today, -days_since_monday)
-        current_week_end = add_days(current_week_start, 6)
-        next_week_start = add_days(current_week_start, 7)
-        next_week_end = add_days(next_week_start, 6)
+        weeks = min(max(cint(weeks), 1), MAX_SUMMARY_WEEKS)
+        offset = cint(offset)
         
-        # Current week summary
-        current_scheduled = frappe.db.count("Scheduled Audit Visit", {
-            "auditor": current_user,
-            "visit_date": ["between", [current_week_start, current_week_end]]
-        })
-        
-        current_completed = frappe.db.count("Scheduled Audit Visit", {
-            "auditor": current_user,
-            "visit_date": ["between", [current_week_start, current_week_end]],
-            "status": "Completed"
-        })
-        
-        current_daily = frappe.db.count("Audit Progress", {
-            "auditor": current_user,
-            "start_time": ["between", [
-                f"{current_week_start} 00:00:00", 
-                f"{current_week_end} 23:59:59"
-            ]]
-        })
-        
-        current_daily_completed = frappe.db.count("Audit Progress", {
-            "auditor": current_user,
-            "start_time": ["between", [
-                f"{current_week_start} 00:00:00", 
-                f"{current_week_end} 23:59:59"
-            ]],
-            "is_completed": 1
-        })
-        
-        # Next week summary
-        next_scheduled = frappe.db.count("Scheduled Audit Visit", {
-            "auditor": current_user,
-            "visit_date": ["between", [next_week_start, next_week_end]]
-        })
+        current_week_start, _ = get_user_week()
+        buckets = get_weekly_summary_buckets(
+            frappe.session.user, add_days(current_week_start, 7 * offset), weeks
+        )
         
-        return {
+        summary = {
             "success": True,
-            "current_week": {
-                "start": current_week_start,
-                "end": current_week_end,
-                "scheduled_audits": current_scheduled,
-                "completed_audits": current_completed,
-                "pending_audits": current_scheduled - current_completed,
-                "daily_audits": current_daily,
-                "daily_completed": current_daily_completed,
-                "daily_pending": current_daily - current_daily_completed
-            },
-            "next_week": {
-                "start": next_week_start,
-                "end": next_week_end,
-                "scheduled_audits": next_scheduled,
-                "needs_scheduling": next_scheduled == 0
-            }
+            "weeks": buckets
         }
         
+        # Current and next week, when in range, under their usual keys
+        if 0 <= -offset < weeks:
+            summary["current_week"] = buckets[-offset]
+        if 0 <= 1 - offset < weeks:
+            summary["next_week"] = dict(buckets[1 - offset],
+                needs_scheduling=buckets[1 - offset]["scheduled_audits"] == 0)
+        
+        return summary
+        
     except Exception as e:
         frappe.log_error(f"Error getting weekly summary: {str(e)}", "Weekly Summary")
         return {
             "success": False,
             "message": f"Error getting weekly summary: {str(e)}"
         }
+
+def get_weekly_summary_buckets(user, from_date, weeks):
+    """Per-week visit and daily audit counts of a user, one query per table"""
+    to_date = add_days(from_date, 7 * weeks - 1)
+    params = {"user": user, "from_date": from_date, "to_date": to_date}
+    
+    scheduled = {
+        cint(row.week): row for row in frappe.db.sql("""
+            SELECT FLOOR(DATEDIFF(visit_date, %(from_date)s) / 7) AS week,
+                COUNT(*) AS scheduled_audits,
+                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) AS completed_audits,
+                SUM(CASE WHEN status = 'Overdue' THEN 1 ELSE 0 END) AS overdue_audits
+            FROM `tabScheduled Audit Visit`
+            WHERE auditor = %(user)s AND visit_date BETWEEN %(from_date)s AND %(to_date)s
+            GROUP BY week
+        """, params, as_dict=True)
+    }
+    
+    daily = {
+        cint(row.week): row for row in frappe.db.sql("""
+            SELECT FLOOR(DATEDIFF(audit_date, %(from_date)s) / 7) AS week,
+                COUNT(*) AS daily_audits,
+                SUM(CASE WHEN is_completed = 1 THEN 1 ELSE 0 END) AS daily_completed
+            FROM `tabAudit Progress`
+            WHERE auditor = %(user)s AND audit_date BETWEEN %(from_date)s AND %(to_date)s
+            GROUP BY week
+        """, params, as_dict=True)
+    }
+    
+    buckets = []
+    for week in range(weeks):
+        start = add_days(from_date, 7 * week)
+        visits = scheduled.get(week) or {}
+        progress = daily.get(week) or {}
+        
+        scheduled_audits = cint(visits.get("scheduled_audits"))
+        completed_audits = cint(visits.get("completed_audits"))
+        daily_audits = cint(progress.get("daily_audits"))
+        daily_completed = cint(progress.get("daily_completed"))
+        
+        buckets.append({
+            "start": start,
+            "end": add_days(start, 6),
+            "scheduled_audits": scheduled_audits,
+            "completed_audits": completed_audits,
+            "overdue_audits": cint(visits.get("overdue_audits")),
+            "pending_audits": scheduled_audits - completed_audits,
+            "daily_audits": daily_audits,
+            "daily_completed": daily_completed,
+            "daily_pending": daily_audits - daily_completed
+        })
+    
+    return buckets
+
 # Add these validations to audit_api.py
 
 @frappe.whitelist()
@@ -1338,6 +1081,174 @@ def schedule_audit_visit(restaurant, visit_date):
             "message": f"Error scheduling visit: {str(e)}"
         }
 
+@frappe.whitelist()
+def schedule_audit_visits(batch):
+    """Schedule several (restaurant, visit_date) visits for the current user at once.
+
+    `batch` is a list (or JSON list) of {"restaurant", "visit_date"} items.
+    All items are validated against existing visits and daily audits in two
+    queries and the valid ones are inserted in bulk. Returns one result per
+    item in request order.
+    """
+    try:
+        import json
+        from frappe.utils import getdate, add_days, now
+        from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import (
+            get_week_start, refresh_rollups
+        )
+        
+        current_user = frappe.session.user
+        today = getdate()
+        max_future_date = add_days(today, 21)  # 3 weeks = 21 days
+        
+        items = json.loads(batch) if isinstance(batch, str) else (batch or [])
+        if len(items) > MAX_SCHEDULE_BATCH:
+            return {
+                "success": False,
+                "message": f"Cannot schedule more than {MAX_SCHEDULE_BATCH} visits at once"
+            }
+        
+        results = []
+        requested = []
+        for item in items:
+            restaurant = item.get("restaurant")
+            visit_date = getdate(item.get("visit_date")) if item.get("visit_date") else None
+            result = {"restaurant": restaurant, "visit_date": str(visit_date or ""), "success": False}
+            results.append(result)
+            
+            if not restaurant or not visit_date:
+                result["message"] = "Restaurant and visit date are required"
+            elif visit_date < today:
+                result["message"] = "Cannot schedule audit for past dates. Please select today or a future date."
+            elif visit_date > max_future_date:
+                result["message"] = f"Cannot schedule audit more than 3 weeks in advance. Maximum date allowed: {max_future_date}"
+            else:
+                requested.append((result, restaurant, visit_date))
+        
+        if requested:
+            restaurants = {r for _, r, _ in requested}
+            dates = [d for _, _, d in requested]
+            
+            restaurant_names = dict(frappe.get_all("Restaurant",
+                filters={"name": ["in", list(restaurants)]},
+                fields=["name", "restaurant_name"],
+                as_list=True
+            ))
+            
+            # Query 1: existing visits on these dates, by any auditor (visit names are per restaurant and date)
+            existing_visits = {}
+            for visit in frappe.get_all("Scheduled Audit Visit",
+                filters={
+                    "restaurant": ["in", list(restaurants)],
+                    "visit_date": ["between", [min(dates), max(dates)]]
+                },
+                fields=["name", "restaurant", "auditor", "visit_date"]
+            ):
+                existing_visits.setdefault((visit.restaurant, getdate(visit.visit_date)), []).append(visit)
+            
+            # Query 2: daily audits already started by this user on these dates
+            daily_audits = {
+                (row.restaurant, getdate(row.audit_date))
+                for row in frappe.get_all("Audit Progress",
+                    filters={
+                        "auditor": current_user,
+                        "restaurant": ["in", list(restaurants)],
+                        "audit_date": ["in", list(set(dates))]
+                    },
+                    fields=["restaurant", "audit_date"]
+                )
+            }
+            
+            # Week fields of every requested date under the user's week start day
+            weeks = dict(zip(dates, zip(*get_week_windows(dates, get_week_start_day(user=current_user)))))
+            
+            timestamp = now()
+            rows = []
+            seen = set()
+            rollup_keys = set()
+            for result, restaurant, visit_date in requested:
+                key = (restaurant, visit_date)
+                restaurant_name = restaurant_names.get(restaurant)
+                visits = existing_visits.get(key, [])
+                
+                if not restaurant_name:
+                    result["message"] = "Restaurant not found"
+                elif key in seen:
+                    result["message"] = "Duplicate visit in request"
+                elif key in daily_audits:
+                    result["message"] = "Cannot schedule regular audit on the same day as a daily audit. Please choose a different date."
+                elif any(v.auditor == current_user for v in visits):
+                    result["message"] = "Visit already scheduled for this date"
+                elif visits:
+                    result["message"] = "Another auditor already has a visit scheduled for this restaurant on this date"
+                else:
+                    seen.add(key)
+                    week_start, week_end = weeks[visit_date]
+                    name = f"SAV-{restaurant_name}-{visit_date}"
+                    rows.append(((
+                        name, timestamp, timestamp, current_user, current_user, 0,
+                        restaurant, restaurant_name, current_user, visit_date,
+                        week_start, week_end, "Pending", 0, 0
+                    ), result, (restaurant, current_user, get_week_start(visit_date))))
+            
+            if rows:
+                for values, result, rollup_key in insert_scheduled_visits(rows):
+                    rollup_keys.add(rollup_key)
+                    result.update({
+                        "success": True,
+                        "message": "Audit visit scheduled successfully",
+                        "visit_id": values[0]
+                    })
+                refresh_rollups(rollup_keys)
+        
+        scheduled = sum(1 for r in results if r["success"])
+        return {
+            "success": scheduled > 0,
+            "message": f"Scheduled {scheduled} of {len(results)} audit visits",
+            "scheduled": scheduled,
+            "results": results
+        }
+        
+    except Exception as e:
+        frappe.log_error(f"Error scheduling audit visits: {str(e)}", "Schedule Audit Visits")
+        return {
+            "success": False,
+            "message": f"Error scheduling visits: {str(e)}"
+        }
+
+def insert_scheduled_visits(rows):
+    """Insert (values, result, rollup_key) rows of new visits; returns the rows inserted.
+
+    The batch goes in with one bulk INSERT. If a visit of the same name was
+    created concurrently, it is retried row by row and only the clashing
+    items get a failure message.
+    """
+    frappe.db.savepoint("schedule_audit_visits")
+    try:
+        frappe.db.bulk_insert("Scheduled Audit Visit", SCHEDULED_VISIT_COLUMNS, [values for values, _, _ in rows])
+        return rows
+    except Exception as e:
+        if not is_duplicate_entry(e):
+            raise
+        frappe.db.rollback(save_point="schedule_audit_visits")
+    
+    inserted = []
+    for row in rows:
+        values, result, _ = row
+        frappe.db.savepoint("schedule_audit_visit")
+        try:
+            frappe.db.bulk_insert("Scheduled Audit Visit", SCHEDULED_VISIT_COLUMNS, [values])
+            inserted.append(row)
+        except Exception as e:
+            if not is_duplicate_entry(e):
+                raise
+            frappe.db.rollback(save_point="schedule_audit_visit")
+            result["message"] = "A visit for this restaurant on this date was just scheduled"
+    return inserted
+
+def is_duplicate_entry(e):
+    return isinstance(e, frappe.DuplicateEntryError) or frappe.db.is_duplicate_entry(e)
+
 def check_audit_conflicts(restaurant, visit_date, auditor):
     """Check for conflicts between daily and regular audits"""
     try:
@@ -1349,10 +1260,7 @@ def check_audit_conflicts(restaurant, visit_date, auditor):
         daily_audit_exists = frappe.db.exists("Audit Progress", {
             "restaurant": restaurant,
             "auditor": auditor,
-            "start_time": ["between", [
-                f"{visit_date_obj} 00:00:00",
-                f"{visit_date_obj} 23:59:59"
-            ]]
+            "audit_date": visit_date_obj
         })
         
         if daily_audit_exists:
@@ -1385,7 +1293,7 @@ def check_audit_conflicts(restaurant, visit_date, auditor):
         }
 
 @frappe.whitelist()
-def can_start_daily_audit(template_name):
+def can_start_daily_audit(template_name, user_latitude=None, user_longitude=None):
     """Check if daily audit can be started (not already completed today)"""
     try:
         from frappe.utils import getdate
@@ -1393,43 +1301,33 @@ def can_start_daily_audit(template_name):
         current_user = frappe.session.user
         today = getdate()
         
-        # Get user's restaurants
-        user_restaurants = get_restaurants()
-        if not user_restaurants["success"] or not user_restaurants["restaurants"]:
+        # Resolve the restaurant this daily audit would run at
+        template = frappe.get_cached_doc("Daily Audit Template", template_name)
+        restaurant, message = resolve_daily_audit_restaurant(template, user_latitude, user_longitude)
+        if not restaurant:
             return {
                 "success": False,
-                "message": "No restaurants assigned to user"
+                "message": message
             }
         
-        restaurant = user_restaurants["restaurants"][0]["name"]
-        
-        # Check if daily audit already completed today
-        completed_today = frappe.db.exists("Audit Progress", {
-            "restaurant": restaurant,
-            "auditor": current_user,
-            "start_time": ["between", [
-                f"{today} 00:00:00",
-                f"{today} 23:59:59"
-            ]],
-            "is_completed": 1
-        })
+        # Today's daily audit progress, completed or pending, in one query
+        progress_today = frappe.get_all("Audit Progress",
+            filters={
+                "restaurant": restaurant,
+                "auditor": current_user,
+                "audit_date": today
+            },
+            fields=["name", "is_completed"]
+        )
         
-        if completed_today:
+        if any(progress.is_completed for progress in progress_today):
             return {
                 "success": False,
                 "message": "Daily audit already completed for today. You cannot start another daily audit."
             }
         
         # Check if there's a pending daily audit
-        pending_today = frappe.db.get_value("Audit Progress", {
-            "restaurant": restaurant,
-            "auditor": current_user,
-            "start_time": ["between", [
-                f"{today} 00:00:00",
-                f"{today} 23:59:59"
-            ]],
-            "is_completed": 0
-        }, "name")
+        pending_today = next((progress.name for progress in progress_today if not progress.is_completed), None)
         
         if pending_today:
             return {
@@ -1461,109 +1359,52 @@ def can_start_daily_audit(template_name):
             "message": "Error checking daily audit availability"
         }
 
-# Add these methods to audit_api.py
+def resolve_daily_audit_restaurant(template, user_latitude=None, user_longitude=None):
+    """Pick the restaurant a daily audit runs at; returns (restaurant, message).
 
-def get_week_start_for_employee_inline(employee_id, reference_date=None):
-    """Inline version of get_week_start_for_employee to avoid import issues"""
-    from frappe.utils import getdate, add_days
+    A template bound to one restaurant always uses it. Otherwise, with a
+    device position, the nearest assigned restaurant whose location radius
+    contains it is used (restaurants without coordinates are accepted as a
+    fallback); without a position, the first assigned restaurant.
+    """
+    if template.restaurant and not template.applies_to_all_restaurants:
+        return template.restaurant, None
     
-    if not reference_date:
-        reference_date = getdate()
+    assigned = get_assigned_restaurants()
+    if not assigned:
+        return None, "No restaurant available for daily audit"
     
-    # Get employee's start_week_day from Restaurant Employee table
-    employee_week_start = frappe.db.get_value("Restaurant Employee", 
-        {"employee": employee_id, "is_active": 1}, 
-        "start_week_day"
-    )
-    
-    if not employee_week_start:
-        # Default to Monday if not set
-        employee_week_start = "Monday"
+    if user_latitude in (None, "") or user_longitude in (None, ""):
+        return assigned[0], None
     
-    # Map day names to weekday numbers (Monday=0, Sunday=6)
-    day_mapping = {
-        "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
-        "Friday": 4, "Saturday": 5, "Sunday": 6
-    }
+    nearest = get_nearest_restaurant(user_latitude, user_longitude, assigned)
+    if nearest:
+        return nearest["restaurant"], None
     
-    target_weekday = day_mapping.get(employee_week_start, 0)
-    current_weekday = reference_date.weekday()
+    coordinates = get_restaurant_coordinates()
+    unlocated = [name for name in assigned if name not in coordinates]
+    if unlocated:
+        return unlocated[0], None
     
-    # Calculate days to subtract to get to the start of the week
-    days_to_subtract = (current_weekday - target_weekday) % 7
-    
-    return add_days(reference_date, -days_to_subtract)
-
-def get_week_end_for_employee_inline(employee_id, week_start):
-    """Inline version of get_week_end_for_employee to avoid import issues"""
-    from frappe.utils import add_days
-    return add_days(week_start, 6)
+    return None, "You are not within range of any of your assigned restaurants"
 
 @frappe.whitelist()
 def check_restaurant_week_status(restaurant_id):
     """Check if restaurant has completed audits for current week"""
     try:
-        from frappe.utils import getdate, add_days
-        
-        current_user = frappe.session.user
-        today = getdate()
-        
-        # Get current user's employee record to determine week start
-        employee_id = frappe.db.get_value("Employee", {"user_id": current_user}, "name")
-        if not employee_id:
-            # Fallback to Monday if no employee record
-            days_since_monday = today.weekday()
-            current_week_start = add_days(today, -days_since_monday)
-            current_week_end = add_days(current_week_start, 6)
-        else:
-            # Use employee's flexible week start
-            current_week_start = get_week_start_for_employee_inline(employee_id, today)
-            current_week_end = get_week_end_for_employee_inline(employee_id, current_week_start)
-        
-        # Check if ANY auditor has completed audit for this restaurant this week
-        completed_audits = frappe.get_all("Audit Submission",
-            filters={
-                "restaurant": restaurant_id,
-                "audit_date": ["between", [current_week_start, current_week_end]]
-            },
-            fields=["name", "auditor", "audit_date", "average_score"]
-        )
-        
-        # Check if current user has completed audit this week
-        user_completed_this_week = any(
-            audit.auditor == current_user for audit in completed_audits
-        )
-        
-        # Check completed scheduled visits for current week
-        completed_scheduled = frappe.get_all("Scheduled Audit Visit",
-            filters={
-                "restaurant": restaurant_id,
-                "auditor": current_user,
-                "visit_date": ["between", [current_week_start, current_week_end]],
-                "status": "Completed"
-            }
-        )
-        
-        user_has_completed_scheduled = len(completed_scheduled) > 0
-        
-        # Restaurant week status
-        restaurant_week_complete = len(completed_audits) > 0
-        user_week_complete = user_completed_this_week or user_has_completed_scheduled
-        
-        # Get next week start day for the message
-        next_week_start = add_days(current_week_end, 1)
-        next_week_start_name = next_week_start.strftime('%A')
+        context = get_auditor_context()
+        status = get_week_statuses(context, [restaurant_id])[restaurant_id]
         
         return {
             "success": True,
-            "restaurant_week_complete": restaurant_week_complete,
-            "user_week_complete": user_week_complete,
-            "can_access_audit": not user_week_complete,  # Only allow if user hasn't completed
-            "completed_audits_count": len(completed_audits),
-            "week_start": current_week_start,
-            "week_end": current_week_end,
-            "message": get_week_status_message(restaurant_week_complete, user_week_complete, next_week_start_name),
-            "next_access_date": next_week_start
+            "restaurant_week_complete": status["restaurant_week_complete"],
+            "user_week_complete": status["week_complete"],
+            "can_access_audit": status["can_access"],  # Only allow if user hasn't completed
+            "completed_audits_count": status["completed_audits_count"],
+            "week_start": context.current_week_start,
+            "week_end": context.current_week_end,
+            "message": status["week_message"],
+            "next_access_date": status["next_access"]
         }
         
     except Exception as e:
@@ -1573,6 +1414,52 @@ def check_restaurant_week_status(restaurant_id):
             "message": f"Error checking week status: {str(e)}"
         }
 
+def get_week_statuses(context, restaurants):
+    """Current week completion of each restaurant, for all of them in two queries"""
+    week = [context.current_week_start, context.current_week_end]
+    
+    # Submissions by ANY auditor this week, and the current user's completed visits
+    submissions = frappe.get_all("Audit Submission",
+        filters={"restaurant": ["in", restaurants], "audit_date": ["between", week]},
+        fields=["restaurant", "auditor"]
+    ) if restaurants else []
+    
+    completed_scheduled = set(frappe.get_all("Scheduled Audit Visit",
+        filters={
+            "restaurant": ["in", restaurants],
+            "auditor": context.user,
+            "visit_date": ["between", week],
+            "status": "Completed"
+        },
+        pluck="restaurant"
+    )) if restaurants else set()
+    
+    # Get next week start day for the message
+    next_week_start_name = context.next_week_start.strftime('%A')
+    
+    submissions_by_restaurant = {}
+    for submission in submissions:
+        submissions_by_restaurant.setdefault(submission.restaurant, []).append(submission)
+    
+    statuses = {}
+    for restaurant in restaurants:
+        audited = submissions_by_restaurant.get(restaurant, [])
+        restaurant_week_complete = len(audited) > 0
+        user_week_complete = (
+            any(submission.auditor == context.user for submission in audited)
+            or restaurant in completed_scheduled
+        )
+        statuses[restaurant] = {
+            "restaurant_week_complete": restaurant_week_complete,
+            "completed_audits_count": len(audited),
+            "week_complete": user_week_complete,
+            "can_access": not user_week_complete,
+            "week_message": get_week_status_message(restaurant_week_complete, user_week_complete, next_week_start_name),
+            "next_access": context.next_week_start
+        }
+    
+    return statuses
+
 def get_week_status_message(restaurant_complete, user_complete, next_week_start_name="Monday"):
     """Get appropriate message based on week status"""
     if user_complete:
@@ -1586,40 +1473,11 @@ def get_week_status_message(restaurant_complete, user_complete, next_week_start_
 def get_restaurants_with_week_status():
     """Get restaurants with week completion status"""
     try:
-        current_user = frappe.session.user
-        
-        # Get basic restaurants list
-        restaurants_response = get_restaurants()
-        
-        if not restaurants_response["success"]:
-            return restaurants_response
-        
-        restaurants = restaurants_response["restaurants"]
-        
-        # Debug: Log the restaurants being processed (commented out to reduce noise)
-        # frappe.log_error(f"User {current_user} is assigned to {len(restaurants)} restaurants: {[r['name'] for r in restaurants]}", "Restaurant Assignment Debug")
-        
-        # Add week status to each restaurant
-        for restaurant in restaurants:
-            week_status = check_restaurant_week_status(restaurant["name"])
-            if week_status["success"]:
-                restaurant.update({
-                    "week_complete": week_status["user_week_complete"],
-                    "can_access": week_status["can_access_audit"],
-                    "week_message": week_status["message"],
-                    "next_access": week_status.get("next_access_date")
-                })
-            else:
-                restaurant.update({
-                    "week_complete": False,
-                    "can_access": True,
-                    "week_message": "Status unknown",
-                    "next_access": None
-                })
+        context = get_auditor_context()
         
         return {
             "success": True,
-            "restaurants": restaurants
+            "restaurants": get_restaurants_with_status(context)
         }
         
     except Exception as e:
@@ -1630,6 +1488,53 @@ def get_restaurants_with_week_status():
             "restaurants": []
         }
 
+def get_restaurants_with_status(context):
+    restaurants = get_restaurant_cards(context)
+    statuses = get_week_statuses(context, [r.name for r in restaurants])
+    
+    # Add week status to each restaurant
+    for restaurant in restaurants:
+        status = statuses[restaurant.name]
+        restaurant.update({
+            "week_complete": status["week_complete"],
+            "can_access": status["can_access"],
+            "week_message": status["week_message"],
+            "next_access": status["next_access"]
+        })
+    
+    return restaurants
+
+@frappe.whitelist()
+def bootstrap():
+    """Everything the audit-restaurants page shows on load, in one response.
+
+    All sections share one auditor context, so the Employee, assignments
+    and week bounds are looked up once.
+    """
+    try:
+        from restaurant_audit.restaurant_audit.doctype.daily_audit_template.daily_audit_template import get_active_templates
+        
+        context = get_auditor_context()
+        visits = get_weekly_visits(context)
+        
+        return {
+            "success": True,
+            "dashboard": get_dashboard(context),
+            "restaurants": get_restaurants_with_status(context),
+            "restaurants_message": context.message,
+            "scheduled_audits": split_visits_by_week(context, visits, "scheduled_audits"),
+            "my_visits": split_visits_by_week(context, visits, "visits"),
+            "daily_templates": get_active_templates(),
+            "last_week": process_last_week_status()
+        }
+        
+    except Exception as e:
+        frappe.log_error(f"Error loading page data: {str(e)}", "Bootstrap")
+        return {
+            "success": False,
+            "message": f"Error loading page data: {str(e)}"
+        }
+
 @frappe.whitelist()
 def check_employee_removals():
     """Check for recently removed employees and return cleanup information"""
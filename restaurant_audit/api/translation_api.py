@@ -1,28 +1,70 @@
 import frappe
 from frappe import _
-import csv
+import hashlib
+import json
 import os
+import re
+
+from werkzeug.wrappers import Response
+
+from restaurant_audit.translation_bundles import parse_translation_file
+
+CATALOG_CACHE_KEY = "restaurant_audit:translation_catalogs"
+BUNDLE_MAX_AGE = 24 * 60 * 60
+
+# {lang: {"mtime": float, "etag": str, "translations": dict}}, per worker process
+_catalogs = {}
+
+
+def get_translation_file(lang):
+    """Path of the CSV for `lang`, or None for unknown or malformed codes"""
+    if not lang or not re.fullmatch(r"[A-Za-z]{2,3}([-_][A-Za-z0-9]{2,8})?", lang):
+        return None
+    path = os.path.join(frappe.get_app_path('restaurant_audit'), 'translations', f'{lang}.csv')
+    return path if os.path.exists(path) else None
+
+
+def get_catalog(lang):
+    """Parsed catalog of `lang` as {"mtime", "etag", "translations"}.
+
+    Held in process memory and mirrored into Redis, both keyed by the CSV's
+    mtime, so the file is parsed once per edit rather than once per request.
+    """
+    path = get_translation_file(lang)
+    if not path:
+        return {"mtime": 0, "etag": "", "translations": {}}
+
+    mtime = os.path.getmtime(path)
+    catalog = _catalogs.get(lang)
+    if catalog and catalog["mtime"] == mtime:
+        return catalog
+
+    catalog = frappe.cache().hget(CATALOG_CACHE_KEY, lang)
+    if not catalog or catalog.get("mtime") != mtime:
+        translations = parse_translation_file(path)
+        catalog = {
+            "mtime": mtime,
+            "etag": get_content_hash(translations),
+            "translations": translations
+        }
+        frappe.cache().hset(CATALOG_CACHE_KEY, lang, catalog)
+
+    _catalogs[lang] = catalog
+    return catalog
+
+
+def get_content_hash(value):
+    content = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
 
 @frappe.whitelist(allow_guest=True)
 def get_translations(lang='en'):
     """Get translations for the specified language"""
     try:
-        translations = {}
-        
-        # Get translation file path
-        app_path = frappe.get_app_path('restaurant_audit')
-        translation_file = os.path.join(app_path, 'translations', f'{lang}.csv')
-        
-        if os.path.exists(translation_file):
-            with open(translation_file, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    if len(row) >= 2 and not row[0].startswith('#'):
-                        translations[row[0]] = row[1]
-        
         return {
             "success": True,
-            "message": translations
+            "message": get_catalog(lang)["translations"]
         }
         
     except Exception as e:
@@ -32,6 +74,33 @@ def get_translations(lang='en'):
             "message": str(e)
         }
 
+@frappe.whitelist(allow_guest=True)
+def get_translation_bundle(langs='ar,en'):
+    """All requested catalogs in one response, with an ETag and cache headers.
+
+    Answers 304 Not Modified when the client already holds the current bundle.
+    """
+    langs = sorted({lang.strip() for lang in (langs or '').split(',') if lang.strip()})
+    catalogs = {lang: get_catalog(lang) for lang in langs}
+    etag = get_content_hash({lang: catalog["etag"] for lang, catalog in catalogs.items()})
+
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": f"public, max-age={BUNDLE_MAX_AGE}, stale-while-revalidate={BUNDLE_MAX_AGE}",
+        "Vary": "Accept-Encoding"
+    }
+
+    if_none_match = frappe.get_request_header("If-None-Match") or ""
+    if etag in {tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")}:
+        return Response(status=304, headers=headers)
+
+    body = json.dumps(
+        {"message": {lang: catalog["translations"] for lang, catalog in catalogs.items()}},
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return Response(body, status=200, headers=headers, content_type="application/json; charset=utf-8")
+
 @frappe.whitelist()
 def get_user_language():
     """Get current user's preferred language"""
@@ -0,0 +1,78 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Per-request context of the current auditor.
+
+User, Employee, active restaurant assignments and the auditor's week
+boundaries are resolved once per request and shared by every API section
+that needs them, so endpoints (and `bootstrap`, which assembles several of
+them) do not each look up the same rows again.
+"""
+
+import frappe
+from frappe.utils import add_days, getdate
+from frappe.utils.caching import request_cache
+
+from restaurant_audit.week_calendar import get_week_start, get_week_start_day
+
+
+@request_cache
+def get_auditor_context(user=None):
+    """frappe._dict with user, employee, restaurants, message and week bounds.
+
+    `restaurants` holds the auditor's active assignments; when it is empty
+    `message` says why.
+    """
+    user = user or frappe.session.user
+    today = getdate()
+    context = frappe._dict(
+        user=user,
+        today=today,
+        user_info=frappe.db.get_value("User", user, ["name", "full_name", "email", "enabled"], as_dict=True),
+        employee=frappe.db.get_value("Employee", {"user_id": user},
+            ["name", "employee_name", "designation", "status"], as_dict=True),
+        assignments=[],
+        restaurants=[],
+        message=None,
+        week_start_day="Monday",
+    )
+
+    if context.employee:
+        context.assignments = frappe.get_all("Restaurant Employee",
+            filters={"employee": context.employee.name, "parenttype": "Restaurant"},
+            fields=["parent", "is_active", "employee_status"],
+            order_by="modified desc"
+        )
+        context.week_start_day = get_week_start_day(employee=context.employee.name)
+
+    if not (context.user_info and context.user_info.enabled):
+        context.message = "User account is disabled"
+    elif not context.employee:
+        context.message = "No employee record found for current user"
+    elif context.employee.status != "Active":
+        context.message = f"Employee status is {context.employee.status}"
+    elif not context.assignments:
+        context.message = "No restaurants assigned to this employee"
+    else:
+        context.restaurants = [
+            a.parent for a in context.assignments if a.is_active and a.employee_status == "Active"
+        ]
+        if not context.restaurants:
+            context.message = "No active restaurant assignments found"
+
+    context.current_week_start = get_week_start(today, context.week_start_day)
+    context.current_week_end = add_days(context.current_week_start, 6)
+    context.next_week_start = add_days(context.current_week_end, 1)
+    context.next_week_end = add_days(context.next_week_start, 6)
+
+    return context
+
+
+@request_cache
+def get_open_progress(user=None):
+    """The auditor's incomplete Audit Progress rows, newest first"""
+    return frappe.get_all("Audit Progress",
+        filters={"auditor": user or frappe.session.user, "is_completed": 0},
+        fields=["name", "restaurant", "completion_percentage", "last_updated", "answers_json"],
+        order_by="last_updated desc"
+    )
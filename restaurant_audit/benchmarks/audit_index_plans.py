@@ -0,0 +1,209 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Before/after query plans for the audit hot-path composite indexes.
+
+Run against a development site (MariaDB, needs the Sequence engine):
+
+    bench --site <site> execute restaurant_audit.benchmarks.audit_index_plans.run
+    bench --site <site> execute restaurant_audit.benchmarks.audit_index_plans.run --kwargs "{'rows': 100000}"
+
+Every table is copied into a throw-away `_bench_*` table, seeded with
+`rows` synthetic rows, and each query is EXPLAINed and timed once without
+and once with the index. The real DocType tables are never touched.
+"""
+
+import time
+
+import frappe
+
+RESTAURANTS = 500
+AUDITORS = 200
+DAYS = 3 * 365
+
+# Per DocType: the indexes under test, how to seed rows and the queries to EXPLAIN
+BENCHMARKS = [
+    {
+        "doctype": "Scheduled Audit Visit",
+        "indexes": {
+            "auditor_visit_date_status_index": ["auditor", "visit_date", "status"],
+            "restaurant_status_week_index": ["restaurant", "status", "week_start_date"],
+        },
+        "columns": ["name", "restaurant", "auditor", "visit_date", "status", "week_start_date", "week_end_date"],
+        "select": """
+            CONCAT('SAV-', seq),
+            CONCAT('R-', seq MOD {restaurants}),
+            CONCAT('auditor', seq MOD {auditors}, '@example.com'),
+            CURDATE() - INTERVAL (seq MOD {days}) DAY,
+            ELT(1 + seq MOD 4, 'Pending', 'Completed', 'Overdue', 'Completed'),
+            CURDATE() - INTERVAL (seq MOD {days}) DAY
+                - INTERVAL WEEKDAY(CURDATE() - INTERVAL (seq MOD {days}) DAY) DAY,
+            CURDATE() - INTERVAL (seq MOD {days}) DAY
+                - INTERVAL WEEKDAY(CURDATE() - INTERVAL (seq MOD {days}) DAY) DAY + INTERVAL 6 DAY
+        """,
+        "queries": [
+            """SELECT name, restaurant, visit_date, status FROM `{table}`
+                WHERE auditor = 'auditor7@example.com'
+                AND visit_date BETWEEN CURDATE() - INTERVAL 7 DAY AND CURDATE() + INTERVAL 7 DAY
+                AND status != 'Cancelled'""",
+            """SELECT COUNT(*) FROM `{table}`
+                WHERE auditor = 'auditor7@example.com' AND visit_date = CURDATE() AND status = 'Pending'""",
+            """SELECT name FROM `{table}`
+                WHERE restaurant = 'R-42' AND status = 'Completed'
+                AND week_start_date = CURDATE() - INTERVAL WEEKDAY(CURDATE()) DAY""",
+        ],
+    },
+    {
+        "doctype": "Audit Submission",
+        "indexes": {
+            "restaurant_audit_date_index": ["restaurant", "audit_date"],
+            "auditor_audit_date_index": ["auditor", "audit_date"],
+        },
+        "columns": ["name", "restaurant", "auditor", "audit_date", "average_score"],
+        "select": """
+            CONCAT('AUDIT-', seq),
+            CONCAT('R-', seq MOD {restaurants}),
+            CONCAT('auditor', seq MOD {auditors}, '@example.com'),
+            CURDATE() - INTERVAL (seq MOD {days}) DAY,
+            20 + (seq MOD 80)
+        """,
+        "queries": [
+            """SELECT audit_date FROM `{table}` WHERE restaurant = 'R-42'
+                ORDER BY audit_date DESC LIMIT 1""",
+            """SELECT name, auditor, audit_date, average_score FROM `{table}`
+                WHERE restaurant = 'R-42'
+                AND audit_date BETWEEN CURDATE() - INTERVAL 6 DAY AND CURDATE()""",
+            """SELECT COUNT(*), AVG(average_score) FROM `{table}`
+                WHERE auditor = 'auditor7@example.com'
+                AND audit_date >= CURDATE() - INTERVAL 30 DAY""",
+        ],
+    },
+    {
+        "doctype": "Audit Progress",
+        "indexes": {
+            "restaurant_auditor_progress_index": ["restaurant", "auditor", "is_completed", "start_time"],
+        },
+        "columns": ["name", "restaurant", "auditor", "start_time", "last_updated", "is_completed"],
+        "select": """
+            CONCAT('PROG-', seq),
+            CONCAT('R-', seq MOD {restaurants}),
+            CONCAT('auditor', seq MOD {auditors}, '@example.com'),
+            NOW() - INTERVAL (seq MOD ({days} * 24)) HOUR,
+            NOW() - INTERVAL (seq MOD ({days} * 24)) HOUR,
+            IF(seq MOD 5 = 0, 0, 1)
+        """,
+        "queries": [
+            """SELECT name FROM `{table}`
+                WHERE restaurant = 'R-42' AND auditor = 'auditor42@example.com'
+                AND start_time BETWEEN CONCAT(CURDATE(), ' 00:00:00') AND CONCAT(CURDATE(), ' 23:59:59')
+                AND is_completed = 1 LIMIT 1""",
+            """SELECT name FROM `{table}`
+                WHERE restaurant = 'R-42' AND auditor = 'auditor42@example.com' AND is_completed = 0""",
+        ],
+    },
+    {
+        "doctype": "Restaurant Employee",
+        "indexes": {
+            "employee_is_active_index": ["employee", "is_active"],
+        },
+        "columns": ["name", "parent", "parenttype", "parentfield", "employee", "is_active", "employee_status"],
+        "select": """
+            CONCAT('RE-', seq),
+            CONCAT('R-', seq MOD {restaurants}),
+            'Restaurant',
+            'assigned_employees',
+            CONCAT('HR-EMP-', seq MOD ({auditors} * 50)),
+            IF(seq MOD 7 = 0, 0, 1),
+            IF(seq MOD 7 = 0, 'Removed', 'Active')
+        """,
+        "queries": [
+            """SELECT parent, start_week_day FROM `{table}`
+                WHERE employee = 'HR-EMP-77' AND is_active = 1""",
+        ],
+    },
+]
+
+
+def run(rows=1_000_000, doctypes=None):
+    """Seed shadow tables, print EXPLAIN and timings before/after indexing"""
+    rows = int(rows)
+    report = []
+
+    for spec in BENCHMARKS:
+        if doctypes and spec["doctype"] not in doctypes:
+            continue
+
+        table = f"_bench_{frappe.scrub(spec['doctype'])}"
+        try:
+            seed_table(spec, table, rows)
+
+            before = explain_queries(spec, table)
+            for index_name, columns in spec["indexes"].items():
+                frappe.db.sql_ddl(f"ALTER TABLE `{table}` ADD INDEX `{index_name}` ({', '.join(columns)})")
+            frappe.db.sql(f"ANALYZE TABLE `{table}`")
+            after = explain_queries(spec, table)
+
+            report.append({"doctype": spec["doctype"], "rows": rows, "before": before, "after": after})
+        finally:
+            frappe.db.sql_ddl(f"DROP TABLE IF EXISTS `{table}`")
+
+    print_report(report)
+    return report
+
+
+def seed_table(spec, table, rows):
+    """Copy the DocType table structure without its composite indexes and fill it"""
+    source = f"tab{spec['doctype']}"
+
+    frappe.db.sql_ddl(f"DROP TABLE IF EXISTS `{table}`")
+    frappe.db.sql_ddl(f"CREATE TABLE `{table}` LIKE `{source}`")
+
+    # The live table may already carry the indexes; the "before" plan must not.
+    for index_name in spec["indexes"]:
+        if frappe.db.sql(f"SHOW INDEX FROM `{table}` WHERE Key_name = %s", index_name):
+            frappe.db.sql_ddl(f"ALTER TABLE `{table}` DROP INDEX `{index_name}`")
+
+    select = spec["select"].format(restaurants=RESTAURANTS, auditors=AUDITORS, days=DAYS)
+    frappe.db.sql(f"""
+        INSERT INTO `{table}` ({', '.join(spec['columns'])})
+        SELECT {select}
+        FROM seq_1_to_{rows}
+    """)
+    frappe.db.commit()
+    frappe.db.sql(f"ANALYZE TABLE `{table}`")
+
+
+def explain_queries(spec, table):
+    """EXPLAIN and time each hot-path query against the shadow table"""
+    results = []
+    for query in spec["queries"]:
+        query = query.format(table=table)
+        plan = frappe.db.sql(f"EXPLAIN {query}", as_dict=True)
+
+        started = time.perf_counter()
+        frappe.db.sql(query)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        results.append({
+            "query": " ".join(query.split()),
+            "plan": [
+                {"type": p.get("type"), "key": p.get("key"), "rows": p.get("rows"), "extra": p.get("Extra")}
+                for p in plan
+            ],
+            "elapsed_ms": round(elapsed_ms, 2),
+        })
+    return results
+
+
+def print_report(report):
+    for entry in report:
+        print(f"\n=== {entry['doctype']} ({entry['rows']:,} rows) ===")
+        for before, after in zip(entry["before"], entry["after"]):
+            print(f"\n{before['query']}")
+            for label, result in (("before", before), ("after ", after)):
+                plan = result["plan"][0] if result["plan"] else {}
+                print(
+                    f"  {label}: type={plan.get('type')} key={plan.get('key')} "
+                    f"rows={plan.get('rows')} extra={plan.get('extra')} "
+                    f"time={result['elapsed_ms']}ms"
+                )
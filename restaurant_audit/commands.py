@@ -0,0 +1,57 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-audit-rollups")
+@click.option("--from-date", help="Only rebuild weeks from this date (YYYY-MM-DD) onwards")
+@pass_context
+def rebuild_audit_rollups(context, from_date=None):
+    """Rebuild Weekly Audit Rollup rows from the raw audit records"""
+    import frappe
+    from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import rebuild_weekly_rollups
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        count = rebuild_weekly_rollups(from_date)
+        click.echo(f"Rebuilt {count} weekly audit rollup rows on {site}")
+    finally:
+        frappe.destroy()
+
+
+@click.command("rescore-audits")
+@click.option("--from-date", help="Only rescore submissions audited on or after this date (YYYY-MM-DD)")
+@click.option("--chunk-size", default=1000, type=int, help="Submissions scored per batch")
+@pass_context
+def rescore_audits(context, from_date=None, chunk_size=1000):
+    """Recompute stored audit scores with the current scoring plans"""
+    import frappe
+    from restaurant_audit.rescoring import rescore_submissions
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        summary = rescore_submissions(from_date, chunk_size=chunk_size)
+        click.echo(
+            f"Rescored {summary['submissions']} submissions on {site} "
+            f"({summary['answers_changed']} answers changed)"
+        )
+    finally:
+        frappe.destroy()
+
+
+@click.command("build-translation-bundles")
+def build_translation_bundles():
+    """Compile translations/*.csv into hashed JSON bundles under public/translations"""
+    from restaurant_audit.translation_bundles import build_bundles
+
+    for lang, filename in build_bundles().items():
+        click.echo(f"{lang}: /assets/restaurant_audit/translations/{filename}")
+
+
+commands = [rebuild_audit_rollups, rescore_audits, build_translation_bundles]
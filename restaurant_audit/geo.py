@@ -0,0 +1,183 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Restaurant coordinates and distance helpers.
+
+Coordinates of all geolocated restaurants are cached in Redis as plain
+lists and turned into NumPy arrays on use, so distances from one GPS fix to
+any number of restaurants are computed in a single vectorized pass. A grid
+index over the same coordinates narrows nearest-restaurant lookups to the
+cells around the fix. Both caches are cleared whenever a Restaurant is saved
+or deleted.
+"""
+
+import math
+
+import frappe
+import numpy as np
+
+EARTH_RADIUS_M = 6371000
+DEFAULT_RADIUS_M = 100
+
+COORDINATES_CACHE_KEY = "restaurant_audit:restaurant_coordinates"
+GRID_CACHE_KEY = "restaurant_audit:restaurant_grid"
+
+# Grid cell size in degrees (~1.1 km of latitude)
+GRID_CELL_DEG = 0.01
+METERS_PER_DEGREE = 111320
+
+
+def haversine(latitude, longitude, latitudes, longitudes):
+    """Great-circle distances in meters from one point to arrays of points"""
+    return haversine_pairs(float(latitude), float(longitude), latitudes, longitudes)
+
+
+def haversine_pairs(latitudes1, longitudes1, latitudes2, longitudes2):
+    """Element-wise great-circle distances in meters between two sets of points"""
+    lat1, lon1 = np.radians(np.asarray(latitudes1, dtype=float)), np.radians(np.asarray(longitudes1, dtype=float))
+    lat2, lon2 = np.radians(np.asarray(latitudes2, dtype=float)), np.radians(np.asarray(longitudes2, dtype=float))
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def get_restaurant_coordinates():
+    """{restaurant: (restaurant_name, latitude, longitude, location_radius)} for geolocated restaurants"""
+    return frappe.cache().get_value(COORDINATES_CACHE_KEY, _load_restaurant_coordinates)
+
+
+def _load_restaurant_coordinates():
+    return {
+        r.name: (r.restaurant_name, float(r.latitude), float(r.longitude), float(r.location_radius or DEFAULT_RADIUS_M))
+        for r in frappe.get_all("Restaurant",
+            filters={"latitude": ["is", "set"], "longitude": ["is", "set"]},
+            fields=["name", "restaurant_name", "latitude", "longitude", "location_radius"]
+        )
+        if r.latitude and r.longitude
+    }
+
+
+def clear_restaurant_coordinates(doc=None, method=None):
+    frappe.cache().delete_value([COORDINATES_CACHE_KEY, GRID_CACHE_KEY])
+
+
+def get_grid_cell(latitude, longitude):
+    return (math.floor(float(latitude) / GRID_CELL_DEG), math.floor(float(longitude) / GRID_CELL_DEG))
+
+
+def get_restaurant_grid():
+    """{"cells": {(row, col): [restaurant, ...]}, "max_radius": meters}"""
+    return frappe.cache().get_value(GRID_CACHE_KEY, _build_restaurant_grid)
+
+
+def _build_restaurant_grid():
+    cells = {}
+    max_radius = 0
+    for name, (_, latitude, longitude, radius) in get_restaurant_coordinates().items():
+        cells.setdefault(get_grid_cell(latitude, longitude), []).append(name)
+        max_radius = max(max_radius, radius)
+    return {"cells": cells, "max_radius": max_radius}
+
+
+def get_nearby_restaurants(latitude, longitude):
+    """Restaurants in the grid cells that any location radius around the point can reach"""
+    grid = get_restaurant_grid()
+    if not grid["cells"]:
+        return []
+
+    latitude, longitude = float(latitude), float(longitude)
+    row, col = get_grid_cell(latitude, longitude)
+    reach = grid["max_radius"] / METERS_PER_DEGREE
+    rows = math.ceil(reach / GRID_CELL_DEG)
+    cols = math.ceil(reach / max(math.cos(math.radians(latitude)), 0.01) / GRID_CELL_DEG)
+
+    nearby = []
+    for r in range(row - rows, row + rows + 1):
+        for c in range(col - cols, col + cols + 1):
+            nearby.extend(grid["cells"].get((r, c), ()))
+    return nearby
+
+
+def get_nearest_restaurant(latitude, longitude, restaurants):
+    """Nearest of `restaurants` whose location radius contains the point.
+
+    Returns {"restaurant", "distance", "allowed_radius"} or None.
+    """
+    allowed = set(restaurants)
+    candidates = [name for name in get_nearby_restaurants(latitude, longitude) if name in allowed]
+    if not candidates:
+        return None
+
+    coordinates = get_restaurant_coordinates()
+    rows = [coordinates[name] for name in candidates]
+    radii = np.array([row[3] for row in rows])
+    distances = haversine(latitude, longitude, [row[1] for row in rows], [row[2] for row in rows])
+
+    in_range = np.flatnonzero(distances <= radii)
+    if not len(in_range):
+        return None
+
+    nearest = in_range[np.argmin(distances[in_range])]
+    return {
+        "restaurant": candidates[nearest],
+        "distance": round(float(distances[nearest]), 2),
+        "allowed_radius": float(radii[nearest]),
+    }
+
+
+def get_assigned_restaurants(user=None):
+    """Names of restaurants the user is actively assigned to, in one query.
+
+    Ordered by restaurant name, then name, so callers falling back to the
+    first assignment always get the same restaurant.
+    """
+    return frappe.db.sql("""
+        SELECT re.parent
+        FROM `tabRestaurant Employee` re
+        INNER JOIN `tabEmployee` e ON e.name = re.employee
+        INNER JOIN `tabRestaurant` r ON r.name = re.parent
+        WHERE e.user_id = %(user)s
+            AND e.status = 'Active'
+            AND re.parenttype = 'Restaurant'
+            AND re.is_active = 1
+            AND re.employee_status = 'Active'
+        GROUP BY re.parent, r.restaurant_name
+        ORDER BY r.restaurant_name, re.parent
+    """, {"user": user or frappe.session.user}, pluck=True)
+
+
+def get_distances(latitude, longitude, restaurants):
+    """Distance and in-range flag for each restaurant, nearest first.
+
+    Restaurants without coordinates are returned last with `distance` None.
+    """
+    coordinates = get_restaurant_coordinates()
+    located = [name for name in restaurants if name in coordinates]
+
+    results = []
+    if located:
+        rows = [coordinates[name] for name in located]
+        radii = np.array([row[3] for row in rows])
+        distances = haversine(latitude, longitude, [row[1] for row in rows], [row[2] for row in rows])
+        within = distances <= radii
+
+        for i in np.argsort(distances, kind="stable"):
+            results.append({
+                "restaurant": located[i],
+                "restaurant_name": rows[i][0],
+                "distance": round(float(distances[i]), 2),
+                "allowed_radius": float(radii[i]),
+                "is_within_range": bool(within[i]),
+            })
+
+    for name in restaurants:
+        if name not in coordinates:
+            results.append({
+                "restaurant": name,
+                "restaurant_name": None,
+                "distance": None,
+                "allowed_radius": DEFAULT_RADIUS_M,
+                "is_within_range": True,
+            })
+
+    return results
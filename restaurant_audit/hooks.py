@@ -114,6 +114,9 @@ page_css = {
 # before_install = "restaurant_audit.install.before_install"
 # after_install = "restaurant_audit.install.after_install"
 
+# Compile translations/*.csv into hashed static bundles under public/translations
+after_migrate = ["restaurant_audit.translation_bundles.after_migrate"]
+
 # Uninstallation
 # ------------
 
@@ -240,9 +243,25 @@ page_css = {
 # Update your hooks.py scheduler_events section
 
 scheduler_events = {
+    "cron": {
+        "* * * * *": [
+            "restaurant_audit.tasks.flush_location_check_logs",     # Bulk-insert buffered location checks
+            "restaurant_audit.tasks.publish_template_transitions"   # Push daily template open/close events
+        ],
+        "*/5 * * * *": [
+            "restaurant_audit.tasks.flush_template_usage"           # Write buffered template usage
+        ]
+    },
     "daily": [
-        "restaurant_audit.tasks.daily_audit_status_update",      # Update overdue audits at 12 AM
-        "restaurant_audit.tasks.daily_user_assignment_cleanup"   # Clean up disabled/removed users
+        "restaurant_audit.tasks.daily_audit_status_update",      # Mark overdue audits, close last week
+        "restaurant_audit.tasks.daily_user_assignment_cleanup",  # Clean up disabled/removed users
+        "restaurant_audit.tasks.reconcile_audit_counters",       # Repair drift in audit counters
+        "restaurant_audit.tasks.reconcile_dashboard_stats",      # Repair and roll auditor dashboard stats
+        "restaurant_audit.tasks.rebuild_template_schedule"       # Extend daily template transitions
+    ],
+    "daily_long": [
+        "restaurant_audit.tasks.archive_location_check_logs",    # Archive old location checks
+        "restaurant_audit.tasks.scan_location_anomalies"         # Flag suspicious GPS patterns
     ],
     "weekly": [
         "restaurant_audit.tasks.check_weekly_audits"            # Weekly audit compliance check
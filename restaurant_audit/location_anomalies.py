@@ -0,0 +1,220 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Nightly scan of Location Check Log for suspicious GPS patterns.
+
+Logs of the last `location_anomaly_lookback_days` (site config, default 7)
+are loaded per chunk of users, ordered by (user, check_time), into NumPy
+arrays. Three patterns are flagged per user:
+
+- Duplicate Fix: the exact same coordinates reported on several days
+- Impossible Travel: consecutive fixes further apart than a vehicle could go
+- Chronic Out Of Range: most checks outside the restaurant's radius
+
+Each flagged pattern opens, or updates the open, Location Anomaly of that
+user and type for review. A pattern a reviewer already Confirmed or
+Dismissed is not opened again until it shows up in evidence recorded
+entirely after the review.
+"""
+
+import json
+from collections import Counter
+
+import frappe
+import numpy as np
+from frappe.utils import add_days, cint, get_datetime, getdate
+
+from restaurant_audit.geo import haversine_pairs
+
+DEFAULT_LOOKBACK_DAYS = 7
+USERS_PER_CHUNK = 500
+
+MAX_SPEED_KMH = 250
+MIN_JUMP_M = 2000
+DUPLICATE_MIN_DAYS = 3
+OUT_OF_RANGE_MIN_CHECKS = 5
+OUT_OF_RANGE_MIN_RATE = 0.5
+
+
+def scan_location_anomalies(from_date=None, to_date=None, users_per_chunk=USERS_PER_CHUNK):
+    """Scan the window for anomalies; returns the number of anomalies opened or updated"""
+    to_date = getdate(to_date)
+    from_date = getdate(from_date) if from_date else add_days(
+        to_date, -(cint(frappe.conf.get("location_anomaly_lookback_days")) or DEFAULT_LOOKBACK_DAYS)
+    )
+    window = {"from_time": from_date, "to_time": add_days(to_date, 1)}
+
+    users = frappe.db.sql("""
+        SELECT DISTINCT user FROM `tabLocation Check Log`
+        WHERE check_time >= %(from_time)s AND check_time < %(to_time)s AND user IS NOT NULL
+    """, window, pluck=True)
+
+    flagged = 0
+    for start in range(0, len(users), users_per_chunk):
+        rows = frappe.db.sql("""
+            SELECT user, check_time, user_latitude, user_longitude, is_within_range, restaurant
+            FROM `tabLocation Check Log`
+            WHERE user IN %(users)s AND check_time >= %(from_time)s AND check_time < %(to_time)s
+            ORDER BY user, check_time
+        """, {**window, "users": tuple(users[start:start + users_per_chunk])})
+
+        flagged += save_anomalies(analyze_checks(rows), from_date)
+        frappe.db.commit()
+
+    return flagged
+
+
+def analyze_checks(rows):
+    """Find anomalies in (user, check_time, lat, lon, is_within_range, restaurant) rows.
+
+    Rows must be ordered by user, then check_time. Returns a list of
+    anomaly dicts ready for `save_anomalies`.
+    """
+    if not rows:
+        return []
+
+    users, times, latitudes, longitudes, within, restaurants = zip(*rows)
+    user_names, codes = np.unique(np.array(users, dtype=object), return_inverse=True)
+    seconds = np.array(times, dtype="datetime64[s]").astype(np.int64)
+    latitudes = np.array(latitudes, dtype=float)
+    longitudes = np.array(longitudes, dtype=float)
+    within = np.array(within, dtype=float)
+    user_count = len(user_names)
+
+    first_seen = np.full(user_count, np.iinfo(np.int64).max)
+    last_seen = np.full(user_count, np.iinfo(np.int64).min)
+    np.minimum.at(first_seen, codes, seconds)
+    np.maximum.at(last_seen, codes, seconds)
+
+    anomalies = []
+
+    def add(code, anomaly_type, **values):
+        anomalies.append({
+            "user": user_names[code],
+            "anomaly_type": anomaly_type,
+            "first_seen": to_datetime(values.pop("first", first_seen[code])),
+            "last_seen": to_datetime(values.pop("last", last_seen[code])),
+            **values,
+        })
+
+    located = np.flatnonzero(~np.isnan(latitudes) & ~np.isnan(longitudes))
+    codes_l, seconds_l = codes[located], seconds[located]
+    lat_l, lon_l = latitudes[located], longitudes[located]
+
+    # Impossible travel between consecutive fixes of the same user
+    if len(located) > 1:
+        same_user = codes_l[1:] == codes_l[:-1]
+        distances = haversine_pairs(lat_l[:-1], lon_l[:-1], lat_l[1:], lon_l[1:])
+        elapsed = np.maximum(seconds_l[1:] - seconds_l[:-1], 1)
+        speeds = distances / elapsed * 3.6
+        jumps = np.flatnonzero(same_user & (distances >= MIN_JUMP_M) & (speeds > MAX_SPEED_KMH))
+
+        jump_codes = codes_l[1:][jumps]
+        jump_counts = np.bincount(jump_codes, minlength=user_count)
+        max_speeds = np.zeros(user_count)
+        jump_first = np.full(user_count, np.iinfo(np.int64).max)
+        jump_last = np.full(user_count, np.iinfo(np.int64).min)
+        np.maximum.at(max_speeds, jump_codes, speeds[jumps])
+        np.minimum.at(jump_first, jump_codes, seconds_l[:-1][jumps])
+        np.maximum.at(jump_last, jump_codes, seconds_l[1:][jumps])
+
+        for code in np.flatnonzero(jump_counts):
+            add(code, "Impossible Travel",
+                first=jump_first[code], last=jump_last[code],
+                occurrences=int(jump_counts[code]),
+                max_speed_kmh=round(float(max_speeds[code]), 1),
+                details={"threshold_kmh": MAX_SPEED_KMH, "min_jump_m": MIN_JUMP_M})
+
+    # Identical fixes (to ~0.1 m) reported on several different days
+    if len(located):
+        fixes = np.column_stack([
+            codes_l,
+            np.round(lat_l * 1e6).astype(np.int64),
+            np.round(lon_l * 1e6).astype(np.int64),
+            seconds_l // 86400,
+        ])
+        fix_days = np.unique(fixes, axis=0)
+        repeated, day_counts = np.unique(fix_days[:, :3], axis=0, return_counts=True)
+        duplicates = repeated[day_counts >= DUPLICATE_MIN_DAYS]
+        duplicate_days = day_counts[day_counts >= DUPLICATE_MIN_DAYS]
+
+        for code in np.unique(duplicates[:, 0]):
+            mine = duplicates[:, 0] == code
+            add(code, "Duplicate Fix",
+                occurrences=int(mine.sum()),
+                details={
+                    "fixes": [
+                        {"latitude": lat / 1e6, "longitude": lon / 1e6, "days": int(days)}
+                        for (_, lat, lon), days in zip(duplicates[mine], duplicate_days[mine])
+                    ][:20],
+                    "min_days": DUPLICATE_MIN_DAYS,
+                })
+
+    # Most checks outside the allowed radius
+    checks = np.bincount(codes, minlength=user_count)
+    out_of_range = np.bincount(codes, weights=(within == 0), minlength=user_count)
+    rates = out_of_range / np.maximum(checks, 1)
+    restaurants = np.array(restaurants, dtype=object)
+
+    for code in np.flatnonzero((checks >= OUT_OF_RANGE_MIN_CHECKS) & (rates >= OUT_OF_RANGE_MIN_RATE)):
+        outside = Counter(restaurants[(codes == code) & (within == 0)])
+        restaurant = next((name for name, _ in outside.most_common() if name), None)
+        add(code, "Chronic Out Of Range",
+            occurrences=int(out_of_range[code]),
+            out_of_range_rate=round(float(rates[code]) * 100, 2),
+            restaurant=restaurant,
+            details={"checks": int(checks[code]), "by_restaurant": dict(outside.most_common(10))})
+
+    return anomalies
+
+
+def to_datetime(seconds):
+    return np.datetime64(int(seconds), "s").astype(object)
+
+
+def save_anomalies(anomalies, from_date=None):
+    """Open a Location Anomaly per finding, or update the open one of the same user and type.
+
+    Findings matching a reviewed anomaly that overlaps the scanned window
+    (from `from_date`) are skipped, unless all of their evidence is newer
+    than the review. Returns the number of anomalies opened or updated.
+    """
+    if not anomalies:
+        return 0
+
+    if from_date is None:
+        from_date = min(a["first_seen"] for a in anomalies)
+
+    # An open anomaly takes precedence over reviewed ones, else the latest reviewed one wins
+    known = {}
+    for row in frappe.get_all("Location Anomaly",
+        filters={"user": ["in", list({a["user"] for a in anomalies})]},
+        or_filters={"status": "Open", "last_seen": [">=", from_date]},
+        fields=["name", "user", "anomaly_type", "status", "first_seen", "max_speed_kmh", "reviewed_on", "modified"],
+        order_by="last_seen asc"
+    ):
+        current = known.get((row.user, row.anomaly_type))
+        if not current or current.status != "Open":
+            known[(row.user, row.anomaly_type)] = row
+
+    saved = 0
+    for anomaly in anomalies:
+        existing = known.get((anomaly["user"], anomaly["anomaly_type"]))
+
+        if existing and existing.status != "Open":
+            if get_datetime(anomaly["first_seen"]) <= get_datetime(existing.reviewed_on or existing.modified):
+                continue
+            existing = None
+
+        anomaly["details"] = json.dumps(anomaly.get("details") or {}, default=str)
+        if existing:
+            values = dict(anomaly)
+            values["first_seen"] = min(existing.first_seen or anomaly["first_seen"], anomaly["first_seen"])
+            if anomaly.get("max_speed_kmh") is not None:
+                values["max_speed_kmh"] = max(existing.max_speed_kmh or 0, anomaly["max_speed_kmh"])
+            frappe.db.set_value("Location Anomaly", existing.name, values)
+        else:
+            frappe.get_doc({"doctype": "Location Anomaly", "status": "Open", **anomaly}).insert(ignore_permissions=True)
+        saved += 1
+
+    return saved
@@ -0,0 +1,187 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Retention for Location Check Log.
+
+Logs older than `location_check_retention_days` (site config, default 90)
+are moved out of the database one day at a time:
+
+1. the day's rows are appended to a gzip JSON-lines archive under
+   `<site>/private/location_check_archive/<YYYY>/<MM>/<YYYY-MM-DD>.<part>.jsonl.gz`,
+2. Location Check Summary rows (checks, in-range rate, min and median
+   distance per restaurant) are recomputed from everything archived for that
+   day,
+3. the archived rows are deleted.
+
+Archives stay queryable through `read_location_archive` and the
+`query_location_archive` endpoint. Rows are deduplicated by name when read,
+so re-running a day after an interrupted run is safe.
+"""
+
+import glob
+import gzip
+import json
+import os
+
+import frappe
+import numpy as np
+from frappe.utils import add_days, cint, getdate
+
+ARCHIVE_FOLDER = "location_check_archive"
+DEFAULT_RETENTION_DAYS = 90
+MAX_DAYS_PER_RUN = 31
+
+LOG_COLUMNS = [
+    "name", "creation", "owner", "restaurant", "user", "check_time", "user_latitude", "user_longitude",
+    "calculated_distance", "is_within_range", "restaurant_latitude", "restaurant_longitude",
+    "allowed_radius", "device_info", "ip_address", "notes",
+]
+
+
+def get_retention_days():
+    return cint(frappe.conf.get("location_check_retention_days")) or DEFAULT_RETENTION_DAYS
+
+
+def archive_location_checks(retention_days=None, max_days=MAX_DAYS_PER_RUN):
+    """Archive and summarize whole days of logs older than the retention period.
+
+    At most `max_days` days are processed per run, oldest first, so a large
+    backlog is worked off over successive nights. Returns the number of
+    rows archived.
+    """
+    cutoff = add_days(getdate(), -(retention_days or get_retention_days()))
+    days = frappe.db.sql("""
+        SELECT DISTINCT DATE(check_time) AS day
+        FROM `tabLocation Check Log`
+        WHERE check_time < %(cutoff)s
+        ORDER BY day
+        LIMIT %(max_days)s
+    """, {"cutoff": cutoff, "max_days": int(max_days)}, pluck=True)
+
+    archived = 0
+    for day in days:
+        archived += archive_day(getdate(day))
+    return archived
+
+
+def archive_day(day):
+    """Move one day of logs into its archive file and refresh its summaries"""
+    rows = frappe.db.sql(f"""
+        SELECT {", ".join(f"`{column}`" for column in LOG_COLUMNS)}
+        FROM `tabLocation Check Log`
+        WHERE check_time >= %(day)s AND check_time < %(next_day)s
+    """, {"day": day, "next_day": add_days(day, 1)}, as_dict=True)
+    if not rows:
+        return 0
+
+    write_archive_part(day, rows)
+    update_day_summaries(day)
+
+    names = [row.name for row in rows]
+    for start in range(0, len(names), 1000):
+        frappe.db.delete("Location Check Log", {"name": ["in", names[start:start + 1000]]})
+    frappe.db.commit()
+
+    return len(rows)
+
+
+def get_archive_folder(day=None):
+    folder = frappe.get_site_path("private", ARCHIVE_FOLDER)
+    if day:
+        folder = os.path.join(folder, f"{day:%Y}", f"{day:%m}")
+    return folder
+
+
+def get_archive_files(day):
+    return sorted(glob.glob(os.path.join(get_archive_folder(day), f"{day:%Y-%m-%d}.*.jsonl.gz")))
+
+
+def write_archive_part(day, rows):
+    folder = get_archive_folder(day)
+    os.makedirs(folder, exist_ok=True)
+
+    path = os.path.join(folder, f"{day:%Y-%m-%d}.{frappe.generate_hash(length=8)}.jsonl.gz")
+    temp_path = f"{path}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8") as archive:
+        for row in rows:
+            archive.write(json.dumps(row, default=str, separators=(",", ":")))
+            archive.write("\n")
+    os.replace(temp_path, path)
+    return path
+
+
+def read_archive_day(day):
+    """All archived rows of a day, deduplicated by name"""
+    seen = set()
+    for path in get_archive_files(day):
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                row = json.loads(line)
+                if row["name"] in seen:
+                    continue
+                seen.add(row["name"])
+                yield frappe._dict(row)
+
+
+def read_location_archive(from_date, to_date, restaurant=None, user=None):
+    """Yield archived log rows between two dates, optionally for one restaurant or user"""
+    day, to_date = getdate(from_date), getdate(to_date)
+    while day <= to_date:
+        for row in read_archive_day(day):
+            if restaurant and row.restaurant != restaurant:
+                continue
+            if user and row.user != user:
+                continue
+            yield row
+        day = add_days(day, 1)
+
+
+@frappe.whitelist()
+def query_location_archive(from_date, to_date, restaurant=None, user=None, limit=1000):
+    """Archived location checks for investigations (System Manager only)"""
+    frappe.only_for("System Manager")
+
+    limit = cint(limit) or 1000
+    rows = []
+    for row in read_location_archive(from_date, to_date, restaurant, user):
+        rows.append(row)
+        if len(rows) >= limit:
+            break
+
+    return {
+        "success": True,
+        "rows": rows,
+        "truncated": len(rows) >= limit
+    }
+
+
+def update_day_summaries(day):
+    """Recompute the day's Location Check Summary rows from its archive files"""
+    by_restaurant = {}
+    for row in read_archive_day(day):
+        if row.restaurant:
+            by_restaurant.setdefault(row.restaurant, []).append(row)
+
+    for restaurant, rows in by_restaurant.items():
+        distances = np.array([row.calculated_distance for row in rows if row.calculated_distance is not None], dtype=float)
+        in_range = sum(1 for row in rows if cint(row.is_within_range))
+
+        values = {
+            "checks": len(rows),
+            "in_range_checks": in_range,
+            "in_range_rate": round(in_range * 100 / len(rows), 2),
+            "min_distance": float(distances.min()) if len(distances) else 0,
+            "median_distance": float(np.median(distances)) if len(distances) else 0,
+            "distinct_users": len({row.user for row in rows}),
+        }
+
+        name = frappe.db.get_value("Location Check Summary", {"restaurant": restaurant, "check_date": day}, "name")
+        if name:
+            frappe.db.set_value("Location Check Summary", name, values)
+        else:
+            frappe.get_doc({
+                "doctype": "Location Check Summary",
+                "restaurant": restaurant,
+                "check_date": day,
+                **values
+            }).db_insert()
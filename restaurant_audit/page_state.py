@@ -0,0 +1,65 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Initial state embedded in the audit pages.
+
+`get_context` of /audit-restaurants and /audit-form renders what the page
+would otherwise fetch on load into a JSON island,
+
+    <script type="application/json" id="initial-state">...</script>
+
+built from the same services the API endpoints use, so first paint needs no
+API round trip. The page scripts read the island first and only call the API
+when a section is missing from it. The translation manifest is included so
+the language switcher can fetch its bundles without asking for it.
+"""
+
+import frappe
+
+from restaurant_audit.auditor_context import get_auditor_context
+from restaurant_audit.translation_bundles import get_manifest
+
+RESTAURANT_FIELDS = ["name", "restaurant_name", "address", "latitude", "longitude", "location_radius"]
+
+
+def get_audit_restaurants_state():
+    from restaurant_audit.api.audit_api import bootstrap
+
+    return {
+        "bootstrap": bootstrap(),
+        "translations": get_manifest(),
+    }
+
+
+def get_audit_form_state(restaurant=None, progress_id=None):
+    """Restaurant and, for regular audits, checklist of the audit being opened.
+
+    Only restaurants the auditor may audit are embedded; anything else is left
+    for the page to load (and be refused) through the API.
+    """
+    from restaurant_audit.api.audit_api import get_checklist_template
+
+    state = {"translations": get_manifest()}
+
+    if progress_id:
+        restaurant = frappe.db.get_value("Audit Progress",
+            {"name": progress_id, "auditor": frappe.session.user}, "restaurant")
+    elif restaurant not in get_auditor_context().restaurants:
+        restaurant = None
+
+    if restaurant:
+        state["restaurant"] = frappe.db.get_value("Restaurant", restaurant, RESTAURANT_FIELDS, as_dict=True)
+        if not progress_id:
+            state["checklist"] = get_checklist_template(restaurant)
+
+    return state
+
+
+def dump_initial_state(state):
+    """JSON that is safe to place inside a <script> element"""
+    return (
+        frappe.as_json(state, indent=None)
+        .replace("<", "\\u003c")
+        .replace(">", "\\u003e")
+        .replace("&", "\\u0026")
+    )
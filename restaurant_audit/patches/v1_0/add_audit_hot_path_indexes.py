@@ -0,0 +1,19 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+from restaurant_audit.restaurant_audit.doctype.audit_progress import audit_progress
+from restaurant_audit.restaurant_audit.doctype.audit_submission import audit_submission
+from restaurant_audit.restaurant_audit.doctype.restaurant_employee import restaurant_employee
+from restaurant_audit.restaurant_audit.doctype.scheduled_audit_visit import scheduled_audit_visit
+
+
+def execute():
+    """Add the composite indexes used by the audit API, tasks and reports.
+
+    New sites get these from each DocType's `on_doctype_update`; existing
+    sites only run that hook when the DocType JSON changes, so call them here.
+    """
+    scheduled_audit_visit.on_doctype_update()
+    audit_submission.on_doctype_update()
+    audit_progress.on_doctype_update()
+    restaurant_employee.on_doctype_update()
@@ -0,0 +1,9 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+from restaurant_audit.restaurant_audit.doctype.location_check_log import location_check_log
+
+
+def execute():
+    """Add the check_time and (user, check_time) indexes used by archiving and the anomaly scan"""
+    location_check_log.on_doctype_update()
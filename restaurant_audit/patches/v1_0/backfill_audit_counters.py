@@ -0,0 +1,11 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+from restaurant_audit.restaurant_audit.doctype.restaurant_auditor_stats.restaurant_auditor_stats import (
+    reconcile_audit_counters,
+)
+
+
+def execute():
+    """Fill Restaurant audit counters and Restaurant Auditor Stats from existing submissions"""
+    reconcile_audit_counters()
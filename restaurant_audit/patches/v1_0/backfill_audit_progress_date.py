@@ -0,0 +1,17 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from restaurant_audit.restaurant_audit.doctype.audit_progress import audit_progress
+
+
+def execute():
+    """Fill Audit Progress.audit_date from start_time for existing rows"""
+    frappe.db.sql("""
+        UPDATE `tabAudit Progress`
+        SET audit_date = DATE(start_time)
+        WHERE start_time IS NOT NULL
+            AND (audit_date IS NULL OR audit_date != DATE(start_time))
+    """)
+    audit_progress.on_doctype_update()
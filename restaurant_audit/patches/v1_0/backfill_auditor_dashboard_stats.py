@@ -0,0 +1,11 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+from restaurant_audit.restaurant_audit.doctype.auditor_dashboard_stats.auditor_dashboard_stats import (
+    reconcile_dashboard_stats,
+)
+
+
+def execute():
+    """Fill Auditor Dashboard Stats from existing submissions and progress"""
+    reconcile_dashboard_stats()
@@ -0,0 +1,18 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+import frappe
+
+
+def execute():
+    """Queue a rescore, so submissions scored without Text/Image answers or with uncapped digits are fixed"""
+    if not frappe.db.count("Audit Submission"):
+        return
+
+    frappe.enqueue(
+        "restaurant_audit.rescoring.rescore_submissions",
+        queue="long",
+        timeout=4 * 60 * 60,
+        job_id=f"rescore_audits::{frappe.local.site}",
+        deduplicate=True,
+    )
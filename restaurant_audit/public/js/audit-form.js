@@ -3,6 +3,19 @@ let currentRestaurant = null;
 let auditData = { categories: [], answers: {} };
 let totalQuestions = 0;
 
+// Restaurant and checklist rendered into the page by get_context
+const initialState = readInitialState();
+
+function readInitialState() {
+    const island = document.getElementById('initial-state');
+    try {
+        return island ? JSON.parse(island.textContent) || {} : {};
+    } catch (error) {
+        console.warn('Initial state unreadable:', error);
+        return {};
+    }
+}
+
 // --- CHAT MODAL STATE & LOGIC ---
 const chatModal = document.getElementById('chat-modal');
 const chatMessages = document.getElementById('chat-messages');
@@ -20,8 +33,8 @@ async function initializeAuditForm() {
         const restaurantId = urlParams.get('restaurant');
         if (!restaurantId) throw new Error('No restaurant selected.');
         const storedRestaurant = sessionStorage.getItem('selectedRestaurant');
-        if (storedRestaurant) {
-            currentRestaurant = JSON.parse(storedRestaurant);
+        if (initialState.restaurant || storedRestaurant) {
+            currentRestaurant = initialState.restaurant || JSON.parse(storedRestaurant);
             document.getElementById('restaurant-name').textContent = currentRestaurant.restaurant_name;
         }
         await checkUserLocation(restaurantId);
@@ -32,15 +45,11 @@ async function initializeAuditForm() {
 }
 
 async function loadChecklistTemplate(restaurantId) {
-    const response = await fetch('/api/method/restaurant_audit.api.audit_api.get_checklist_template', {
-        method: 'POST', headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ restaurant_id: restaurantId })
-    });
-    if (!response.ok) throw new Error(`Server error: ${response.status}`);
-    const result = await response.json();
-    if (!result.message?.success) throw new Error(result.message?.message || 'Failed to load checklist.');
+    const checklist = initialState.checklist?.success
+        ? initialState.checklist
+        : await fetchChecklistTemplate(restaurantId);
     const icons = ["🧼", "🍳", "😊", "🔥", "📋", "📦"];
-    auditData.categories = result.message.templates.flatMap((template, tIndex) =>
+    auditData.categories = checklist.templates.flatMap((template, tIndex) =>
         template.categories.map((cat, cIndex) => ({
             id: cat.id, name: cat.name, icon: icons[(tIndex + cIndex) % icons.length],
             questions: cat.questions.map(q => ({
@@ -60,6 +69,17 @@ async function loadChecklistTemplate(restaurantId) {
     updateDashboard();
 }
 
+async function fetchChecklistTemplate(restaurantId) {
+    const response = await fetch('/api/method/restaurant_audit.api.audit_api.get_checklist_template', {
+        method: 'POST', headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ restaurant_id: restaurantId })
+    });
+    if (!response.ok) throw new Error(`Server error: ${response.status}`);
+    const result = await response.json();
+    if (!result.message?.success) throw new Error(result.message?.message || 'Failed to load checklist.');
+    return result.message;
+}
+
 function renderCategoryGrid() {
     const grid = document.getElementById('category-grid');
     grid.innerHTML = '';
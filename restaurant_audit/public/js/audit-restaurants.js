@@ -11,6 +11,12 @@ document.addEventListener('DOMContentLoaded', function() {
 
 async function initializePage() {
     try {
+        // Everything the page shows in one request; the per-section
+        // loaders below are only the fallback
+        if (await loadBootstrap()) {
+            return;
+        }
+
         // Load user dashboard first
         await loadUserDashboard();
         
@@ -22,6 +28,120 @@ async function initializePage() {
     }
 }
 
+let pageBootstrapped = false;
+
+// State rendered into the page by get_context; {} when missing or unreadable
+function readInitialState() {
+    const island = document.getElementById('initial-state');
+    try {
+        return island ? JSON.parse(island.textContent) || {} : {};
+    } catch (error) {
+        console.warn('Initial state unreadable:', error);
+        return {};
+    }
+}
+
+const initialState = readInitialState();
+
+// Load every section of the page with one bootstrap request, unless the
+// page came with it
+async function loadBootstrap() {
+    if (initialState.bootstrap?.success) {
+        applyBootstrap(initialState.bootstrap);
+        return true;
+    }
+
+    try {
+        const response = await fetch('/api/method/restaurant_audit.api.audit_api.bootstrap', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            credentials: 'include'
+        });
+
+        const result = await response.json();
+        if (!result.message?.success) {
+            console.error('Bootstrap failed, loading sections one by one:', result.message);
+            return false;
+        }
+        applyBootstrap(result.message);
+        return true;
+    } catch (error) {
+        console.error('Error loading page data:', error);
+        return false;
+    }
+}
+
+function applyBootstrap(data) {
+    userDashboard = data.dashboard;
+    updateUserInfo();
+    updateDashboardStats();
+
+    showRestaurants(data.restaurants);
+    renderWeeklyScheduledAudits(data.scheduled_audits.current_week, data.scheduled_audits.next_week);
+    showMyWeeklyVisits(data.my_visits);
+    renderDailyTemplatesFromBackend(data.daily_templates);
+    showLastWeekResult(data.last_week);
+
+    pageBootstrapped = true;
+}
+
+function showRestaurants(restaurants) {
+    allRestaurants = restaurants;
+    console.log('Loaded restaurants:', allRestaurants.length);
+    document.getElementById('total-restaurants').textContent = allRestaurants.length;
+
+    // Open progress comes with each restaurant as progress_data
+    filteredRestaurants = [...allRestaurants];
+
+    document.getElementById('loading').style.display = 'none';
+
+    if (allRestaurants.length === 0) {
+        console.log('No restaurants found, showing empty state');
+        document.getElementById('empty-state').style.display = 'block';
+    } else {
+        document.getElementById('restaurants-container').style.display = 'grid';
+        renderRestaurants();
+    }
+}
+
+function showMyWeeklyVisits(data) {
+    renderMyWeeklyVisits(data.current_week, data.next_week);
+
+    // Update weekly summary display
+    updateWeeklySummary(data);
+
+    // Update week period display for the table
+    if (data.current_week && data.current_week.start && data.current_week.end) {
+        const weekLabel = `${formatDate(data.current_week.start)} - ${formatDate(data.current_week.end)}`;
+        console.log('Week period:', weekLabel);
+        document.querySelector('.my-visits-section h3').innerHTML = `
+            <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                <path d="M9 11l3 3 8-8"/>
+                <path d="M21 12c0 4.97-4.03 9-9 9s-9-4.03-9-9 4.03-9 9-9c1.51 0 2.93.37 4.18 1.03"/>
+            </svg>
+            My Scheduled Visits for the Week (${weekLabel})
+        `;
+    }
+}
+
+function showLastWeekResult(result) {
+    if (!result?.success) {
+        return;
+    }
+    console.log('Last week processed:', result);
+
+    // Show notification once per processed week
+    const seenKey = 'last_week_notified';
+    if (!result.processed || localStorage.getItem(seenKey) === result.last_week_start) {
+        return;
+    }
+    localStorage.setItem(seenKey, result.last_week_start);
+
+    if (result.updates_made > 0 && typeof showNotification === 'function') {
+        showNotification(`Last week processed: ${result.updates_made} audits updated to Overdue`, 'info');
+    }
+}
+
 async function loadUserDashboard() {
     try {
         const response = await fetch('/api/method/restaurant_audit.api.audit_api.get_user_dashboard', {
@@ -60,7 +180,7 @@ function updateDashboardStats() {
     }
     
     document.getElementById('pending-progress').textContent = 
-        userDashboard.pending_progress ? userDashboard.pending_progress.length : 0;
+        userDashboard.stats?.pending_progress || 0;
 }
 // Replace loadRestaurants function in audit-restaurants.html
 
@@ -78,24 +198,7 @@ const result = await response.json();
 console.log('API Response:', result);
 
 if (result.message?.success) {
-    allRestaurants = result.message.restaurants;
-    console.log('Loaded restaurants:', allRestaurants.length);
-    document.getElementById('total-restaurants').textContent = allRestaurants.length;
-    
-    // Check for pending progress
-    await checkPendingProgress();
-    
-    filteredRestaurants = [...allRestaurants];
-    
-    document.getElementById('loading').style.display = 'none';
-    
-    if (allRestaurants.length === 0) {
-        console.log('No restaurants found, showing empty state');
-        document.getElementById('empty-state').style.display = 'block';
-    } else {
-        document.getElementById('restaurants-container').style.display = 'grid';
-        renderRestaurants();
-    }
+    showRestaurants(result.message.restaurants);
 } else {
     console.error('API returned error:', result.message);
     throw new Error(result.message?.message || 'Failed to load restaurants');
@@ -105,27 +208,6 @@ console.error('Error loading restaurants:', error);
 showError(error.message || 'Failed to load restaurants. Please try again.');
     }
 }
-async function checkPendingProgress() {
-    for (let restaurant of allRestaurants) {
-        try {
-            const response = await fetch('/api/method/restaurant_audit.api.audit_api.get_audit_progress', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ restaurant_id: restaurant.name }),
-                credentials: 'include'
-            });
-
-            const result = await response.json();
-            if (result.message?.success && result.message.has_progress) {
-                restaurant.has_progress = true;
-                restaurant.progress_data = result.message;
-            }
-        } catch (error) {
-            console.error('Error checking progress for', restaurant.name, error);
-        }
-    }
-}
-
 function renderRestaurants() {
     const container = document.getElementById('restaurants-container');
     container.innerHTML = '';
@@ -623,23 +705,7 @@ console.log('My weekly visits API Response:', result);
 
 if (result.message?.success) {
     console.log('My weekly visits loaded');
-    renderMyWeeklyVisits(result.message.current_week, result.message.next_week);
-    
-    // Update weekly summary display
-    updateWeeklySummary(result.message);
-    
-    // Update week period display for the table
-    if (result.message.current_week && result.message.current_week.start && result.message.current_week.end) {
-        const weekLabel = `${formatDate(result.message.current_week.start)} - ${formatDate(result.message.current_week.end)}`;
-        console.log('Week period:', weekLabel);
-        document.querySelector('.my-visits-section h3').innerHTML = `
-            <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                <path d="M9 11l3 3 8-8"/>
-                <path d="M21 12c0 4.97-4.03 9-9 9s-9-4.03-9-9 4.03-9 9-9c1.51 0 2.93.37 4.18 1.03"/>
-            </svg>
-            My Scheduled Visits for the Week (${weekLabel})
-        `;
-    }
+    showMyWeeklyVisits(result.message);
 } else {
     console.error('Failed to load my weekly visits:', result.message);
 }
@@ -751,14 +817,7 @@ const response = await fetch('/api/method/restaurant_audit.api.audit_api.process
 });
 
 const result = await response.json();
-if (result.message?.success) {
-    console.log('Last week processed:', result.message);
-    
-    // Show notification if there were updates
-    if (result.message.updates_made > 0) {
-        showNotification(`Last week processed: ${result.message.updates_made} audits updated to Overdue`, 'info');
-    }
-}
+showLastWeekResult(result.message);
     } catch (error) {
 console.error('Error processing last week updates:', error);
     }
@@ -963,6 +1022,37 @@ function renderMyScheduledVisits(visits) {
     });
 }
 
+let templateTransitionsLive = false;
+
+// Listen for daily_template_transition events on the site's socket.io namespace
+function subscribeTemplateTransitions() {
+    const connect = () => {
+        const site = document.body.dataset.site || window.location.hostname;
+        // Behind nginx socket.io shares the origin; `bench start` serves it on its own port
+        const port = window.location.port && document.body.dataset.socketioPort;
+        const host = port ? `${window.location.protocol}//${window.location.hostname}:${port}` : window.location.origin;
+        const socket = io(`${host}/${site}`, { withCredentials: true, reconnectionAttempts: 5 });
+
+        socket.on('connect', () => { templateTransitionsLive = true; });
+        socket.on('disconnect', () => { templateTransitionsLive = false; });
+        socket.on('daily_template_transition', () => {
+            if (document.getElementById('daily-audit-content').classList.contains('active')) {
+                loadDailyTemplatesFromBackend();
+            }
+        });
+    };
+
+    if (window.io) {
+        connect();
+        return;
+    }
+    const script = document.createElement('script');
+    script.src = '/socket.io/socket.io.js';
+    script.onload = connect;
+    script.onerror = () => console.warn('Realtime unavailable, polling daily templates');
+    document.head.appendChild(script);
+}
+
 async function loadDailyTemplatesFromBackend() {
     try {
         const response = await fetch('/api/method/restaurant_audit.api.audit_api.get_daily_templates', {
@@ -1096,14 +1186,7 @@ alert('Error starting daily audit. Please try again.');
 // New functions to load data with status updates
 async function loadScheduledAuditsWithStatusUpdate() {
     try {
-// First trigger status update
-await fetch('/api/method/restaurant_audit.api.audit_api.process_last_week_status', {
-    method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
-    credentials: 'include'
-});
-
-// Then load the updated data
+// Last week is closed by the scheduler; nothing to trigger first
 await loadScheduledAudits();
     } catch (error) {
 console.error('Error loading scheduled audits with status update:', error);
@@ -1114,14 +1197,7 @@ await loadScheduledAudits();
 
 async function loadMyScheduledVisitsWithStatusUpdate() {
     try {
-// First trigger status update  
-await fetch('/api/method/restaurant_audit.api.audit_api.process_last_week_status', {
-    method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
-    credentials: 'include'
-});
-
-// Then load the updated data
+// Last week is closed by the scheduler; nothing to trigger first
 await loadMyScheduledVisits();
     } catch (error) {
 console.error('Error loading my visits with status update:', error);
@@ -1300,15 +1376,19 @@ modalVisitDateInput.max = maxDateStr;
                 select.appendChild(option);
             });
 
-            // Load scheduled visits data
-            loadScheduledAudits();
-            loadMyScheduledVisits();
+            // Load scheduled visits data unless bootstrap already did
+            if (!pageBootstrapped) {
+                loadScheduledAudits();
+                loadMyScheduledVisits();
+            }
         }
     }, 2000);
     
-    // Update template status every minute for daily audit tab
+    // Refresh daily templates when the server pushes an open/close transition;
+    // fall back to polling every minute while realtime is not connected
+    subscribeTemplateTransitions();
     setInterval(() => {
-        if (document.getElementById('daily-audit-content').classList.contains('active')) {
+        if (!templateTransitionsLive && document.getElementById('daily-audit-content').classList.contains('active')) {
             loadDailyTemplatesFromBackend();
         }
     }, 60000);
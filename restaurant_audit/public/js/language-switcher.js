@@ -24,23 +24,14 @@ const LanguageSwitcher = {
     // Load translation files
     loadTranslations: async function() {
         try {
-            // Load Arabic translations
-            const arResponse = await fetch('/api/method/restaurant_audit.api.translation_api.get_translations?lang=ar');
-            const arData = await arResponse.json();
-            if (arData.success) {
-                this.translations.ar = arData.message;
-            } else {
-                throw new Error(arData.message);
-            }
-            
-            // Load English translations (optional, can use defaults)
-            const enResponse = await fetch('/api/method/restaurant_audit.api.translation_api.get_translations?lang=en');
-            const enData = await enResponse.json();
-            if (enData.success) {
-                this.translations.en = enData.message || {};
-            } else {
-                this.translations.en = {};
+            // Static bundles compiled by `bench build`; the API is only a fallback
+            const bundle = await this.loadStaticBundles(['ar', 'en'])
+                || await this.loadBundleFromApi(['ar', 'en']);
+            if (!bundle.ar || !Object.keys(bundle.ar).length) {
+                throw new Error('Arabic translations missing from bundle');
             }
+            this.translations.ar = bundle.ar;
+            this.translations.en = bundle.en || {};
         } catch (error) {
             console.error('Error loading translations:', error);
             // Fallback to basic translations
@@ -48,6 +39,61 @@ const LanguageSwitcher = {
             this.translations.en = {};
         }
     },
+
+    // Hashed bundles listed in the manifest, served by nginx; null when not built
+    loadStaticBundles: async function(langs) {
+        const base = '/assets/restaurant_audit/translations/';
+        try {
+            // The page may carry the manifest in its initial state
+            const manifest = this.getInitialManifest() || await this.fetchManifest(base);
+            if (!manifest) {
+                return null;
+            }
+            if (!langs.every(lang => manifest[lang])) {
+                return null;
+            }
+
+            const catalogs = await Promise.all(langs.map(async lang => {
+                const response = await fetch(base + manifest[lang]);
+                if (!response.ok) {
+                    throw new Error(`Translation bundle ${manifest[lang]} not found`);
+                }
+                return response.json();
+            }));
+
+            const bundle = {};
+            langs.forEach((lang, i) => { bundle[lang] = catalogs[i]; });
+            return bundle;
+        } catch (error) {
+            console.warn('Static translation bundles unavailable:', error);
+            return null;
+        }
+    },
+
+    // Manifest embedded by get_context, if the page has an initial-state island
+    getInitialManifest: function() {
+        const island = document.getElementById('initial-state');
+        try {
+            return island ? JSON.parse(island.textContent).translations || null : null;
+        } catch (error) {
+            return null;
+        }
+    },
+
+    fetchManifest: async function(base) {
+        const response = await fetch(base + 'manifest.json', { cache: 'no-cache' });
+        return response.ok ? response.json() : null;
+    },
+
+    // Both catalogs in one request; the browser revalidates it by ETag
+    loadBundleFromApi: async function(langs) {
+        const response = await fetch('/api/method/restaurant_audit.api.translation_api.get_translation_bundle?langs=' + langs.join(','));
+        if (!response.ok) {
+            throw new Error(`Translation bundle request failed (${response.status})`);
+        }
+        const data = await response.json();
+        return data.message || {};
+    },
     
     // Apply language to the page
     applyLanguage: function(lang) {
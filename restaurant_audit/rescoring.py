@@ -0,0 +1,188 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Bulk rescoring of historical audit submissions.
+
+When scoring rules change (question weights, critical flags, answer types)
+every stored `numeric_score` and `average_score` is recomputed from the
+answer values with the current scoring plans:
+
+    bench --site <site> rescore-audits [--from-date 2024-01-01]
+
+Submissions are streamed in keyset-paginated chunks; each chunk is scored
+with NumPy and written back with one bulk UPDATE per table.
+"""
+
+import json
+
+import frappe
+import numpy as np
+from frappe.utils import flt
+
+from restaurant_audit.scoring import CRITICAL_SCORE, MAX_SCORE, get_scorer, get_scoring_plan, score_value
+
+CHUNK_SIZE = 1000
+
+
+@frappe.whitelist()
+def enqueue_rescore(from_date=None):
+    """Queue a rescoring run (System Manager only)"""
+    frappe.only_for("System Manager")
+
+    frappe.enqueue(
+        "restaurant_audit.rescoring.rescore_submissions",
+        queue="long",
+        timeout=4 * 60 * 60,
+        job_id=f"rescore_audits::{frappe.local.site}",
+        deduplicate=True,
+        from_date=from_date,
+    )
+    return {"success": True, "message": "Audit rescoring queued"}
+
+
+def rescore_submissions(from_date=None, chunk_size=CHUNK_SIZE):
+    """Recompute answer and submission scores; returns a summary of the run"""
+    from restaurant_audit.restaurant_audit.doctype.auditor_dashboard_stats.auditor_dashboard_stats import (
+        reconcile_dashboard_stats,
+    )
+    from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import (
+        rebuild_weekly_rollups,
+    )
+
+    conditions = "name > %(last_name)s"
+    params = {"last_name": ""}
+    if from_date:
+        conditions += " AND audit_date >= %(from_date)s"
+        params["from_date"] = from_date
+
+    total = frappe.db.sql(
+        f"SELECT COUNT(*) FROM `tabAudit Submission` WHERE {conditions}", params
+    )[0][0]
+    summary = {"submissions": 0, "answers_changed": 0, "total": total}
+
+    while True:
+        submissions = frappe.db.sql(f"""
+            SELECT name FROM `tabAudit Submission`
+            WHERE {conditions}
+            ORDER BY name
+            LIMIT {int(chunk_size)}
+        """, params, pluck=True)
+        if not submissions:
+            break
+
+        summary["answers_changed"] += rescore_chunk(submissions)
+        summary["submissions"] += len(submissions)
+        frappe.db.commit()
+
+        params["last_name"] = submissions[-1]
+        publish_rescore_progress(summary)
+
+    # Rollups carry score totals; rebuild them for the rescored weeks
+    rebuild_weekly_rollups(from_date)
+    # Dashboard stats carry score totals as well
+    reconcile_dashboard_stats()
+    return summary
+
+
+def rescore_chunk(submissions):
+    """Score all answers of the given submissions at once and write them back.
+
+    Returns the number of answer rows whose score or critical flag changed.
+    """
+    answers = frappe.db.sql("""
+        SELECT name, parent, question, category, answer_value, numeric_score, is_critical
+        FROM `tabAudit Answer`
+        WHERE parenttype = 'Audit Submission' AND parent IN %(submissions)s
+    """, {"submissions": tuple(submissions)}, as_dict=True)
+    if not answers:
+        frappe.db.bulk_update("Audit Submission", {
+            name: {"total_score": 0, "max_possible_score": 0, "average_score": 0, "category_scores": "{}"}
+            for name in submissions
+        }, chunk_size=len(submissions), update_modified=False)
+        return 0
+
+    plan = get_scoring_plan({a.category for a in answers})
+    questions = [plan.get(a.question) or {} for a in answers]
+
+    # Score each distinct (answer type, value) pair once and broadcast
+    kinds = [q.get("answer_type") if q else None for q in questions]
+    pairs, inverse = np.unique(
+        np.array([f"{kind}\x00{a.answer_value or ''}" for kind, a in zip(kinds, answers)], dtype=object),
+        return_inverse=True,
+    )
+
+    lookup = np.zeros(len(pairs))
+    for i, pair in enumerate(pairs):
+        kind, value = pair.split("\x00", 1)
+        scorer = get_scorer(kind) if kind != "None" else score_value
+        lookup[i] = scorer(value)
+
+    scores = lookup[inverse]
+    weights = np.array([q.get("weight", 1.0) for q in questions], dtype=float)
+    critical = (
+        np.array([bool(q.get("is_critical", 1)) for q in questions], dtype=bool)
+        & (scores <= CRITICAL_SCORE)
+    )
+
+    # Per submission and per (submission, category) sums via bincount
+    parent_index = {name: i for i, name in enumerate(submissions)}
+    parents = np.array([parent_index[a.parent] for a in answers], dtype=int)
+    categories = [q.get("category") or a.category or "" for q, a in zip(questions, answers)]
+    category_names, category_index = np.unique(np.array(categories, dtype=object), return_inverse=True)
+
+    weighted = scores * weights
+    total_scores = np.bincount(parents, weights=weighted, minlength=len(submissions))
+    max_scores = np.bincount(parents, weights=MAX_SCORE * weights, minlength=len(submissions))
+
+    groups = parents * len(category_names) + category_index
+    group_count = len(submissions) * len(category_names)
+    group_scores = np.bincount(groups, weights=weighted, minlength=group_count)
+    group_max = np.bincount(groups, weights=MAX_SCORE * weights, minlength=group_count)
+    group_critical = np.bincount(groups, weights=critical, minlength=group_count)
+    group_seen = np.bincount(groups, minlength=group_count)
+
+    category_scores = [{} for _ in submissions]
+    for group in np.flatnonzero(group_seen):
+        submission, category = divmod(int(group), len(category_names))
+        category_scores[submission][category_names[category]] = {
+            "score": float(group_scores[group]),
+            "max_score": float(group_max[group]),
+            "critical": int(group_critical[group]),
+            "percentage": round(float(group_scores[group] / group_max[group] * 100), 2) if group_max[group] else 0,
+        }
+
+    submission_updates = {
+        name: {
+            "total_score": float(total_scores[i]),
+            "max_possible_score": float(max_scores[i]),
+            "average_score": float(total_scores[i] / max_scores[i] * 100) if max_scores[i] else 0,
+            "category_scores": json.dumps(category_scores[i]),
+        }
+        for i, name in enumerate(submissions)
+    }
+
+    answer_updates = {}
+    for i, answer in enumerate(answers):
+        numeric_score = float(scores[i])
+        is_critical = int(critical[i])
+        if abs(flt(answer.numeric_score) - numeric_score) > 1e-6 or answer.is_critical != is_critical:
+            answer_updates[answer.name] = {
+                "numeric_score": numeric_score,
+                "is_critical": is_critical,
+                "requires_action": is_critical,
+            }
+
+    frappe.db.bulk_update("Audit Submission", submission_updates, chunk_size=len(submissions), update_modified=False)
+    if answer_updates:
+        frappe.db.bulk_update("Audit Answer", answer_updates, chunk_size=len(answer_updates), update_modified=False)
+
+    return len(answer_updates)
+
+
+def publish_rescore_progress(summary):
+    done, total = summary["submissions"], summary["total"] or 1
+    frappe.publish_progress(
+        min(done * 100 / total, 100),
+        title="Rescoring Audits",
+        description=f"{done} of {summary['total']} submissions rescored",
+    )
@@ -1,9 +1,42 @@
 # Copyright (c) 2025, Ontime Solutions and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
+from frappe.utils import getdate
+
+from restaurant_audit.restaurant_audit.doctype.auditor_dashboard_stats.auditor_dashboard_stats import update_progress_stats
+from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import update_rollup_for
 
 
 class AuditProgress(Document):
-	pass
+	def validate(self):
+		# Day-level lookups filter on audit_date instead of start_time ranges
+		if self.start_time:
+			self.audit_date = getdate(self.start_time)
+
+	def on_update(self):
+		update_rollup_for(self, "on_update")
+		update_progress_stats(self, "on_update")
+
+	def after_delete(self):
+		update_rollup_for(self, "after_delete")
+		update_progress_stats(self, "after_delete")
+
+
+def on_doctype_update():
+	"""Composite index for the restaurant/auditor progress lookups.
+
+	`is_completed` is an equality filter everywhere it is used, so it goes
+	before the `start_time` range to keep the whole key usable.
+	"""
+	frappe.db.add_index(
+		"Audit Progress",
+		["restaurant", "auditor", "is_completed", "start_time"],
+		"restaurant_auditor_progress_index",
+	)
+	frappe.db.add_index(
+		"Audit Progress",
+		["restaurant", "auditor", "audit_date"],
+		"restaurant_auditor_audit_date_index",
+	)
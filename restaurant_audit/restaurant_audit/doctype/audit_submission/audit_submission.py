@@ -1,9 +1,31 @@
 # Copyright (c) 2025, Ontime Solutions and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from restaurant_audit.restaurant_audit.doctype.auditor_dashboard_stats.auditor_dashboard_stats import update_submission_stats
+from restaurant_audit.restaurant_audit.doctype.restaurant_auditor_stats.restaurant_auditor_stats import update_counters_for
+from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import update_rollup_for
+
 
 class AuditSubmission(Document):
-	pass
+	def after_insert(self):
+		update_counters_for(self, "after_insert")
+		update_submission_stats(self, "after_insert")
+
+	def on_update(self):
+		update_rollup_for(self, "on_update")
+		update_counters_for(self, "on_update")
+		update_submission_stats(self, "on_update")
+
+	def after_delete(self):
+		update_rollup_for(self, "after_delete")
+		update_counters_for(self, "after_delete")
+		update_submission_stats(self, "after_delete")
+
+
+def on_doctype_update():
+	"""Composite indexes for per-restaurant and per-auditor date lookups"""
+	frappe.db.add_index("Audit Submission", ["restaurant", "audit_date"], "restaurant_audit_date_index")
+	frappe.db.add_index("Audit Submission", ["auditor", "audit_date"], "auditor_audit_date_index")
@@ -1,9 +1,63 @@
 # Copyright (c) 2025, Ontime Solutions and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from restaurant_audit.scoring import score_answers
+
+PLAN = {
+	"q1": {"category": "Kitchen", "answer_type": "Yes/No", "weight": 2.0, "is_critical": 1},
+	"q2": {"category": "Kitchen", "answer_type": "Rating", "weight": 1.0, "is_critical": 0},
+	"q3": {"category": "Service", "answer_type": "Rating", "weight": 1.0, "is_critical": 1},
+	"q4": {"category": "Service", "answer_type": "Text", "weight": 1.0, "is_critical": 1},
+}
+
+
+def make_submission(restaurant, audit_date, average_score=80, auditor="Administrator"):
+	return frappe.get_doc({
+		"doctype": "Audit Submission",
+		"restaurant": restaurant,
+		"auditor": auditor,
+		"audit_date": audit_date,
+		"audit_time": "10:00:00",
+		"submission_time": f"{audit_date} 10:00:00",
+		"average_score": average_score,
+	}).insert(ignore_permissions=True)
+
 
 class TestAuditSubmission(FrappeTestCase):
-	pass
+	def test_score_answers(self):
+		result = score_answers([
+			{"question_id": "q1", "answer_value": "Yes"},
+			{"question_id": "q2", "answer_value": "4.5"},
+			{"question_id": "q3", "answer_value": "2"},
+			{"question_id": "q4", "answer_value": "Clean"},
+		], PLAN)
+
+		self.assertEqual([a["score"] for a in result["answers"]], [5, 4.5, 2, 0])
+		# Text answers keep the fallback scorer: 0 unless the text is Yes/No or a digit
+		self.assertEqual([a["is_critical"] for a in result["answers"]], [0, 0, 1, 1])
+
+		self.assertAlmostEqual(result["total_score"], 5 * 2 + 4.5 + 2)
+		self.assertAlmostEqual(result["max_possible_score"], 5 * 5)
+		self.assertAlmostEqual(result["average_score"], 16.5 / 25 * 100)
+
+		kitchen, service = result["category_scores"]["Kitchen"], result["category_scores"]["Service"]
+		self.assertAlmostEqual(kitchen["score"], 14.5)
+		self.assertEqual(kitchen["percentage"], 96.67)
+		self.assertEqual(service["critical"], 2)
+		self.assertEqual(service["max_score"], 10)
+
+	def test_score_answers_without_plan(self):
+		result = score_answers([
+			{"question_id": "unknown", "answer_value": "No", "category": "Other"},
+			{"question_id": "unknown", "answer_value": "7"},
+			{"question_id": "q3", "answer_value": "9"},
+		], PLAN)
+
+		# Unknown questions use the unweighted fallback; all scores are capped at 5
+		self.assertEqual([a["score"] for a in result["answers"]], [1, 5, 5])
+		self.assertLessEqual(result["average_score"], 100)
+		self.assertEqual(set(result["category_scores"]), {"Other", "", "Service"})
+		self.assertEqual(score_answers([], PLAN)["average_score"], 0)
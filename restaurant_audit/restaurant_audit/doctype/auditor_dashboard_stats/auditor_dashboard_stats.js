@@ -0,0 +1,8 @@
+// Copyright (c) 2025, Ontime Solutions and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Auditor Dashboard Stats", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,252 @@
+# Copyright (c) 2025, Ontime Solutions and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, cint, flt, getdate, now
+
+STATS_DOCTYPE = "Auditor Dashboard Stats"
+
+# Rolling windows in days; each has an audit_count_<n>d and score_total_<n>d field
+WINDOWS = (30, 90)
+
+COUNTER_FIELDS = (
+	"audit_count", "score_total", "pending_progress",
+	*(f"{field}_{days}d" for days in WINDOWS for field in ("audit_count", "score_total")),
+)
+
+# Fields of an Audit Submission that change the stats
+SUBMISSION_FIELDS = ("auditor", "audit_date", "average_score")
+
+
+class AuditorDashboardStats(Document):
+	pass
+
+
+def get_window_start(days, today=None):
+	"""First audit date inside a rolling window of `days` days ending today"""
+	return add_days(getdate(today), 1 - days)
+
+
+def get_dashboard_stats(user, window=None):
+	"""Audit count, average score, last audit and pending progress of a user in one lookup.
+
+	With `window` (30 or 90) count and average cover only that many days.
+	Window counters are exact after the nightly reconcile and kept up to date
+	in between, so a submission ageing out of a window mid-day is dropped at
+	the next reconcile.
+	"""
+	window = cint(window)
+	stats = frappe.db.get_value(STATS_DOCTYPE, user,
+		["last_submission", "last_audit_date", *COUNTER_FIELDS], as_dict=True
+	) or frappe._dict()
+
+	suffix = f"_{window}d" if window in WINDOWS else ""
+	audit_count = stats.get(f"audit_count{suffix}") or 0
+	score_total = stats.get(f"score_total{suffix}") or 0
+
+	return {
+		"total_audits": audit_count,
+		"avg_score": round(score_total / audit_count, 1) if audit_count else 0,
+		"pending_progress": stats.get("pending_progress") or 0,
+		"last_submission": stats.get("last_submission"),
+		"last_audit_date": stats.get("last_audit_date"),
+		"window": window if suffix else None,
+	}
+
+
+def update_submission_stats(doc, method=None):
+	"""Keep dashboard stats in step with Audit Submission.
+
+	Called from `after_insert`, `on_update` and `after_delete`.
+	"""
+	if method == "after_insert":
+		add_submission(doc, 1)
+	elif method == "after_delete":
+		add_submission(doc, -1)
+	elif method == "on_update":
+		before = doc.get_doc_before_save()
+		if not before or all(before.get(f) == doc.get(f) for f in SUBMISSION_FIELDS):
+			return
+		add_submission(before, -1)
+		add_submission(doc, 1)
+
+
+def add_submission(doc, sign):
+	if not (doc.get("auditor") and doc.get("audit_date")):
+		return
+
+	audit_date = getdate(doc.audit_date)
+	score = flt(doc.get("average_score")) * sign
+	deltas = {"audit_count": sign, "score_total": score}
+	for days in WINDOWS:
+		if audit_date >= get_window_start(days):
+			deltas[f"audit_count_{days}d"] = sign
+			deltas[f"score_total_{days}d"] = score
+
+	if sign > 0:
+		add_to_stats(doc.auditor, deltas, last_submission=doc.name, last_audit_date=audit_date)
+		return
+
+	add_to_stats(doc.auditor, deltas)
+	# The last submission only has to be looked up again when it is the one removed
+	if frappe.db.get_value(STATS_DOCTYPE, doc.auditor, "last_submission") == doc.name:
+		last = get_last_submission(doc.auditor)
+		frappe.db.set_value(STATS_DOCTYPE, doc.auditor, {
+			"last_submission": last.name if last else None,
+			"last_audit_date": last.audit_date if last else None
+		})
+
+
+def update_progress_stats(doc, method=None):
+	"""Keep the pending progress count in step with Audit Progress.
+
+	Called from `on_update` (which also runs on insert) and `after_delete`.
+	"""
+	if method == "after_delete":
+		before, after = doc, None
+	else:
+		before, after = doc.get_doc_before_save(), doc
+
+	was_pending, is_pending = get_pending_auditor(before), get_pending_auditor(after)
+	if was_pending == is_pending:
+		return
+	if was_pending:
+		add_to_stats(was_pending, {"pending_progress": -1})
+	if is_pending:
+		add_to_stats(is_pending, {"pending_progress": 1})
+
+
+def get_pending_auditor(progress):
+	if progress and progress.get("auditor") and not progress.get("is_completed"):
+		return progress.auditor
+
+
+def add_to_stats(auditor, deltas, last_submission=None, last_audit_date=None):
+	"""Add counter deltas to an auditor's stats row, creating it when missing.
+
+	Counters never go below zero. A last submission is only taken over when
+	it is not older than the stored one.
+	"""
+	params = {
+		"name": auditor,
+		"timestamp": now(),
+		"last_submission": last_submission,
+		"last_audit_date": last_audit_date,
+	}
+	for field in COUNTER_FIELDS:
+		params[field] = deltas.get(field, 0)
+		params[f"new_{field}"] = max(deltas.get(field, 0), 0)
+
+	last_updates = ""
+	if last_submission:
+		# last_submission is assigned first so it still compares against the old date
+		last_updates = """,
+			last_submission = IF(%(last_audit_date)s >= IFNULL(last_audit_date, %(last_audit_date)s),
+				%(last_submission)s, last_submission),
+			last_audit_date = GREATEST(IFNULL(last_audit_date, %(last_audit_date)s), %(last_audit_date)s)"""
+
+	frappe.db.sql(f"""
+		INSERT INTO `tabAuditor Dashboard Stats`
+			(name, creation, modified, owner, modified_by, docstatus, auditor,
+			last_submission, last_audit_date, {", ".join(COUNTER_FIELDS)})
+		VALUES
+			(%(name)s, %(timestamp)s, %(timestamp)s, 'Administrator', 'Administrator', 0, %(name)s,
+			%(last_submission)s, %(last_audit_date)s, {", ".join(f"%(new_{field})s" for field in COUNTER_FIELDS)})
+		ON DUPLICATE KEY UPDATE
+			{", ".join(f"{field} = GREATEST(IFNULL({field}, 0) + %({field})s, 0)" for field in COUNTER_FIELDS)},
+			modified = %(timestamp)s{last_updates}
+	""", params)
+
+
+def get_last_submission(auditor):
+	return frappe.db.get_value("Audit Submission", {"auditor": auditor},
+		["name", "audit_date"], as_dict=True, order_by="audit_date desc, submission_time desc")
+
+
+def reconcile_dashboard_stats():
+	"""Recompute all dashboard stats from the source tables and fix any drift.
+
+	Also rolls the 30/90 day windows forward, so it runs daily. Returns the
+	number of stats rows corrected, created or removed.
+	"""
+	today = getdate()
+	window_columns = "".join(f""",
+		SUM(audit_date >= %(from_{days}d)s) AS audit_count_{days}d,
+		SUM(IF(audit_date >= %(from_{days}d)s, average_score, 0)) AS score_total_{days}d"""
+		for days in WINDOWS
+	)
+
+	actual = {}
+
+	def row_for(auditor):
+		return actual.setdefault(auditor, frappe._dict(
+			dict.fromkeys(COUNTER_FIELDS, 0), last_submission=None, last_audit_date=None
+		))
+
+	for row in frappe.db.sql(f"""
+		SELECT auditor, COUNT(*) AS audit_count, SUM(average_score) AS score_total{window_columns}
+		FROM `tabAudit Submission`
+		WHERE auditor IS NOT NULL AND audit_date IS NOT NULL
+		GROUP BY auditor
+	""", {f"from_{days}d": get_window_start(days, today) for days in WINDOWS}, as_dict=True):
+		row_for(row.pop("auditor")).update({field: value or 0 for field, value in row.items()})
+
+	for row in frappe.db.sql("""
+		SELECT auditor, name, audit_date FROM (
+			SELECT auditor, name, audit_date,
+				ROW_NUMBER() OVER (
+					PARTITION BY auditor ORDER BY audit_date DESC, submission_time DESC
+				) AS position
+			FROM `tabAudit Submission`
+			WHERE auditor IS NOT NULL AND audit_date IS NOT NULL
+		) latest
+		WHERE position = 1
+	""", as_dict=True):
+		row_for(row.auditor).update(last_submission=row.name, last_audit_date=row.audit_date)
+
+	for auditor, pending in frappe.db.sql("""
+		SELECT auditor, COUNT(*) FROM `tabAudit Progress`
+		WHERE is_completed = 0 AND auditor IS NOT NULL
+		GROUP BY auditor
+	"""):
+		row_for(auditor).pending_progress = pending
+
+	fields = ["last_submission", "last_audit_date", *COUNTER_FIELDS]
+	stored = {
+		row.name: row
+		for row in frappe.get_all(STATS_DOCTYPE, fields=["name", *fields])
+	}
+
+	stale = [name for name in stored if name not in actual]
+	if stale:
+		frappe.db.delete(STATS_DOCTYPE, {"name": ["in", stale]})
+
+	def differs(current, row):
+		return (
+			current.last_submission != row.last_submission
+			or current.last_audit_date != (getdate(row.last_audit_date) if row.last_audit_date else None)
+			or any(abs(flt(current[f]) - flt(row[f])) > 1e-6 for f in COUNTER_FIELDS)
+		)
+
+	timestamp = now()
+	fixed = 0
+	missing = []
+	for auditor, row in actual.items():
+		current = stored.get(auditor)
+		if not current:
+			missing.append((
+				auditor, timestamp, timestamp, "Administrator", "Administrator", 0, auditor,
+				*(row[field] for field in fields),
+			))
+		elif differs(current, row):
+			frappe.db.set_value(STATS_DOCTYPE, auditor, {field: row[field] for field in fields})
+			fixed += 1
+
+	if missing:
+		frappe.db.bulk_insert(STATS_DOCTYPE, [
+			"name", "creation", "modified", "owner", "modified_by", "docstatus", "auditor", *fields,
+		], missing)
+
+	frappe.db.commit()
+	return fixed + len(stale) + len(missing)
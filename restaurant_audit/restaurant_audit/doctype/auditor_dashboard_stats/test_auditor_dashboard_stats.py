@@ -0,0 +1,98 @@
+# Copyright (c) 2025, Ontime Solutions and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, now_datetime
+
+from restaurant_audit.restaurant_audit.doctype.audit_submission.test_audit_submission import make_submission
+from restaurant_audit.restaurant_audit.doctype.auditor_dashboard_stats.auditor_dashboard_stats import (
+	STATS_DOCTYPE,
+	get_dashboard_stats,
+	reconcile_dashboard_stats,
+)
+from restaurant_audit.restaurant_audit.doctype.restaurant.test_restaurant import (
+	delete_audit_records,
+	make_test_auditor,
+	make_test_restaurant,
+)
+
+
+class TestAuditorDashboardStats(FrappeTestCase):
+	def setUp(self):
+		self.restaurant = make_test_restaurant("_Test Dashboard Restaurant").name
+		self.auditor = make_test_auditor()
+		delete_audit_records(self.restaurant, self.auditor)
+
+		today = getdate()
+		# Inside both windows, inside the 90 day window only, and outside both
+		self.recent = make_submission(self.restaurant, add_days(today, -5), 80, auditor=self.auditor)
+		self.older = make_submission(self.restaurant, add_days(today, -60), 60, auditor=self.auditor)
+		self.oldest = make_submission(self.restaurant, add_days(today, -200), 40, auditor=self.auditor)
+
+	def tearDown(self):
+		# reconcile_dashboard_stats commits, so clean up explicitly
+		delete_audit_records(self.restaurant, self.auditor)
+		frappe.db.commit()
+
+	def get_stats(self):
+		return frappe.get_doc(STATS_DOCTYPE, self.auditor)
+
+	def test_insert(self):
+		stats = self.get_stats()
+		self.assertEqual((stats.audit_count, stats.score_total), (3, 180))
+		self.assertEqual((stats.audit_count_30d, stats.score_total_30d), (1, 80))
+		self.assertEqual((stats.audit_count_90d, stats.score_total_90d), (2, 140))
+		self.assertEqual(stats.last_submission, self.recent.name)
+		self.assertEqual(stats.last_audit_date, getdate(self.recent.audit_date))
+
+		self.assertEqual(get_dashboard_stats(self.auditor)["avg_score"], 60)
+		windowed = get_dashboard_stats(self.auditor, 30)
+		self.assertEqual((windowed["total_audits"], windowed["avg_score"], windowed["window"]), (1, 80, 30))
+
+	def test_score_edit(self):
+		self.older.average_score = 90
+		self.older.save(ignore_permissions=True)
+
+		stats = self.get_stats()
+		self.assertEqual((stats.audit_count, stats.score_total), (3, 210))
+		self.assertEqual(stats.score_total_30d, 80)
+		self.assertEqual((stats.audit_count_90d, stats.score_total_90d), (2, 170))
+
+	def test_delete_latest_submission(self):
+		frappe.delete_doc("Audit Submission", self.recent.name, ignore_permissions=True, force=True)
+
+		stats = self.get_stats()
+		self.assertEqual((stats.audit_count, stats.score_total), (2, 100))
+		self.assertEqual((stats.audit_count_30d, stats.score_total_30d), (0, 0))
+		self.assertEqual(stats.last_submission, self.older.name)
+		self.assertEqual(stats.last_audit_date, getdate(self.older.audit_date))
+
+	def test_pending_progress(self):
+		progress = frappe.get_doc({
+			"doctype": "Audit Progress",
+			"restaurant": self.restaurant,
+			"auditor": self.auditor,
+			"start_time": now_datetime(),
+			"last_updated": now_datetime(),
+		}).insert(ignore_permissions=True)
+		self.assertEqual(get_dashboard_stats(self.auditor)["pending_progress"], 1)
+
+		progress.is_completed = 1
+		progress.save(ignore_permissions=True)
+		self.assertEqual(get_dashboard_stats(self.auditor)["pending_progress"], 0)
+
+	def test_reconcile_fixes_drift(self):
+		expected = self.get_stats()
+		frappe.db.set_value(STATS_DOCTYPE, self.auditor, {
+			"audit_count": 7,
+			"score_total_90d": 1,
+			"last_submission": self.oldest.name,
+		})
+
+		self.assertGreaterEqual(reconcile_dashboard_stats(), 1)
+
+		stats = self.get_stats()
+		for field in ("audit_count", "score_total", "audit_count_30d", "score_total_30d",
+				"audit_count_90d", "score_total_90d", "last_submission", "last_audit_date"):
+			self.assertEqual(stats.get(field), expected.get(field), field)
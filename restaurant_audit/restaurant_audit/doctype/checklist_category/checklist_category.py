@@ -4,6 +4,13 @@
 # import frappe
 from frappe.model.document import Document
 
+from restaurant_audit.scoring import clear_scoring_plan
+
 
 class ChecklistCategory(Document):
-	pass
+	def on_update(self):
+		# Questions, weights or answer types may have changed
+		clear_scoring_plan(self.name)
+
+	def on_trash(self):
+		clear_scoring_plan(self.name)
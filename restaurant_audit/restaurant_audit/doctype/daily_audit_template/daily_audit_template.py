@@ -3,7 +3,21 @@
 
 import frappe
 from frappe.model.document import Document
-from datetime import datetime, time
+from frappe.utils import get_system_timezone
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+USAGE_COUNT_KEY = "restaurant_audit:template_usage_count"
+LAST_USED_KEY = "restaurant_audit:template_last_used"
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_SETS = {
+    "Daily": frozenset(range(7)),
+    "Weekdays Only": frozenset(range(5)),
+    "Weekends Only": frozenset({5, 6}),
+    **{day: frozenset({i}) for i, day in enumerate(WEEKDAYS)}
+}
 
 class DailyAuditTemplate(Document):
     def before_save(self):
@@ -11,6 +25,19 @@ class DailyAuditTemplate(Document):
         self.validate_time_settings()
         self.set_created_by()
         self.set_last_modified_by()
+        self.reload_usage_counters()
+    
+    def on_update(self):
+        self.rebuild_transition_schedule()
+    
+    def on_trash(self):
+        self.rebuild_transition_schedule()
+    
+    def rebuild_transition_schedule(self):
+        """Open/close push events are scheduled from template settings"""
+        from restaurant_audit.template_schedule import rebuild_template_schedule
+        
+        frappe.db.after_commit.add(rebuild_template_schedule)
     
     def validate_time_settings(self):
         """Validate that time settings are logical"""
@@ -28,6 +55,20 @@ class DailyAuditTemplate(Document):
             if close_time > cashier_time:
                 frappe.throw("Template must close before cashier opening time")
     
+    def reload_usage_counters(self):
+        """Take usage_count and last_used_date from the database rather than from the form.
+
+        flush_template_usage updates them without touching `modified`, so the
+        values loaded with the form may be outdated. The row is locked until
+        commit, so no flush is lost in between.
+        """
+        if self.is_new():
+            return
+        counters = frappe.db.get_value("Daily Audit Template", self.name,
+            ["usage_count", "last_used_date"], as_dict=True, for_update=True)
+        if counters:
+            self.update(counters)
+    
     def set_created_by(self):
         """Set created_by field if not already set"""
         if not self.created_by:
@@ -39,29 +80,118 @@ class DailyAuditTemplate(Document):
     
     def is_currently_open(self):
         """Check if template is currently open based on time settings"""
-        if not self.is_active:
-            return False
-        
-        now = datetime.now().time()
-        open_time = datetime.strptime(str(self.open_time), "%H:%M:%S").time()
-        close_time = datetime.strptime(str(self.close_time), "%H:%M:%S").time()
-        
-        return open_time <= now <= close_time
+        return is_template_open(self)
     
     def get_status(self):
         """Get current status of the template"""
-        if not self.is_active:
-            return "Inactive"
-        
-        if self.is_currently_open():
-            return "Open"
-        else:
-            return "Closed"
+        return get_status_for(self)
     
     def update_last_used(self):
         """Update last used date when template is used"""
-        self.last_used_date = frappe.utils.now()
-        self.save(ignore_permissions=True)
+        record_template_use(self.name)
+
+def to_time(value):
+    """Time field value as a `time`; rows hold timedelta, new documents hold "H:MM:SS" strings"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, time):
+        return value
+    if isinstance(value, timedelta):
+        return (datetime.min + value).time()
+    hours, minutes, seconds = (str(value).split(":") + ["0", "0"])[:3]
+    return time(int(hours), int(minutes), int(float(seconds)))
+
+def get_day_window(days_of_week, tz):
+    """(weekdays, tzinfo) for a template's days_of_week and timezone settings"""
+    # A blank timezone is resolved per site before the process-wide cache
+    return _get_day_window(days_of_week, tz or get_system_timezone())
+
+@lru_cache(maxsize=64)
+def _get_day_window(days_of_week, tz):
+    return (
+        DAY_SETS.get(days_of_week or "Daily", DAY_SETS["Daily"]),
+        ZoneInfo(tz)
+    )
+
+def is_template_open(template, now=None):
+    """Whether a template (document or fetched row) is open at `now`.
+
+    `now` is an aware datetime, by default the current time; it is converted
+    to the template's timezone before the weekday and time window are checked.
+    """
+    if not template.get("is_active"):
+        return False
+
+    open_time, close_time = to_time(template.get("open_time")), to_time(template.get("close_time"))
+    if not open_time or not close_time:
+        return False
+
+    days, tz = get_day_window(template.get("days_of_week"), template.get("timezone"))
+
+    local_now = (now or datetime.now(timezone.utc)).astimezone(tz)
+    return local_now.weekday() in days and open_time <= local_now.time() <= close_time
+
+def get_status_for(template, now=None):
+    if not template.get("is_active"):
+        return "Inactive"
+    return "Open" if is_template_open(template, now) else "Closed"
+
+def record_template_use(template):
+    """Count a use of the template in Redis; flush_template_usage writes it to the table"""
+    cache = frappe.cache()
+    pipeline = cache.pipeline()
+    pipeline.hincrby(cache.make_key(USAGE_COUNT_KEY), template, 1)
+    pipeline.hset(cache.make_key(LAST_USED_KEY), template, frappe.utils.now())
+    pipeline.execute()
+
+def flush_template_usage():
+    """Add buffered usage counts and last-used times to the templates in one UPDATE.
+
+    The buffers are read and cleared atomically; if the update fails the
+    counts are put back for the next run. Returns the number of templates updated.
+    """
+    cache = frappe.cache()
+    counts_key, last_used_key = cache.make_key(USAGE_COUNT_KEY), cache.make_key(LAST_USED_KEY)
+
+    pipeline = cache.pipeline()
+    pipeline.hgetall(counts_key)
+    pipeline.hgetall(last_used_key)
+    pipeline.delete(counts_key, last_used_key)
+    counts, last_used, _ = pipeline.execute()
+    if not counts:
+        return 0
+
+    counts = {frappe.safe_decode(name): int(count) for name, count in counts.items()}
+    last_used = {frappe.safe_decode(name): frappe.safe_decode(value) for name, value in last_used.items()}
+    names = list(counts)
+
+    count_cases = " ".join(["WHEN %s THEN %s"] * len(names))
+    last_used_cases = " ".join(["WHEN %s THEN %s"] * len(names))
+    params = [value for name in names for value in (name, counts[name])]
+    params += [value for name in names for value in (name, last_used.get(name))]
+
+    try:
+        frappe.db.sql(f"""
+            UPDATE `tabDaily Audit Template`
+            SET usage_count = IFNULL(usage_count, 0) + CASE name {count_cases} ELSE 0 END,
+                last_used_date = GREATEST(
+                    IFNULL(last_used_date, '1970-01-01'),
+                    IFNULL(CASE name {last_used_cases} END, '1970-01-01')
+                )
+            WHERE name IN ({", ".join(["%s"] * len(names))})
+        """, params + names)
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        pipeline = cache.pipeline()
+        for name in names:
+            pipeline.hincrby(counts_key, name, counts[name])
+            if last_used.get(name):
+                pipeline.hsetnx(last_used_key, name, last_used[name])
+        pipeline.execute()
+        raise
+
+    return len(names)
 
 @frappe.whitelist()
 def get_active_templates(restaurant=None):
@@ -83,15 +213,16 @@ def get_active_templates(restaurant=None):
         fields=[
             "name", "template_name", "description", "restaurant", "restaurant_name",
             "open_time", "close_time", "cashier_opening_time", "questions_count",
-            "estimated_duration", "priority", "applies_to_all_restaurants"
+            "estimated_duration", "priority", "applies_to_all_restaurants",
+            "is_active", "days_of_week", "timezone"
         ]
     )
     
-    # Add current status for each template
+    # Add current status for each template from the fetched fields
+    now = datetime.now(timezone.utc)
     for template in templates:
-        template_doc = frappe.get_doc("Daily Audit Template", template.name)
-        template["current_status"] = template_doc.get_status()
-        template["is_currently_open"] = template_doc.is_currently_open()
+        template["current_status"] = get_status_for(template, now)
+        template["is_currently_open"] = template["current_status"] == "Open"
     
     return templates
 
@@ -4,5 +4,38 @@
 import frappe
 import unittest
 
+from restaurant_audit.restaurant_audit.doctype.daily_audit_template.daily_audit_template import (
+    flush_template_usage,
+    record_template_use,
+)
+
 class TestDailyAuditTemplate(unittest.TestCase):
-    pass
\ No newline at end of file
+    def setUp(self):
+        self.template = frappe.get_doc({
+            "doctype": "Daily Audit Template",
+            "template_name": "_Test Usage Template",
+            "open_time": "06:00:00",
+            "close_time": "08:30:00",
+            "cashier_opening_time": "09:00:00"
+        }).insert(ignore_permissions=True)
+
+    def tearDown(self):
+        frappe.delete_doc("Daily Audit Template", self.template.name, force=True, ignore_permissions=True)
+        frappe.db.commit()
+
+    def test_form_save_keeps_flushed_usage(self):
+        # Loaded before the flush, as an open form would be
+        form = frappe.get_doc("Daily Audit Template", self.template.name)
+
+        record_template_use(self.template.name)
+        record_template_use(self.template.name)
+        flush_template_usage()
+
+        form.description = "Edited after usage was flushed"
+        form.save(ignore_permissions=True)
+
+        usage_count, last_used_date = frappe.db.get_value("Daily Audit Template", self.template.name,
+            ["usage_count", "last_used_date"])
+        self.assertEqual(usage_count, 2)
+        self.assertIsNotNone(last_used_date)
+        self.assertEqual(form.usage_count, 2)
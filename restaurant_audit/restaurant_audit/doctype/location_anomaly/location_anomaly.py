@@ -0,0 +1,20 @@
+# Copyright (c) 2025, Ontime Solutions and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now_datetime
+
+
+class LocationAnomaly(Document):
+	def validate(self):
+		if self.status == "Open":
+			return
+		if not self.reviewed_by:
+			self.reviewed_by = frappe.session.user
+		if not self.reviewed_on or self.has_value_changed("status"):
+			self.reviewed_on = now_datetime()
+
+
+def on_doctype_update():
+	frappe.db.add_index("Location Anomaly", ["user", "anomaly_type", "status"], "user_anomaly_status_index")
@@ -0,0 +1,63 @@
+# Copyright (c) 2025, Ontime Solutions and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, get_datetime, now_datetime
+
+from restaurant_audit.location_anomalies import save_anomalies
+
+USER = "Administrator"
+
+
+def make_finding(first_seen, last_seen):
+	return {
+		"user": USER,
+		"anomaly_type": "Duplicate Fix",
+		"first_seen": first_seen,
+		"last_seen": last_seen,
+		"occurrences": 3,
+		"details": {"min_days": 3},
+	}
+
+
+class TestLocationAnomaly(FrappeTestCase):
+	def setUp(self):
+		frappe.db.delete("Location Anomaly", {"user": USER})
+
+	def get_open(self):
+		return frappe.get_all("Location Anomaly",
+			filters={"user": USER, "anomaly_type": "Duplicate Fix", "status": "Open"}, pluck="name")
+
+	def test_dismissed_anomaly_stays_dismissed(self):
+		from_date = add_to_date(now_datetime(), days=-7)
+		first_seen, last_seen = add_to_date(now_datetime(), days=-3), add_to_date(now_datetime(), days=-1)
+
+		self.assertEqual(save_anomalies([make_finding(first_seen, last_seen)], from_date), 1)
+		(name,) = self.get_open()
+
+		anomaly = frappe.get_doc("Location Anomaly", name)
+		anomaly.status = "Dismissed"
+		anomaly.save()
+		self.assertTrue(anomaly.reviewed_on)
+
+		# The next nightly scan sees the same pattern in its rolling window
+		self.assertEqual(save_anomalies([make_finding(first_seen, now_datetime())], from_date), 0)
+		self.assertEqual(self.get_open(), [])
+		self.assertEqual(frappe.db.get_value("Location Anomaly", name, "status"), "Dismissed")
+
+	def test_evidence_after_review_reopens(self):
+		from_date = add_to_date(now_datetime(), days=-7)
+		save_anomalies([make_finding(add_to_date(now_datetime(), days=-3), now_datetime())], from_date)
+		(name,) = self.get_open()
+
+		anomaly = frappe.get_doc("Location Anomaly", name)
+		anomaly.status = "Dismissed"
+		anomaly.save()
+
+		after_review = add_to_date(get_datetime(anomaly.reviewed_on), seconds=1)
+		self.assertEqual(
+			save_anomalies([make_finding(after_review, add_to_date(after_review, hours=1))], from_date), 1
+		)
+		self.assertEqual(len(self.get_open()), 1)
+		self.assertNotIn(name, self.get_open())
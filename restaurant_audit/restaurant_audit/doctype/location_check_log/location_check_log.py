@@ -1,9 +1,104 @@
 # Copyright (c) 2025, Ontime Solutions and contributors
 # For license information, please see license.txt
 
-# import frappe
+import json
+
+import frappe
 from frappe.model.document import Document
 
+BUFFER_KEY = "restaurant_audit:location_check_buffer"
+DEAD_LETTER_KEY = "restaurant_audit:location_check_dead_letter"
+FLUSH_BATCH_SIZE = 1000
+
+LOG_FIELDS = [
+	"restaurant", "user", "check_time", "user_latitude", "user_longitude", "calculated_distance",
+	"is_within_range", "restaurant_latitude", "restaurant_longitude", "allowed_radius",
+]
+LOG_COLUMNS = ["name", "creation", "modified", "owner", "modified_by", "docstatus", *LOG_FIELDS]
+
 
 class LocationCheckLog(Document):
 	pass
+
+
+def on_doctype_update():
+	"""Retention archives whole days by check_time; the anomaly scan reads per user in time order"""
+	frappe.db.add_index("Location Check Log", ["check_time"], "check_time_index")
+	frappe.db.add_index("Location Check Log", ["user", "check_time"], "user_check_time_index")
+
+
+def buffer_location_check(entry):
+	"""Queue a location check for the next bulk flush instead of inserting it now"""
+	frappe.cache().rpush(BUFFER_KEY, json.dumps(entry, default=str))
+
+
+def flush_location_checks(batch_size=FLUSH_BATCH_SIZE):
+	"""Move buffered location checks into Location Check Log in bulk.
+
+	Entries are read from the head of the Redis list and trimmed only after
+	their batch is committed, so checks buffered meanwhile are kept for the
+	next run. If the bulk insert fails, the batch is retried row by row and
+	entries that still fail are moved to DEAD_LETTER_KEY, so one bad entry
+	never blocks the buffer. Returns the number of rows written.
+	"""
+	cache = frappe.cache()
+	written = 0
+
+	while True:
+		entries = cache.lrange(BUFFER_KEY, 0, batch_size - 1)
+		if not entries:
+			break
+
+		rows, dead = [], []
+		for raw in entries:
+			try:
+				rows.append((raw, get_log_row(json.loads(raw))))
+			except (ValueError, KeyError, TypeError):
+				dead.append(raw)
+
+		written += insert_log_rows(rows, dead)
+
+		if dead:
+			cache.rpush(DEAD_LETTER_KEY, *dead)
+			frappe.log_error(
+				f"{len(dead)} buffered location checks could not be written and were moved to {DEAD_LETTER_KEY}",
+				"Location Check Log Flush"
+			)
+		cache.ltrim(BUFFER_KEY, len(entries), -1)
+
+		if len(entries) < batch_size:
+			break
+
+	return written
+
+
+def get_log_row(entry):
+	return (
+		frappe.generate_hash(length=10), entry["check_time"], entry["check_time"],
+		entry["user"], entry["user"], 0,
+		*(entry.get(field) for field in LOG_FIELDS),
+	)
+
+
+def insert_log_rows(rows, dead):
+	"""Insert (raw entry, row) pairs in one statement, else one by one; failed entries go to `dead`"""
+	if not rows:
+		return 0
+
+	try:
+		frappe.db.bulk_insert("Location Check Log", LOG_COLUMNS, [row for _, row in rows])
+		frappe.db.commit()
+		return len(rows)
+	except Exception:
+		frappe.db.rollback()
+
+	written = 0
+	for raw, row in rows:
+		try:
+			frappe.db.bulk_insert("Location Check Log", LOG_COLUMNS, [row])
+			frappe.db.commit()
+			written += 1
+		except Exception:
+			frappe.db.rollback()
+			dead.append(raw)
+	return written
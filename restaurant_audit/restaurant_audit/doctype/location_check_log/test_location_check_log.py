@@ -1,9 +1,58 @@
 # Copyright (c) 2025, Ontime Solutions and Contributors
 # See license.txt
 
-# import frappe
+import json
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now
+
+from restaurant_audit.restaurant_audit.doctype.location_check_log.location_check_log import (
+	BUFFER_KEY,
+	DEAD_LETTER_KEY,
+	buffer_location_check,
+	flush_location_checks,
+)
+
+RESTAURANT = "_Test Flush Restaurant"
+
+
+def make_entry(**values):
+	return {
+		"restaurant": RESTAURANT,
+		"user": "Administrator",
+		"check_time": now(),
+		"user_latitude": 24.7136,
+		"user_longitude": 46.6753,
+		"calculated_distance": 12.5,
+		"is_within_range": 1,
+		**values,
+	}
 
 
 class TestLocationCheckLog(FrappeTestCase):
-	pass
+	def setUp(self):
+		frappe.cache().delete_value([BUFFER_KEY, DEAD_LETTER_KEY])
+
+	def tearDown(self):
+		frappe.db.delete("Location Check Log", {"restaurant": RESTAURANT})
+		frappe.db.commit()
+		frappe.cache().delete_value([BUFFER_KEY, DEAD_LETTER_KEY])
+
+	def test_bad_entries_do_not_block_the_buffer(self):
+		buffer_location_check(make_entry())
+		buffer_location_check(make_entry(user_latitude="not a number"))
+		frappe.cache().rpush(BUFFER_KEY, "{not json")
+		buffer_location_check(make_entry())
+
+		self.assertEqual(flush_location_checks(), 2)
+		self.assertEqual(frappe.db.count("Location Check Log", {"restaurant": RESTAURANT}), 2)
+		self.assertEqual(frappe.cache().llen(BUFFER_KEY), 0)
+
+		dead = [frappe.safe_decode(raw) for raw in frappe.cache().lrange(DEAD_LETTER_KEY, 0, -1)]
+		self.assertEqual(len(dead), 2)
+		self.assertIn("{not json", dead)
+		self.assertEqual(json.loads(next(raw for raw in dead if raw != "{not json"))["user_latitude"], "not a number")
+
+		# The next flush starts from an empty buffer
+		self.assertEqual(flush_location_checks(), 0)
@@ -0,0 +1,14 @@
+# Copyright (c) 2025, Ontime Solutions and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class LocationCheckSummary(Document):
+	pass
+
+
+def on_doctype_update():
+	"""One summary row per (restaurant, day)"""
+	frappe.db.add_unique("Location Check Summary", ["restaurant", "check_date"], "restaurant_check_date")
@@ -0,0 +1,88 @@
+# Copyright (c) 2025, Ontime Solutions and Contributors
+# See license.txt
+
+import os
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from restaurant_audit.location_archive import archive_day, get_archive_files, read_archive_day
+
+RESTAURANT = "_Test Archive Restaurant"
+DAY = getdate("2020-01-15")
+
+# (user, calculated_distance, is_within_range)
+CHECKS = [
+	("Administrator", 10, 1),
+	("Administrator", 30, 1),
+	("Guest", 50, 1),
+	("Guest", 200, 0),
+]
+
+
+def insert_logs():
+	for i, (user, distance, within_range) in enumerate(CHECKS):
+		frappe.get_doc({
+			"doctype": "Location Check Log",
+			"name": f"_test-archive-{i}",
+			"restaurant": RESTAURANT,
+			"user": user,
+			"check_time": f"{DAY} {8 + i:02d}:00:00",
+			"user_latitude": 24.7136,
+			"user_longitude": 46.6753,
+			"calculated_distance": distance,
+			"is_within_range": within_range,
+		}).db_insert()
+
+
+class TestLocationCheckSummary(FrappeTestCase):
+	def setUp(self):
+		self.cleanup()
+
+	def tearDown(self):
+		self.cleanup()
+
+	def cleanup(self):
+		# archive_day commits, so clean up explicitly
+		for path in get_archive_files(DAY):
+			os.remove(path)
+		frappe.db.delete("Location Check Log", {"restaurant": RESTAURANT})
+		frappe.db.delete("Location Check Summary", {"restaurant": RESTAURANT})
+		frappe.db.commit()
+
+	def get_summary(self):
+		return frappe.db.get_value("Location Check Summary", {"restaurant": RESTAURANT, "check_date": DAY}, [
+			"checks", "in_range_checks", "in_range_rate", "min_distance", "median_distance", "distinct_users"
+		], as_dict=True)
+
+	def assertSummary(self):
+		summary = self.get_summary()
+		self.assertEqual((summary.checks, summary.in_range_checks, summary.distinct_users), (4, 3, 2))
+		self.assertEqual(summary.in_range_rate, 75)
+		self.assertEqual((summary.min_distance, summary.median_distance), (10, 40))
+
+	def test_archive_day(self):
+		insert_logs()
+
+		self.assertEqual(archive_day(DAY), len(CHECKS))
+		self.assertEqual(len(get_archive_files(DAY)), 1)
+		self.assertFalse(frappe.db.exists("Location Check Log", {"restaurant": RESTAURANT}))
+
+		rows = sorted(read_archive_day(DAY), key=lambda row: row.name)
+		self.assertEqual([row.name for row in rows], [f"_test-archive-{i}" for i in range(len(CHECKS))])
+		self.assertEqual([row.calculated_distance for row in rows], [distance for _, distance, _ in CHECKS])
+		self.assertSummary()
+
+	def test_rerun_does_not_double_count(self):
+		insert_logs()
+		archive_day(DAY)
+
+		# An interrupted run leaves the rows behind after their part was written
+		insert_logs()
+		self.assertEqual(archive_day(DAY), len(CHECKS))
+
+		self.assertEqual(len(get_archive_files(DAY)), 2)
+		self.assertEqual(len(list(read_archive_day(DAY))), len(CHECKS))
+		self.assertEqual(frappe.db.count("Location Check Summary", {"restaurant": RESTAURANT}), 1)
+		self.assertSummary()
@@ -4,16 +4,72 @@
 import frappe
 from frappe.model.document import Document
 
+from restaurant_audit.geo import clear_restaurant_coordinates
+from restaurant_audit.week_calendar import (
+	clear_week_start_rules,
+	enqueue_visit_week_recompute,
+	get_week_start_day,
+)
+
 
 class Restaurant(Document):
 	def validate(self):
 		"""Validate restaurant data"""
-		pass
+		self.reload_audit_counters()
+		self.record_week_start_days()
+	
+	def reload_audit_counters(self):
+		"""Take the audit counters from the database rather than from the form.
+
+		They are kept up to date by Audit Submission hooks without touching
+		`modified`, so the values loaded with the form may be outdated. The
+		row is locked until commit, so no submission is counted in between.
+		"""
+		if self.is_new():
+			return
+		counters = frappe.db.get_value("Restaurant", self.name,
+			["total_audits", "last_audit_date"], as_dict=True, for_update=True)
+		if counters:
+			self.update(counters)
 	
 	def on_update(self):
 		"""Called when restaurant is updated"""
 		# Check if any employees were removed
 		self.check_for_removed_employees()
+		clear_restaurant_coordinates()
+		clear_week_start_rules()
+		self.check_for_week_start_changes()
+	
+	def on_trash(self):
+		clear_restaurant_coordinates()
+		self.record_week_start_days()
+	
+	def after_delete(self):
+		clear_week_start_rules()
+		self.check_for_week_start_changes()
+	
+	def record_week_start_days(self):
+		"""Remember the effective week start day of every employee this save can affect"""
+		before = self.get_doc_before_save() if not self.is_new() else None
+		employees = {row.employee for row in self.assigned_employees if row.employee}
+		if before:
+			employees |= {row.employee for row in before.assigned_employees if row.employee}
+
+		# The cached rules are cleared on every save, so they still match the stored rows
+		self._week_start_days = {employee: get_week_start_day(employee=employee) for employee in employees}
+	
+	def check_for_week_start_changes(self):
+		"""Recompute visit weeks of employees whose effective week start day changed.
+
+		Must run after the rule cache is cleared, so the new rows are read.
+		"""
+		previous = getattr(self, "_week_start_days", None) or {}
+		changed = {
+			employee for employee, day in previous.items()
+			if get_week_start_day(employee=employee) != day
+		}
+		if changed:
+			enqueue_visit_week_recompute(changed)
 	
 	def check_for_removed_employees(self):
 		"""Check if any employees were removed and clean up their data"""
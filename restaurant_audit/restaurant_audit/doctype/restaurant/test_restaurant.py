@@ -1,9 +1,38 @@
 # Copyright (c) 2025, Ontime Solutions and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
 
+def make_test_restaurant(restaurant_name="_Test Audit Restaurant"):
+	if frappe.db.exists("Restaurant", restaurant_name):
+		return frappe.get_doc("Restaurant", restaurant_name)
+	return frappe.get_doc({"doctype": "Restaurant", "restaurant_name": restaurant_name}).insert(ignore_permissions=True)
+
+
+def make_test_auditor(email="_test_auditor@example.com"):
+	if not frappe.db.exists("User", email):
+		frappe.get_doc({
+			"doctype": "User",
+			"email": email,
+			"first_name": "Test Auditor",
+			"send_welcome_email": 0,
+		}).insert(ignore_permissions=True)
+	return email
+
+
+def delete_audit_records(restaurant, auditor=None):
+	"""Remove a test restaurant's audit rows and the counters derived from them, without hooks"""
+	for doctype in (
+		"Scheduled Audit Visit", "Audit Progress", "Audit Submission",
+		"Weekly Audit Rollup", "Restaurant Auditor Stats",
+	):
+		frappe.db.delete(doctype, {"restaurant": restaurant})
+	frappe.db.set_value("Restaurant", restaurant, {"total_audits": 0, "last_audit_date": None}, update_modified=False)
+	if auditor:
+		frappe.db.delete("Auditor Dashboard Stats", {"name": auditor})
+
+
 class TestRestaurant(FrappeTestCase):
 	pass
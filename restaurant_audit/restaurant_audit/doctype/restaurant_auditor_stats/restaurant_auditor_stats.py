@@ -0,0 +1,191 @@
+# Copyright (c) 2025, Ontime Solutions and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import getdate, now
+
+STATS_DOCTYPE = "Restaurant Auditor Stats"
+
+# Fields of an Audit Submission that move it between counters
+TRACKED_FIELDS = ("restaurant", "auditor", "audit_date")
+
+
+class RestaurantAuditorStats(Document):
+	pass
+
+
+def on_doctype_update():
+	"""One stats row per (restaurant, auditor)"""
+	frappe.db.add_unique("Restaurant Auditor Stats", ["restaurant", "auditor"], "restaurant_auditor")
+
+
+def update_counters_for(doc, method=None):
+	"""Keep Restaurant and per-auditor audit counters in step with Audit Submission.
+
+	Called from `after_insert`, `on_update` and `after_delete`. The counters
+	are adjusted in place with single UPDATE statements, so concurrent
+	submissions for the same restaurant do not lose increments.
+	"""
+	if method == "after_insert":
+		record_submission(doc)
+	elif method == "after_delete":
+		remove_submission(doc)
+	elif method == "on_update":
+		before = doc.get_doc_before_save()
+		if not before or all(before.get(f) == doc.get(f) for f in TRACKED_FIELDS):
+			return
+		remove_submission(before)
+		record_submission(doc)
+
+
+def record_submission(doc):
+	if not (doc.get("restaurant") and doc.get("audit_date")):
+		return
+
+	audit_date = getdate(doc.audit_date)
+
+	frappe.db.sql("""
+		UPDATE `tabRestaurant`
+		SET total_audits = IFNULL(total_audits, 0) + 1,
+			last_audit_date = GREATEST(IFNULL(last_audit_date, %(audit_date)s), %(audit_date)s)
+		WHERE name = %(restaurant)s
+	""", {"restaurant": doc.restaurant, "audit_date": audit_date})
+	frappe.clear_document_cache("Restaurant", doc.restaurant)
+
+	if not doc.get("auditor"):
+		return
+
+	timestamp = now()
+	frappe.db.sql("""
+		INSERT INTO `tabRestaurant Auditor Stats`
+			(name, creation, modified, owner, modified_by, docstatus,
+			restaurant, auditor, audit_count, last_audit_date)
+		VALUES
+			(%(name)s, %(timestamp)s, %(timestamp)s, 'Administrator', 'Administrator', 0,
+			%(restaurant)s, %(auditor)s, 1, %(audit_date)s)
+		ON DUPLICATE KEY UPDATE
+			audit_count = audit_count + 1,
+			last_audit_date = GREATEST(IFNULL(last_audit_date, VALUES(last_audit_date)), VALUES(last_audit_date)),
+			modified = VALUES(modified)
+	""", {
+		"name": frappe.generate_hash(length=10),
+		"timestamp": timestamp,
+		"restaurant": doc.restaurant,
+		"auditor": doc.auditor,
+		"audit_date": audit_date
+	})
+
+
+def remove_submission(doc):
+	if not (doc.get("restaurant") and doc.get("audit_date")):
+		return
+
+	audit_date = getdate(doc.audit_date)
+
+	# The last audit date only has to be looked up again when the removed
+	# submission was the one defining it
+	frappe.db.sql("""
+		UPDATE `tabRestaurant`
+		SET total_audits = GREATEST(IFNULL(total_audits, 0) - 1, 0)
+		WHERE name = %s
+	""", doc.restaurant)
+	if frappe.db.get_value("Restaurant", doc.restaurant, "last_audit_date") == audit_date:
+		frappe.db.set_value("Restaurant", doc.restaurant, "last_audit_date",
+			get_last_audit_date({"restaurant": doc.restaurant}), update_modified=False)
+	frappe.clear_document_cache("Restaurant", doc.restaurant)
+
+	if not doc.get("auditor"):
+		return
+
+	stats = frappe.db.get_value(STATS_DOCTYPE, {
+		"restaurant": doc.restaurant,
+		"auditor": doc.auditor
+	}, ["name", "audit_count", "last_audit_date"], as_dict=True)
+	if not stats:
+		return
+
+	if (stats.audit_count or 0) <= 1:
+		frappe.db.delete(STATS_DOCTYPE, {"name": stats.name})
+		return
+
+	frappe.db.sql("""
+		UPDATE `tabRestaurant Auditor Stats`
+		SET audit_count = GREATEST(audit_count - 1, 0)
+		WHERE name = %s
+	""", stats.name)
+	if stats.last_audit_date == audit_date:
+		frappe.db.set_value(STATS_DOCTYPE, stats.name, "last_audit_date",
+			get_last_audit_date({"restaurant": doc.restaurant, "auditor": doc.auditor}))
+
+
+def get_last_audit_date(filters):
+	return frappe.db.get_value("Audit Submission", filters, "audit_date", order_by="audit_date desc")
+
+
+def reconcile_audit_counters():
+	"""Recompute all counters from Audit Submission and fix any drift.
+
+	Returns the number of Restaurant and stats rows that had to be corrected.
+	"""
+	drifted = frappe.db.sql("""
+		SELECT r.name, IFNULL(s.audit_count, 0) AS audit_count, s.last_audit_date
+		FROM `tabRestaurant` r
+		LEFT JOIN (
+			SELECT restaurant, COUNT(*) AS audit_count, MAX(audit_date) AS last_audit_date
+			FROM `tabAudit Submission`
+			GROUP BY restaurant
+		) s ON s.restaurant = r.name
+		WHERE IFNULL(r.total_audits, 0) != IFNULL(s.audit_count, 0)
+			OR NOT (r.last_audit_date <=> s.last_audit_date)
+	""", as_dict=True)
+	for row in drifted:
+		frappe.db.set_value("Restaurant", row.name, {
+			"total_audits": row.audit_count,
+			"last_audit_date": row.last_audit_date
+		}, update_modified=False)
+	fixed = len(drifted)
+
+	actual = {
+		(row.restaurant, row.auditor): row
+		for row in frappe.db.sql("""
+			SELECT restaurant, auditor, COUNT(*) AS audit_count, MAX(audit_date) AS last_audit_date
+			FROM `tabAudit Submission`
+			WHERE restaurant IS NOT NULL AND auditor IS NOT NULL
+			GROUP BY restaurant, auditor
+		""", as_dict=True)
+	}
+	stored = {
+		(row.restaurant, row.auditor): row
+		for row in frappe.get_all(STATS_DOCTYPE,
+			fields=["name", "restaurant", "auditor", "audit_count", "last_audit_date"])
+	}
+
+	stale = [row.name for key, row in stored.items() if key not in actual]
+	if stale:
+		frappe.db.delete(STATS_DOCTYPE, {"name": ["in", stale]})
+
+	timestamp = now()
+	missing = []
+	for key, row in actual.items():
+		current = stored.get(key)
+		if not current:
+			missing.append((
+				frappe.generate_hash(length=10), timestamp, timestamp, "Administrator", "Administrator", 0,
+				row.restaurant, row.auditor, row.audit_count, row.last_audit_date,
+			))
+		elif current.audit_count != row.audit_count or current.last_audit_date != row.last_audit_date:
+			frappe.db.set_value(STATS_DOCTYPE, current.name, {
+				"audit_count": row.audit_count,
+				"last_audit_date": row.last_audit_date
+			})
+			fixed += 1
+
+	if missing:
+		frappe.db.bulk_insert(STATS_DOCTYPE, [
+			"name", "creation", "modified", "owner", "modified_by", "docstatus",
+			"restaurant", "auditor", "audit_count", "last_audit_date",
+		], missing)
+
+	frappe.db.commit()
+	return fixed + len(stale) + len(missing)
@@ -0,0 +1,84 @@
+# Copyright (c) 2025, Ontime Solutions and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from restaurant_audit.restaurant_audit.doctype.audit_submission.test_audit_submission import make_submission
+from restaurant_audit.restaurant_audit.doctype.restaurant.test_restaurant import (
+	delete_audit_records,
+	make_test_auditor,
+	make_test_restaurant,
+)
+from restaurant_audit.restaurant_audit.doctype.restaurant_auditor_stats.restaurant_auditor_stats import (
+	STATS_DOCTYPE,
+	reconcile_audit_counters,
+)
+
+
+class TestRestaurantAuditorStats(FrappeTestCase):
+	def setUp(self):
+		self.restaurant = make_test_restaurant("_Test Counter Restaurant").name
+		self.auditor = make_test_auditor()
+		delete_audit_records(self.restaurant, self.auditor)
+
+	def tearDown(self):
+		# reconcile_audit_counters commits, so clean up explicitly
+		delete_audit_records(self.restaurant, self.auditor)
+		frappe.db.commit()
+
+	def assertCountersMatchSubmissions(self):
+		submissions = frappe.db.sql("""
+			SELECT COUNT(*), MAX(audit_date) FROM `tabAudit Submission` WHERE restaurant = %s
+		""", self.restaurant)[0]
+		auditor_submissions = frappe.db.sql("""
+			SELECT COUNT(*), MAX(audit_date) FROM `tabAudit Submission` WHERE restaurant = %s AND auditor = %s
+		""", (self.restaurant, self.auditor))[0]
+
+		restaurant = frappe.db.get_value("Restaurant", self.restaurant, ["total_audits", "last_audit_date"])
+		self.assertEqual((restaurant[0] or 0, restaurant[1]), submissions)
+
+		stats = frappe.db.get_value(STATS_DOCTYPE, {"restaurant": self.restaurant, "auditor": self.auditor},
+			["audit_count", "last_audit_date"])
+		self.assertEqual(stats or (0, None), auditor_submissions)
+
+	def test_insert_and_delete(self):
+		make_submission(self.restaurant, "2025-03-03", auditor=self.auditor)
+		latest = make_submission(self.restaurant, "2025-03-10", auditor=self.auditor)
+		make_submission(self.restaurant, "2025-03-05")
+		self.assertCountersMatchSubmissions()
+		self.assertEqual(frappe.db.get_value("Restaurant", self.restaurant, "total_audits"), 3)
+
+		# Removing the latest submission looks the last audit date up again
+		frappe.delete_doc("Audit Submission", latest.name, ignore_permissions=True, force=True)
+		self.assertCountersMatchSubmissions()
+		self.assertEqual(frappe.db.get_value("Restaurant", self.restaurant, "last_audit_date"), getdate("2025-03-05"))
+
+		remaining = frappe.get_all("Audit Submission", filters={"restaurant": self.restaurant}, pluck="name")
+		for name in remaining:
+			frappe.delete_doc("Audit Submission", name, ignore_permissions=True, force=True)
+
+		# Deleting an auditor's last submission removes their stats row
+		self.assertCountersMatchSubmissions()
+		self.assertEqual(frappe.db.get_value("Restaurant", self.restaurant, "total_audits"), 0)
+		self.assertFalse(frappe.db.exists(STATS_DOCTYPE, {"restaurant": self.restaurant}))
+
+	def test_reconcile_fixes_drift(self):
+		make_submission(self.restaurant, "2025-03-03", auditor=self.auditor)
+		make_submission(self.restaurant, "2025-03-04", auditor=self.auditor)
+
+		frappe.db.set_value("Restaurant", self.restaurant, {"total_audits": 7, "last_audit_date": None})
+		frappe.db.set_value(STATS_DOCTYPE, {"restaurant": self.restaurant, "auditor": self.auditor},
+			"audit_count", 9)
+		# A stats row without submissions behind it
+		frappe.get_doc({
+			"doctype": STATS_DOCTYPE,
+			"restaurant": self.restaurant,
+			"auditor": "Administrator",
+			"audit_count": 4,
+		}).db_insert()
+
+		self.assertGreaterEqual(reconcile_audit_counters(), 3)
+		self.assertCountersMatchSubmissions()
+		self.assertFalse(frappe.db.exists(STATS_DOCTYPE, {"restaurant": self.restaurant, "auditor": "Administrator"}))
@@ -1,9 +1,14 @@
 # Copyright (c) 2025, Ontime Solutions and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class RestaurantEmployee(Document):
 	pass
+
+
+def on_doctype_update():
+	"""Composite index for the employee -> active assignment lookups"""
+	frappe.db.add_index("Restaurant Employee", ["employee", "is_active"], "employee_is_active_index")
@@ -5,19 +5,23 @@ import frappe
 from frappe.model.document import Document
 from datetime import datetime, timedelta
 
+from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import update_rollup_for
+from restaurant_audit.week_calendar import get_week, get_week_start_day
+
 class ScheduledAuditVisit(Document):
     def before_save(self):
         """Calculate week start and end dates based on visit_date"""
         if self.visit_date:
-            visit_date = frappe.utils.getdate(self.visit_date)
-            
-            # Calculate week start (Monday) and end (Sunday)
-            days_since_monday = visit_date.weekday()
-            week_start = visit_date - timedelta(days=days_since_monday)
-            week_end = week_start + timedelta(days=6)
-            
-            self.week_start_date = week_start
-            self.week_end_date = week_end
+            # Week under the auditor's week start day (Monday without one)
+            self.week_start_date, self.week_end_date = get_week(
+                self.visit_date, get_week_start_day(user=self.auditor)
+            )
+    
+    def on_update(self):
+        update_rollup_for(self, "on_update")
+    
+    def after_delete(self):
+        update_rollup_for(self, "after_delete")
     
     def autoname(self):
         """Generate unique name based on restaurant and visit date"""
@@ -26,4 +30,16 @@ class ScheduledAuditVisit(Document):
             visit_date_str = frappe.utils.formatdate(self.visit_date, "yyyy-mm-dd")
             self.name = f"SAV-{restaurant_name}-{visit_date_str}"
         else:
-            self.name = frappe.generate_hash(length=10)
\ No newline at end of file
+            self.name = frappe.generate_hash(length=10)
+
+
+def on_doctype_update():
+    """Composite indexes for the auditor calendar and restaurant week lookups"""
+    frappe.db.add_index("Scheduled Audit Visit",
+        ["auditor", "visit_date", "status"],
+        "auditor_visit_date_status_index"
+    )
+    frappe.db.add_index("Scheduled Audit Visit",
+        ["restaurant", "status", "week_start_date"],
+        "restaurant_status_week_index"
+    )
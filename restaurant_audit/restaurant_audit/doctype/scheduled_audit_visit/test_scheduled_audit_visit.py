@@ -1,9 +1,51 @@
 # Copyright (c) 2025, Ontime Solutions and Contributors
 # See license.txt
 
-# import frappe
+from collections import Counter
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from restaurant_audit.week_calendar import (
+	WEEKDAY_NUMBERS,
+	get_week_start,
+	get_week_windows,
+	pick_week_start_day,
+)
+
+# Spans a leap day and a year boundary
+DATES = [add_days(getdate("2024-02-20"), i) for i in range(21)] + [
+	add_days(getdate("2024-12-20"), i) for i in range(21)
+]
+
+
+def make_visit(restaurant, visit_date, status="Pending", auditor="Administrator"):
+	return frappe.get_doc({
+		"doctype": "Scheduled Audit Visit",
+		"restaurant": restaurant,
+		"auditor": auditor,
+		"visit_date": visit_date,
+		"status": status,
+	}).insert(ignore_permissions=True)
 
 
 class TestScheduledAuditVisit(FrappeTestCase):
-	pass
+	def test_week_windows_match_week_start(self):
+		for day, number in WEEKDAY_NUMBERS.items():
+			starts, ends = get_week_windows(DATES, day)
+			for date, start, end in zip(DATES, starts, ends):
+				self.assertEqual(start, get_week_start(date, day))
+				self.assertEqual(end, add_days(start, 6))
+				self.assertEqual(start.weekday(), number)
+				self.assertTrue(start <= date <= end)
+
+	def test_week_windows_per_date_rules(self):
+		days = [list(WEEKDAY_NUMBERS)[i % 7] for i in range(len(DATES))]
+		starts, _ = get_week_windows(DATES, days)
+		self.assertEqual(starts, [get_week_start(date, day) for date, day in zip(DATES, days)])
+		self.assertEqual(get_week_windows([], "Monday"), ([], []))
+
+	def test_pick_week_start_day(self):
+		self.assertEqual(pick_week_start_day(Counter({"Saturday": 2, "Monday": 1})), "Saturday")
+		self.assertEqual(pick_week_start_day(Counter({"Sunday": 1, "Tuesday": 1})), "Tuesday")
@@ -0,0 +1,109 @@
+# Copyright (c) 2025, Ontime Solutions and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from restaurant_audit.restaurant_audit.doctype.audit_submission.test_audit_submission import make_submission
+from restaurant_audit.restaurant_audit.doctype.restaurant.test_restaurant import (
+	delete_audit_records,
+	make_test_auditor,
+	make_test_restaurant,
+)
+from restaurant_audit.restaurant_audit.doctype.scheduled_audit_visit.test_scheduled_audit_visit import make_visit
+from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import (
+	COUNTER_FIELDS,
+	ROLLUP_DOCTYPE,
+	refresh_rollup,
+	refresh_rollups,
+)
+
+MONDAY = getdate("2025-03-03")
+
+
+class TestWeeklyAuditRollup(FrappeTestCase):
+	def setUp(self):
+		self.restaurant = make_test_restaurant("_Test Rollup Restaurant").name
+		self.auditor = make_test_auditor()
+		delete_audit_records(self.restaurant, self.auditor)
+
+	def get_rollup(self, week_start=MONDAY):
+		return frappe.db.get_value(ROLLUP_DOCTYPE, {
+			"restaurant": self.restaurant,
+			"auditor": self.auditor,
+			"week_start": week_start
+		}, [*COUNTER_FIELDS, "average_score", "week_end"], as_dict=True)
+
+	def test_visit_insert_and_status_change(self):
+		visit = make_visit(self.restaurant, add_days(MONDAY, 2), auditor=self.auditor)
+
+		rollup = self.get_rollup()
+		self.assertEqual(rollup.week_end, add_days(MONDAY, 6))
+		self.assertEqual((rollup.scheduled_count, rollup.pending_count, rollup.completed_count), (1, 1, 0))
+
+		visit.status = "Completed"
+		visit.save(ignore_permissions=True)
+
+		rollup = self.get_rollup()
+		self.assertEqual((rollup.scheduled_count, rollup.pending_count, rollup.completed_count), (1, 0, 1))
+
+	def test_visit_moved_to_another_week(self):
+		visit = make_visit(self.restaurant, add_days(MONDAY, 4), auditor=self.auditor)
+		make_visit(self.restaurant, add_days(MONDAY, 5), auditor=self.auditor)
+
+		visit.visit_date = add_days(MONDAY, 8)
+		visit.save(ignore_permissions=True)
+
+		self.assertEqual(self.get_rollup().scheduled_count, 1)
+		self.assertEqual(self.get_rollup(add_days(MONDAY, 7)).scheduled_count, 1)
+
+		# Moving the last visit out of a week removes that week's row
+		visit.visit_date = add_days(MONDAY, 14)
+		visit.save(ignore_permissions=True)
+
+		self.assertIsNone(self.get_rollup(add_days(MONDAY, 7)))
+		self.assertEqual(self.get_rollup(add_days(MONDAY, 14)).scheduled_count, 1)
+
+	def test_refresh_after_raw_status_update(self):
+		visits = [make_visit(self.restaurant, add_days(MONDAY, day), auditor=self.auditor) for day in (1, 3)]
+
+		frappe.db.sql("""
+			UPDATE `tabScheduled Audit Visit` SET status = 'Overdue' WHERE name IN %(names)s
+		""", {"names": tuple(v.name for v in visits)})
+		self.assertEqual(self.get_rollup().pending_count, 2)
+
+		refresh_rollups({(self.restaurant, self.auditor, add_days(MONDAY, 3)), None})
+
+		rollup = self.get_rollup()
+		self.assertEqual((rollup.pending_count, rollup.overdue_count), (0, 2))
+
+	def test_submissions_and_daily_audits(self):
+		make_submission(self.restaurant, add_days(MONDAY, 1), 80, auditor=self.auditor)
+		submission = make_submission(self.restaurant, add_days(MONDAY, 2), 60, auditor=self.auditor)
+		frappe.get_doc({
+			"doctype": "Audit Progress",
+			"restaurant": self.restaurant,
+			"auditor": self.auditor,
+			"start_time": f"{add_days(MONDAY, 3)} 07:00:00",
+			"last_updated": f"{add_days(MONDAY, 3)} 07:30:00",
+			"is_completed": 1,
+		}).insert(ignore_permissions=True)
+
+		rollup = self.get_rollup()
+		self.assertEqual((rollup.submission_count, rollup.score_total, rollup.average_score), (2, 140, 70))
+		self.assertEqual((rollup.daily_count, rollup.daily_completed), (1, 1))
+
+		frappe.delete_doc("Audit Submission", submission.name, ignore_permissions=True, force=True)
+
+		rollup = self.get_rollup()
+		self.assertEqual((rollup.submission_count, rollup.average_score), (1, 80))
+
+	def test_refresh_rollup_repairs_drift(self):
+		make_visit(self.restaurant, MONDAY, auditor=self.auditor)
+		frappe.db.set_value(ROLLUP_DOCTYPE, {"restaurant": self.restaurant, "auditor": self.auditor},
+			"scheduled_count", 5)
+
+		# Any day of the week identifies the row
+		refresh_rollup(self.restaurant, self.auditor, add_days(MONDAY, 6))
+		self.assertEqual(self.get_rollup().scheduled_count, 1)
@@ -0,0 +1,207 @@
+# Copyright (c) 2025, Ontime Solutions and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, getdate, now
+
+ROLLUP_DOCTYPE = "Weekly Audit Rollup"
+
+COUNTER_FIELDS = [
+	"scheduled_count", "completed_count", "overdue_count", "pending_count",
+	"daily_count", "daily_completed", "submission_count", "score_total",
+]
+
+# Source DocType -> (date field the week is derived from, fields that change the rollup)
+SOURCES = {
+	"Scheduled Audit Visit": ("visit_date", ("restaurant", "auditor", "visit_date", "status")),
+	"Audit Progress": ("audit_date", ("restaurant", "auditor", "audit_date", "is_completed")),
+	"Audit Submission": ("audit_date", ("restaurant", "auditor", "audit_date", "average_score")),
+}
+
+
+class WeeklyAuditRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	"""One rollup row per (restaurant, auditor, week)"""
+	frappe.db.add_unique("Weekly Audit Rollup", ["restaurant", "auditor", "week_start"], "restaurant_auditor_week")
+	frappe.db.add_index("Weekly Audit Rollup", ["week_start", "restaurant"], "week_start_restaurant_index")
+
+
+def get_week_start(value):
+	"""Monday of the week containing `value`"""
+	value = getdate(value)
+	return add_days(value, -value.weekday())
+
+
+def update_rollup_for(doc, method=None):
+	"""Refresh the rollup rows touched by a source document change.
+
+	Called from the `on_update` and `after_delete` of Scheduled Audit Visit,
+	Audit Progress and Audit Submission. When an update moves a document to
+	another restaurant, auditor or week, both the old and the new row are
+	refreshed.
+	"""
+	date_field, tracked_fields = SOURCES[doc.doctype]
+	keys = set()
+
+	before = doc.get_doc_before_save() if method == "on_update" else None
+	if before:
+		if all(before.get(f) == doc.get(f) for f in tracked_fields):
+			return
+		keys.add(get_rollup_key(before, date_field))
+
+	keys.add(get_rollup_key(doc, date_field))
+	refresh_rollups(keys)
+
+
+def get_rollup_key(doc, date_field):
+	if not (doc.get("restaurant") and doc.get("auditor") and doc.get(date_field)):
+		return None
+	return (doc.restaurant, doc.auditor, get_week_start(doc.get(date_field)))
+
+
+def refresh_rollups(keys):
+	"""Recompute the given (restaurant, auditor, week_start) rollup rows from source rows"""
+	for key in keys:
+		if key:
+			refresh_rollup(*key)
+
+
+def refresh_rollup(restaurant, auditor, week_start):
+	"""Recompute a single rollup row; only that week's source rows are read"""
+	week_start = get_week_start(week_start)
+	week_end = add_days(week_start, 6)
+
+	rollups = collect_rollups(
+		"restaurant = %(restaurant)s AND auditor = %(auditor)s AND {date} BETWEEN %(from_date)s AND %(to_date)s",
+		{"restaurant": restaurant, "auditor": auditor, "from_date": week_start, "to_date": week_end},
+	)
+	values = rollups.get((restaurant, auditor, week_start))
+
+	name = frappe.db.get_value(ROLLUP_DOCTYPE, {
+		"restaurant": restaurant,
+		"auditor": auditor,
+		"week_start": week_start
+	}, "name")
+
+	if not values:
+		if name:
+			frappe.db.delete(ROLLUP_DOCTYPE, {"name": name})
+		return
+
+	if name:
+		frappe.db.set_value(ROLLUP_DOCTYPE, name, values, update_modified=True)
+		return
+
+	try:
+		frappe.get_doc({
+			"doctype": ROLLUP_DOCTYPE,
+			"restaurant": restaurant,
+			"auditor": auditor,
+			"week_start": week_start,
+			"week_end": week_end,
+			**values
+		}).db_insert()
+	except frappe.DuplicateEntryError:
+		# A concurrent request created the row first; recompute into it instead
+		name = frappe.db.get_value(ROLLUP_DOCTYPE, {
+			"restaurant": restaurant,
+			"auditor": auditor,
+			"week_start": week_start
+		}, "name")
+		frappe.db.set_value(ROLLUP_DOCTYPE, name, values, update_modified=True)
+
+
+def collect_rollups(condition, params):
+	"""Aggregate the three source tables by (restaurant, auditor, week_start).
+
+	`condition` is applied to every source table; `{date}` in it is replaced
+	by each table's own date column.
+	"""
+	rollups = {}
+
+	def week_expr(column):
+		return f"DATE_SUB(DATE({column}), INTERVAL WEEKDAY({column}) DAY)"
+
+	def merge(rows):
+		for row in rows:
+			key = (row.pop("restaurant"), row.pop("auditor"), getdate(row.pop("week_start")))
+			rollup = rollups.setdefault(key, dict.fromkeys(COUNTER_FIELDS, 0))
+			rollup.update({field: value or 0 for field, value in row.items()})
+
+	merge(frappe.db.sql(f"""
+		SELECT restaurant, auditor, {week_expr("visit_date")} AS week_start,
+			COUNT(*) AS scheduled_count,
+			SUM(status = 'Completed') AS completed_count,
+			SUM(status = 'Overdue') AS overdue_count,
+			SUM(status = 'Pending') AS pending_count
+		FROM `tabScheduled Audit Visit`
+		WHERE {condition.format(date="visit_date")}
+		GROUP BY restaurant, auditor, week_start
+	""", params, as_dict=True))
+
+	merge(frappe.db.sql(f"""
+		SELECT restaurant, auditor, {week_expr("audit_date")} AS week_start,
+			COUNT(*) AS daily_count,
+			SUM(is_completed) AS daily_completed
+		FROM `tabAudit Progress`
+		WHERE {condition.format(date="audit_date")}
+		GROUP BY restaurant, auditor, week_start
+	""", params, as_dict=True))
+
+	merge(frappe.db.sql(f"""
+		SELECT restaurant, auditor, {week_expr("audit_date")} AS week_start,
+			COUNT(*) AS submission_count,
+			SUM(average_score) AS score_total
+		FROM `tabAudit Submission`
+		WHERE {condition.format(date="audit_date")}
+		GROUP BY restaurant, auditor, week_start
+	""", params, as_dict=True))
+
+	for rollup in rollups.values():
+		rollup["average_score"] = (
+			rollup["score_total"] / rollup["submission_count"] if rollup["submission_count"] else 0
+		)
+
+	return rollups
+
+
+def rebuild_weekly_rollups(from_date=None):
+	"""Rebuild rollup rows from the raw audit tables (backfill / repair).
+
+	With `from_date` only the weeks starting on or after that date's week
+	are rebuilt. Returns the number of rollup rows written.
+	"""
+	if from_date:
+		week_start = get_week_start(from_date)
+		condition = "{date} >= %(from_date)s"
+		params = {"from_date": week_start}
+		frappe.db.delete(ROLLUP_DOCTYPE, {"week_start": [">=", week_start]})
+	else:
+		condition = "1 = 1"
+		params = {}
+		frappe.db.delete(ROLLUP_DOCTYPE)
+
+	rollups = collect_rollups(condition, params)
+
+	timestamp = now()
+	user = frappe.session.user
+	fields = [
+		"name", "creation", "modified", "owner", "modified_by", "docstatus",
+		"restaurant", "auditor", "week_start", "week_end", *COUNTER_FIELDS, "average_score",
+	]
+	values = [
+		(
+			frappe.generate_hash(length=10), timestamp, timestamp, user, user, 0,
+			restaurant, auditor, week_start, add_days(week_start, 6),
+			*(rollup[field] for field in COUNTER_FIELDS), rollup["average_score"],
+		)
+		for (restaurant, auditor, week_start), rollup in rollups.items()
+	]
+	frappe.db.bulk_insert(ROLLUP_DOCTYPE, fields, values)
+	frappe.db.commit()
+
+	return len(values)
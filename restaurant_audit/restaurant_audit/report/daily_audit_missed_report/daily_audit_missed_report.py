@@ -112,6 +112,15 @@ def get_data(filters):
         fields=["name", "restaurant_name"]
     )
     
+    # Daily audit progress for the whole range, keyed by (restaurant, auditor, day)
+    progress_by_day = {}
+    for progress in frappe.get_all("Audit Progress",
+        filters={"audit_date": ["between", [from_date, to_date]]},
+        fields=["name", "restaurant", "auditor", "audit_date", "is_completed", "completion_percentage",
+            "start_time", "total_questions", "answered_questions"]
+    ):
+        progress_by_day.setdefault((progress.restaurant, progress.auditor, getdate(progress.audit_date)), progress)
+    
     current_date = from_date
     while current_date <= to_date:
         current_date = getdate(current_date)
@@ -141,16 +150,9 @@ def get_data(filters):
                         continue
                     
                     # Check if daily audit was done for this date
-                    audit_progress = frappe.get_all("Audit Progress",
-                        filters={
-                            "restaurant": restaurant.name,
-                            "auditor": employee_doc,
-                            "start_time": ["between", [f"{current_date} 00:00:00", f"{current_date} 23:59:59"]]
-                        },
-                        fields=["name", "is_completed", "completion_percentage", "start_time", "total_questions", "answered_questions"]
-                    )
+                    progress = progress_by_day.get((restaurant.name, employee_doc, current_date))
                     
-                    if not audit_progress:
+                    if not progress:
 
                         # No daily audit attempted - MISSED
                         days_overdue = (to_date - current_date).days
@@ -168,7 +170,6 @@ def get_data(filters):
                         })
                     else:
                         # Daily audit was attempted
-                        progress = audit_progress[0]
                         if not progress.is_completed:
                             # Started but not completed - INCOMPLETE
                             days_overdue = (to_date - current_date).days
@@ -11,6 +11,8 @@ import frappe
 from frappe import _
 from frappe.utils import getdate, add_days, formatdate, nowdate, date_diff
 
+from restaurant_audit.week_calendar import get_user_week_windows
+
 def execute(filters=None):
     columns = get_columns()
     data = get_data(filters)
@@ -124,6 +126,21 @@ def get_data(filters):
     
     today = getdate(nowdate())
     
+    # Manager and last audit date come from the Restaurant counters, fetched once
+    restaurant_info = {
+        r.name: r for r in frappe.get_all("Restaurant",
+            filters={"name": ["in", list({a.restaurant for a in overdue_audits})]},
+            fields=["name", "restaurant_manager", "last_audit_date"]
+        )
+    } if overdue_audits else {}
+    
+    # Week of visits without stored week fields, under each auditor's week start day
+    unweeked = [a for a in overdue_audits if not (a.week_start_date and a.week_end_date)]
+    for audit, week_start, week_end in zip(unweeked, *get_user_week_windows(
+        [a.auditor for a in unweeked], [a.visit_date for a in unweeked]
+    )):
+        audit.week_start_date, audit.week_end_date = week_start, week_end
+    
     for audit in overdue_audits:
         # Calculate days overdue
         visit_date = getdate(audit.visit_date)
@@ -132,15 +149,10 @@ def get_data(filters):
         # Get auditor name
         auditor_name = frappe.get_value("User", audit.auditor, "full_name") or audit.auditor
         
-        # Get restaurant manager
-        restaurant_manager = frappe.get_value("Restaurant", audit.restaurant, "restaurant_manager")
-        
-        # Get last completed audit for this restaurant
-        last_audit = frappe.get_value("Audit Submission",
-            filters={"restaurant": audit.restaurant},
-            fieldname="audit_date",
-            order_by="audit_date desc"
-        )
+        # Get restaurant manager and last completed audit for this restaurant
+        restaurant = restaurant_info.get(audit.restaurant) or frappe._dict()
+        restaurant_manager = restaurant.restaurant_manager
+        last_audit = restaurant.last_audit_date
         
         # Determine priority based on days overdue
         if days_overdue >= 7:
@@ -151,15 +163,7 @@ def get_data(filters):
             priority = "🟡 Medium"
         
         # Calculate week range
-        if audit.week_start_date and audit.week_end_date:
-            week_range = f"{formatdate(audit.week_start_date, 'MMM dd')} - {formatdate(audit.week_end_date, 'MMM dd')}"
-        else:
-            # Calculate week from visit date
-            visit_date_obj = getdate(audit.visit_date)
-            days_since_monday = visit_date_obj.weekday()
-            week_start = add_days(visit_date_obj, -days_since_monday)
-            week_end = add_days(week_start, 6)
-            week_range = f"{formatdate(week_start, 'MMM dd')} - {formatdate(week_end, 'MMM dd')}"
+        week_range = f"{formatdate(audit.week_start_date, 'MMM dd')} - {formatdate(audit.week_end_date, 'MMM dd')}"
         
         # Determine action required
         if days_overdue >= 14:
@@ -5,6 +5,8 @@ import frappe
 from frappe import _
 from frappe.utils import getdate, add_days, formatdate, nowdate
 
+from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import get_week_start
+
 def execute(filters=None):
     columns = get_columns()
     data = get_data(filters)
@@ -105,6 +107,7 @@ def get_columns():
 
 def get_data(filters):
     data = []
+    filters = filters or {}
     
     # Get date range
     if filters.get("from_date") and filters.get("to_date"):
@@ -121,7 +124,7 @@ def get_data(filters):
     week_range = f"{formatdate(from_date, 'MMM dd')} - {formatdate(to_date, 'MMM dd, yyyy')}"
     
     # Filter by restaurant manager if specified
-    restaurant_filters=None
+    restaurant_filters = {}
     if filters.get("restaurant_manager"):
         restaurant_filters["restaurant_manager"] = filters.get("restaurant_manager")
     
@@ -131,19 +134,31 @@ def get_data(filters):
         fields=["name", "restaurant_name", "restaurant_manager"]
     )
     
+    # Active auditors (user ids) per restaurant, in one query
+    assigned_auditors = {}
+    for row in frappe.db.sql("""
+        SELECT re.parent AS restaurant, e.user_id
+        FROM `tabRestaurant Employee` re
+        LEFT JOIN `tabEmployee` e ON e.name = re.employee
+        WHERE re.parenttype = 'Restaurant' AND re.is_active = 1
+    """, as_dict=True):
+        auditors = assigned_auditors.setdefault(row.restaurant, [])
+        if row.user_id:
+            auditors.append(row.user_id)
+    
+    # Weekly facts come pre-aggregated from the rollup table
+    rollups = {}
+    for rollup in frappe.get_all("Weekly Audit Rollup",
+        filters={"week_start": ["between", [get_week_start(from_date), to_date]]},
+        fields=[
+            "restaurant", "auditor", "scheduled_count", "completed_count", "overdue_count",
+            "daily_completed", "submission_count", "score_total"
+        ]
+    ):
+        rollups.setdefault(rollup.restaurant, []).append(rollup)
+    
     for restaurant in restaurants:
-        # Get manager details
-        manager_name = None
-        if restaurant.restaurant_manager:
-            manager_name = frappe.get_value("Employee", restaurant.restaurant_manager, "employee_name")
-        
-        # Get assigned auditors for this restaurant
-        assigned_employees = frappe.get_all("Restaurant Employee",
-            filters={"parent": restaurant.name, "is_active": 1},
-            fields=["employee"]
-        )
-        
-        if not assigned_employees:
+        if restaurant.name not in assigned_auditors:
             # No auditors assigned
             data.append({
                 "restaurant": restaurant.name,
@@ -164,58 +179,31 @@ def get_data(filters):
             continue
         
         # Collect all auditors for this restaurant
-        auditors = []
-        for emp in assigned_employees:
-            user_id = frappe.get_value("Employee", emp.employee, "user_id")
-            if user_id:
-                auditors.append(user_id)
+        auditors = assigned_auditors[restaurant.name]
         
         if not auditors:
             continue
         
-        # Get scheduled audits for this week
-        scheduled_audits = frappe.get_all("Scheduled Audit Visit",
-            filters={
-                "restaurant": restaurant.name,
-                "auditor": ["in", auditors],
-                "visit_date": ["between", [from_date, to_date]]
-            },
-            fields=["status", "auditor", "visit_date"]
-        )
-        
-        # Get daily audits for this week
-        daily_audits = frappe.get_all("Audit Progress",
-            filters={
-                "restaurant": restaurant.name,
-                "auditor": ["in", auditors],
-                "start_time": ["between", [f"{from_date} 00:00:00", f"{to_date} 23:59:59"]]
-            },
-            fields=["is_completed", "auditor", "start_time"]
-        )
-        
-        # Get audit submissions for scoring
-        audit_submissions = frappe.get_all("Audit Submission",
-            filters={
-                "restaurant": restaurant.name,
-                "auditor": ["in", auditors],
-                "audit_date": ["between", [from_date, to_date]]
-            },
-            fields=["average_score"]
-        )
+        restaurant_rollups = [
+            r for r in rollups.get(restaurant.name, []) if r.auditor in auditors
+        ]
         
         # Calculate metrics
-        scheduled_count = len(scheduled_audits)
-        completed_count = len([a for a in scheduled_audits if a.status == "Completed"])
-        overdue_count = len([a for a in scheduled_audits if a.status == "Overdue"])
+        scheduled_count = sum(r.scheduled_count for r in restaurant_rollups)
+        completed_count = sum(r.completed_count for r in restaurant_rollups)
+        overdue_count = sum(r.overdue_count for r in restaurant_rollups)
         
         # Daily audit metrics
-        daily_completed_count = len([a for a in daily_audits if a.is_completed])
+        daily_completed_count = sum(r.daily_completed for r in restaurant_rollups)
         daily_expected = 7 * len(auditors)  # Each auditor should do daily audit each day
         daily_missed = daily_expected - daily_completed_count
         
+        submission_count = sum(r.submission_count for r in restaurant_rollups)
+        score_total = sum(r.score_total for r in restaurant_rollups)
+        
         # Calculate average score
-        if audit_submissions:
-            overall_score = sum([a.average_score for a in audit_submissions if a.average_score]) / len(audit_submissions)
+        if submission_count:
+            overall_score = score_total / submission_count
         else:
             overall_score = 0
         
@@ -8,6 +8,8 @@ import frappe
 from frappe import _
 from frappe.utils import getdate, add_days, formatdate
 
+from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import get_week_start
+
 def execute(filters=None):
     columns = get_columns()
     data = get_data(filters)
@@ -88,6 +90,7 @@ def get_columns():
 
 def get_data(filters):
     data = []
+    filters = filters or {}
     
     # Calculate date ranges
     if filters.get("from_date") and filters.get("to_date"):
@@ -101,98 +104,69 @@ def get_data(filters):
         from_date = add_days(current_week_start, -21)  # 3 weeks back
         to_date = add_days(current_week_start, 6)  # End of current week
     
-    # Get all restaurants
-    restaurants = frappe.get_all("Restaurant", 
-       
-        fields=["name", "restaurant_name"]
+    # Only weeks of currently active restaurant/auditor assignments are shown
+    active_assignments = set(
+        (row.restaurant, row.user_id) for row in frappe.db.sql("""
+            SELECT re.parent AS restaurant, e.user_id
+            FROM `tabRestaurant Employee` re
+            INNER JOIN `tabEmployee` e ON e.name = re.employee
+            WHERE re.parenttype = 'Restaurant' AND re.is_active = 1
+                AND IFNULL(e.user_id, '') != ''
+        """, as_dict=True)
+    )
+    
+    # Weekly facts come pre-aggregated from the rollup table
+    rollups = frappe.get_all("Weekly Audit Rollup",
+        filters={
+            "week_start": ["between", [get_week_start(from_date), to_date]]
+        },
+        fields=[
+            "restaurant", "auditor", "week_start", "week_end",
+            "scheduled_count", "completed_count", "overdue_count", "pending_count",
+            "daily_count", "daily_completed"
+        ],
+        order_by="week_start asc, restaurant asc, auditor asc"
     )
     
-    # Process week by week
-    current_date = from_date
-    while current_date <= to_date:
-        # Calculate week start (Monday) and end (Sunday)
-        days_since_monday = current_date.weekday()
-        week_start = add_days(current_date, -days_since_monday)
-        week_end = add_days(week_start, 6)
+    for rollup in rollups:
+        if (rollup.restaurant, rollup.auditor) not in active_assignments:
+            continue
+        
+        if not rollup.scheduled_count and not rollup.daily_count:
+            continue
+        
+        week_range = f"{formatdate(rollup.week_start, 'MMM dd')} - {formatdate(rollup.week_end, 'MMM dd, yyyy')}"
+        
+        scheduled_count = rollup.scheduled_count
+        completed_count = rollup.completed_count
+        overdue_count = rollup.overdue_count
+        pending_count = rollup.pending_count
         
-        if week_start > to_date:
-            break
-            
-        week_range = f"{formatdate(week_start, 'MMM dd')} - {formatdate(week_end, 'MMM dd, yyyy')}"
+        completion_rate = (completed_count / scheduled_count * 100) if scheduled_count > 0 else 0
         
-        for restaurant in restaurants:
-            # Get all auditors for this restaurant
-            auditors = frappe.get_all("Restaurant Employee",
-                filters={"parent": restaurant.name, "is_active": 1},
-                fields=["employee"]
-            )
-            
-            for auditor_emp in auditors:
-                # Get user_id for this employee
-                employee_doc = frappe.get_value("Employee", auditor_emp.employee, "user_id")
-                if not employee_doc:
-                    continue
-                    
-                # Get scheduled audits for this week
-                scheduled_audits = frappe.get_all("Scheduled Audit Visit",
-                    filters={
-                        "restaurant": restaurant.name,
-                        "auditor": employee_doc,
-                        "visit_date": ["between", [week_start, week_end]]
-                    },
-                    fields=["status"]
-                )
-                
-                # Get daily audits for this week
-                daily_audits = frappe.get_all("Audit Progress",
-                    filters={
-                        "restaurant": restaurant.name,
-                        "auditor": employee_doc,
-                        "start_time": ["between", [f"{week_start} 00:00:00", f"{week_end} 23:59:59"]]
-                    },
-                    fields=["is_completed"]
-                )
-                
-                if not scheduled_audits and not daily_audits:
-                    continue
-                
-                # Calculate metrics
-                scheduled_count = len(scheduled_audits)
-                completed_count = len([a for a in scheduled_audits if a.status == "Completed"])
-                overdue_count = len([a for a in scheduled_audits if a.status == "Overdue"])
-                pending_count = len([a for a in scheduled_audits if a.status == "Pending"])
-                
-                daily_count = len(daily_audits)
-                daily_completed_count = len([a for a in daily_audits if a.is_completed])
-                
-                completion_rate = (completed_count / scheduled_count * 100) if scheduled_count > 0 else 0
-                
-                # Determine week status
-                if overdue_count > 0:
-                    status = "⚠️ Has Overdue"
-                elif pending_count > 0:
-                    status = "⏳ In Progress"
-                elif completed_count == scheduled_count and scheduled_count > 0:
-                    status = "✅ Complete"
-                else:
-                    status = "📝 No Audits"
-                
-                data.append({
-                    "week_range": week_range,
-                    "restaurant": restaurant.name,
-                    "auditor": employee_doc,
-                    "scheduled_count": scheduled_count,
-                    "completed_count": completed_count,
-                    "overdue_count": overdue_count,
-                    "pending_count": pending_count,
-                    "completion_rate": completion_rate,
-                    "daily_audits": daily_count,
-                    "daily_completed": daily_completed_count,
-                    "status": status
-                })
+        # Determine week status
+        if overdue_count > 0:
+            status = "⚠️ Has Overdue"
+        elif pending_count > 0:
+            status = "⏳ In Progress"
+        elif completed_count == scheduled_count and scheduled_count > 0:
+            status = "✅ Complete"
+        else:
+            status = "📝 No Audits"
         
-        # Move to next week
-        current_date = add_days(week_end, 1)
+        data.append({
+            "week_range": week_range,
+            "restaurant": rollup.restaurant,
+            "auditor": rollup.auditor,
+            "scheduled_count": scheduled_count,
+            "completed_count": completed_count,
+            "overdue_count": overdue_count,
+            "pending_count": pending_count,
+            "completion_rate": completion_rate,
+            "daily_audits": rollup.daily_count,
+            "daily_completed": rollup.daily_completed,
+            "status": status
+        })
     
     return data
 
@@ -0,0 +1,158 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Audit scoring plans.
+
+A scoring plan is compiled once per Checklist Category version and cached in
+Redis. It maps every question row to the scorer for its answer type, its
+weight and whether a low score makes the answer critical. Reading plans
+costs one query for the categories' current `modified`; a cached plan of an
+older version is compiled again, and saving a category also drops it.
+"""
+
+import frappe
+
+SCORING_PLAN_CACHE_KEY = "restaurant_audit:scoring_plan"
+
+MAX_SCORE = 5
+CRITICAL_SCORE = 2
+
+BOOLEAN_SCORES = {"Yes": 5, "True": 5, "No": 1, "False": 1}
+
+
+def score_boolean(value):
+    return BOOLEAN_SCORES.get(str(value), 0)
+
+
+def score_rating(value):
+    try:
+        return min(max(float(value), 0), MAX_SCORE)
+    except (TypeError, ValueError):
+        return 0
+
+
+def score_value(value):
+    """Fallback for answer types without a dedicated scorer"""
+    value = str(value)
+    if value in BOOLEAN_SCORES:
+        return BOOLEAN_SCORES[value]
+    return min(int(value), MAX_SCORE) if value.isdigit() else 0
+
+
+# Answer type -> scorer; other types (Text, Image, ...) use score_value
+SCORERS = {
+    "Yes/No": score_boolean,
+    "True/False": score_boolean,
+    "Rating": score_rating,
+}
+
+
+def get_scorer(answer_type):
+    return SCORERS.get(answer_type, score_value)
+
+
+def get_scoring_plan(categories):
+    """Merged question plan for the given Checklist Categories.
+
+    Returns {question_id: question plan}. Categories are compiled on first
+    use and then served from the cache while their version is unchanged.
+    """
+    categories = list(set(filter(None, categories)))
+    if not categories:
+        return {}
+
+    versions = {
+        name: str(modified)
+        for name, modified in frappe.get_all("Checklist Category",
+            filters={"name": ["in", categories]},
+            fields=["name", "modified"],
+            as_list=True
+        )
+    }
+
+    questions = {}
+    for category in categories:
+        plan = frappe.cache().hget(SCORING_PLAN_CACHE_KEY, category)
+        if plan is None or plan["version"] != versions.get(category):
+            plan = compile_category_plan(category, versions.get(category))
+            frappe.cache().hset(SCORING_PLAN_CACHE_KEY, category, plan)
+        questions.update(plan["questions"])
+    return questions
+
+
+def compile_category_plan(category, version=None):
+    if version is None:
+        version = frappe.db.get_value("Checklist Category", category, "modified")
+    rows = frappe.get_all("Audit Question",
+        filters={"parent": category, "parenttype": "Checklist Category"},
+        fields=["name", "question_text", "answer_type", "weight", "is_critical"]
+    )
+
+    return {
+        "category": category,
+        "version": str(version) if version else None,
+        "questions": {
+            row.name: {
+                "category": category,
+                "question_text": row.question_text,
+                "answer_type": row.answer_type,
+                "weight": 1.0 if row.weight is None else float(row.weight),
+                "is_critical": 1 if row.is_critical is None else row.is_critical,
+            }
+            for row in rows
+        },
+    }
+
+
+def clear_scoring_plan(category):
+    frappe.cache().hdel(SCORING_PLAN_CACHE_KEY, category)
+
+
+def score_answers(answers, plan):
+    """Score a list of answers against a plan in a single pass.
+
+    `answers` are dicts with `question_id`, `answer_value` and optionally
+    `category`; questions missing from the plan fall back to an unweighted
+    default scorer. Returns per-answer scores and flags, weighted totals and
+    per-category subtotals.
+
+    A submission has tens of answers, too few for NumPy's array setup to pay
+    off, so this stays a plain loop; bulk rescoring in
+    `restaurant_audit.rescoring` scores many submissions vectorized.
+    """
+    scored = []
+    categories = {}
+    total_score = 0.0
+    max_possible_score = 0.0
+
+    for answer in answers:
+        question = plan.get(answer.get("question_id")) or {}
+        scorer = get_scorer(question.get("answer_type")) if question else score_value
+        category = question.get("category") or answer.get("category") or ""
+
+        weight = question.get("weight", 1.0)
+        score = scorer(answer.get("answer_value", ""))
+        is_critical = int(bool(question.get("is_critical", 1)) and score <= CRITICAL_SCORE)
+
+        total_score += score * weight
+        max_possible_score += MAX_SCORE * weight
+
+        subtotal = categories.setdefault(category, {"score": 0.0, "max_score": 0.0, "critical": 0})
+        subtotal["score"] += score * weight
+        subtotal["max_score"] += MAX_SCORE * weight
+        subtotal["critical"] += is_critical
+
+        scored.append({"score": score, "is_critical": is_critical})
+
+    for subtotal in categories.values():
+        subtotal["percentage"] = (
+            round(subtotal["score"] / subtotal["max_score"] * 100, 2) if subtotal["max_score"] else 0
+        )
+
+    return {
+        "answers": scored,
+        "total_score": total_score,
+        "max_possible_score": max_possible_score,
+        "average_score": (total_score / max_possible_score * 100) if max_possible_score else 0,
+        "category_scores": categories,
+    }
@@ -24,18 +24,17 @@ def check_weekly_audits():
             fields=["name", "restaurant_name", "restaurant_manager"]
         )
         
+        # Restaurants with a completed audit this week, from the weekly rollup
+        audited_restaurants = set(frappe.get_all("Weekly Audit Rollup",
+            filters={
+                "week_start": week_start,
+                "completed_count": [">", 0]
+            },
+            pluck="restaurant"
+        ))
+        
         for restaurant in restaurants:
-            # Check if restaurant has completed audit for current week
-            completed_audits = frappe.get_all("Scheduled Audit Visit",
-                filters={
-                    "restaurant": restaurant.name,
-                    "status": "Completed",
-                    "week_start_date": week_start,
-                    "week_end_date": week_end
-                }
-            )
-            
-            if not completed_audits:
+            if restaurant.name not in audited_restaurants:
                 # No completed audit found, send alerts
                 send_audit_alerts(restaurant, week_start, week_end)
                 
@@ -133,20 +132,14 @@ def send_audit_alerts(restaurant, week_start, week_end):
 def mark_pending_audits_overdue(restaurant_name, week_start, week_end):
     """Mark pending scheduled audits as overdue for the current week"""
     try:
-        pending_audits = frappe.get_all("Scheduled Audit Visit",
-            filters={
-                "restaurant": restaurant_name,
-                "status": "Pending",
-                "week_start_date": week_start,
-                "week_end_date": week_end
-            }
-        )
-        
-        for audit in pending_audits:
-            audit_doc = frappe.get_doc("Scheduled Audit Visit", audit.name)
-            audit_doc.status = "Overdue"
-            audit_doc.overdue_notified = 1
-            audit_doc.save(ignore_permissions=True)
+        from restaurant_audit.week_rollover import mark_visits_overdue
+        
+        # Auditors were just alerted by send_audit_alerts
+        mark_visits_overdue({
+            "restaurant": restaurant_name,
+            "week_start_date": week_start,
+            "week_end_date": week_end
+        }, notified=1)
             
     except Exception as e:
         frappe.log_error(f"Error marking audits overdue: {str(e)}", "Mark Audits Overdue")
@@ -156,42 +149,24 @@ def mark_pending_audits_overdue(restaurant_name, week_start, week_end):
 def daily_audit_status_update():
     """
     Daily job that runs at 12:00 AM to update audit statuses
-    - Mark past due audits as Overdue
+    - Mark past due audits as Overdue and notify their auditors
+    - Record how last week ended, once per week boundary
     - Reset daily audit availability for new day
     """
     try:
-        from frappe.utils import getdate, nowdate
+        from restaurant_audit.week_rollover import mark_visits_overdue, process_last_week, set_overdue_notified
         
         today = getdate()
         frappe.logger().info(f"Running daily audit status update for {today}")
         
-        # Update scheduled audits that are past due
-        overdue_scheduled = frappe.get_all("Scheduled Audit Visit",
-            filters={
-                "visit_date": ["<", today],
-                "status": "Pending"
-            },
-            fields=["name", "restaurant_name", "auditor", "visit_date"]
-        )
-        
-        updated_count = 0
-        for audit in overdue_scheduled:
-            try:
-                audit_doc = frappe.get_doc("Scheduled Audit Visit", audit.name)
-                audit_doc.status = "Overdue" 
-                audit_doc.overdue_notified = 0  # Reset to send new notification
-                audit_doc.save(ignore_permissions=True)
-                updated_count += 1
-                
-                frappe.logger().info(f"Marked audit {audit.name} as Overdue")
-                
-            except Exception as e:
-                frappe.log_error(f"Error updating audit {audit.name}: {str(e)}", "Daily Status Update")
+        # Mark scheduled audits that are past due in one update
+        overdue_scheduled = mark_visits_overdue({"visit_date": ["<", today]})
+        updated_count = len(overdue_scheduled)
         
         # Mark incomplete daily audits from previous days
         incomplete_daily = frappe.get_all("Audit Progress",
             filters={
-                "start_time": ["<", f"{today} 00:00:00"],
+                "audit_date": ["<", today],
                 "is_completed": 0
             },
             fields=["name", "restaurant", "auditor", "start_time"]
@@ -203,6 +178,11 @@ def daily_audit_status_update():
         # Send notifications for newly overdue audits
         if updated_count > 0:
             send_overdue_notifications(overdue_scheduled)
+            set_overdue_notified(overdue_scheduled)
+        frappe.db.commit()
+        
+        # Record how last week ended, once per week boundary
+        process_last_week()
         
         # Generate daily missed audit report
         generate_daily_missed_report(today)
@@ -266,7 +246,7 @@ def generate_daily_missed_report(date):
         })
         
         incomplete_daily = frappe.db.count("Audit Progress", {
-            "start_time": ["between", [f"{date} 00:00:00", f"{date} 23:59:59"]],
+            "audit_date": date,
             "is_completed": 0
         })
         
@@ -496,4 +476,122 @@ def deactivate_employee_assignments(employee_id):
             frappe.logger().info(f"Deactivated {len(assignments)} restaurant assignments for employee {employee_id}")
         
     except Exception as e:
-        frappe.log_error(f"Error deactivating employee assignments: {str(e)}", "Deactivate Employee Assignments")
\ No newline at end of file
+        frappe.log_error(f"Error deactivating employee assignments: {str(e)}", "Deactivate Employee Assignments")
+
+def reconcile_audit_counters():
+    """
+    Daily job to repair drift in the incrementally maintained audit counters
+    (Restaurant total/last audit and Restaurant Auditor Stats)
+    """
+    try:
+        from restaurant_audit.restaurant_audit.doctype.restaurant_auditor_stats.restaurant_auditor_stats import (
+            reconcile_audit_counters as reconcile
+        )
+        
+        fixed = reconcile()
+        if fixed:
+            frappe.logger().info(f"Reconciled {fixed} audit counter rows")
+        
+    except Exception as e:
+        frappe.log_error(f"Error reconciling audit counters: {str(e)}", "Audit Counter Reconcile")
+
+def reconcile_dashboard_stats():
+    """
+    Daily job to repair drift in Auditor Dashboard Stats and roll its
+    30/90 day windows forward
+    """
+    try:
+        from restaurant_audit.restaurant_audit.doctype.auditor_dashboard_stats.auditor_dashboard_stats import (
+            reconcile_dashboard_stats as reconcile
+        )
+        
+        fixed = reconcile()
+        if fixed:
+            frappe.logger().info(f"Reconciled {fixed} auditor dashboard stats rows")
+        
+    except Exception as e:
+        frappe.log_error(f"Error reconciling dashboard stats: {str(e)}", "Dashboard Stats Reconcile")
+
+def flush_location_check_logs():
+    """
+    Frequent job that bulk-inserts location checks buffered by validate_location
+    """
+    try:
+        from restaurant_audit.restaurant_audit.doctype.location_check_log.location_check_log import (
+            flush_location_checks
+        )
+        
+        flush_location_checks()
+        
+    except Exception as e:
+        frappe.log_error(f"Error flushing location check logs: {str(e)}", "Location Check Log Flush")
+
+def archive_location_check_logs():
+    """
+    Daily job to roll Location Check Log rows past the retention period into
+    Location Check Summary rows and compressed archive files
+    """
+    try:
+        from restaurant_audit.location_archive import archive_location_checks
+        
+        archived = archive_location_checks()
+        if archived:
+            frappe.logger().info(f"Archived {archived} location check logs")
+        
+    except Exception as e:
+        frappe.log_error(f"Error archiving location check logs: {str(e)}", "Location Check Log Archive")
+
+def scan_location_anomalies():
+    """
+    Nightly job that flags suspicious GPS patterns in Location Check Log
+    for review as Location Anomaly
+    """
+    try:
+        from restaurant_audit.location_anomalies import scan_location_anomalies as scan
+        
+        flagged = scan()
+        if flagged:
+            frappe.logger().info(f"Flagged {flagged} location anomalies")
+        
+    except Exception as e:
+        frappe.log_error(f"Error scanning location anomalies: {str(e)}", "Location Anomaly Scan")
+
+def publish_template_transitions():
+    """
+    Frequent job that pushes realtime events for daily templates
+    opening or closing
+    """
+    try:
+        from restaurant_audit.template_schedule import publish_due_transitions
+        
+        publish_due_transitions()
+        
+    except Exception as e:
+        frappe.log_error(f"Error publishing template transitions: {str(e)}", "Template Transitions")
+
+def rebuild_template_schedule():
+    """
+    Daily job that extends the daily template transition schedule
+    """
+    try:
+        from restaurant_audit.template_schedule import rebuild_template_schedule as rebuild
+        
+        rebuild()
+        
+    except Exception as e:
+        frappe.log_error(f"Error rebuilding template schedule: {str(e)}", "Template Transitions")
+
+def flush_template_usage():
+    """
+    Frequent job that writes buffered daily template usage counts and
+    last-used times
+    """
+    try:
+        from restaurant_audit.restaurant_audit.doctype.daily_audit_template.daily_audit_template import (
+            flush_template_usage as flush
+        )
+        
+        flush()
+        
+    except Exception as e:
+        frappe.log_error(f"Error flushing template usage: {str(e)}", "Template Usage Flush")
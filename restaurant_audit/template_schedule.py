@@ -0,0 +1,151 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Push notifications when daily audit templates open and close.
+
+The open and close moments of every active Daily Audit Template over the
+next `HORIZON_DAYS` are computed from its open_time, close_time,
+days_of_week and timezone and kept in a Redis sorted set scored by Unix
+time. A per-minute tick pops the transitions that are due and sends a
+`daily_template_transition` realtime event to every user assigned to a
+restaurant the template applies to, so pages refresh templates only when
+their status actually changes. Since the tick is a per-minute cron job,
+clients hear of a transition up to about a minute after the open or close
+time (longer if the scheduler is backed up), not at the exact moment;
+`is_template_open` stays authoritative for any check made in between.
+
+The schedule is rebuilt whenever a template is saved or deleted, daily,
+and by the tick itself when the Redis copy has expired or been flushed. A
+rebuild only replaces transitions still in the future; due ones wait for
+the tick.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import frappe
+
+from restaurant_audit.restaurant_audit.doctype.daily_audit_template.daily_audit_template import (
+    get_day_window,
+    to_time,
+)
+
+SCHEDULE_KEY = "restaurant_audit:template_transitions"
+BUILT_KEY = "restaurant_audit:template_transitions_built"
+TRANSITION_EVENT = "daily_template_transition"
+
+HORIZON_DAYS = 2
+# Rebuilt well before the horizon runs out, even if the daily job is missed
+BUILT_TTL = 12 * 60 * 60
+
+
+def get_template_transitions(template, start, end):
+    """[(timestamp, status)] of a template's transitions in [start, end).
+
+    `start` and `end` are aware datetimes. A template closes one second
+    after close_time, matching the inclusive window of `is_template_open`.
+    """
+    open_time, close_time = to_time(template.get("open_time")), to_time(template.get("close_time"))
+    if not template.get("is_active") or not open_time or not close_time:
+        return []
+
+    days, tz = get_day_window(template.get("days_of_week"), template.get("timezone"))
+    transitions = []
+
+    day = start.astimezone(tz).date() - timedelta(days=1)
+    last_day = end.astimezone(tz).date()
+    while day <= last_day:
+        if day.weekday() in days:
+            opens = datetime.combine(day, open_time, tzinfo=tz)
+            closes = datetime.combine(day, close_time, tzinfo=tz) + timedelta(seconds=1)
+            for moment, status in ((opens, "Open"), (closes, "Closed")):
+                if start <= moment < end:
+                    transitions.append((moment.timestamp(), status))
+        day += timedelta(days=1)
+
+    return transitions
+
+
+def rebuild_template_schedule(doc=None, method=None):
+    """Replace the stored future transitions with those of the next HORIZON_DAYS.
+
+    Transitions that are already due but not yet published by the tick are
+    kept, so a rebuild (the daily one runs at midnight, when all-day
+    templates close and open) never drops them.
+    """
+    templates = frappe.get_all("Daily Audit Template",
+        filters={"is_active": 1},
+        fields=["name", "is_active", "open_time", "close_time", "days_of_week", "timezone"]
+    )
+
+    now = datetime.now(timezone.utc)
+    end = now + timedelta(days=HORIZON_DAYS)
+    schedule = {
+        f"{template.name}|{status}|{int(timestamp)}": timestamp
+        for template in templates
+        for timestamp, status in get_template_transitions(template, now, end)
+    }
+
+    cache = frappe.cache()
+    pipeline = cache.pipeline()
+    pipeline.zremrangebyscore(cache.make_key(SCHEDULE_KEY), f"({now.timestamp()}", "+inf")
+    if schedule:
+        pipeline.zadd(cache.make_key(SCHEDULE_KEY), schedule)
+    pipeline.execute()
+    cache.set_value(BUILT_KEY, 1, expires_in_sec=BUILT_TTL)
+
+    return len(schedule)
+
+
+def publish_due_transitions():
+    """Send realtime events for transitions that are due; returns the templates notified.
+
+    Runs once a minute, so events go out up to a minute after the transition.
+    """
+    cache = frappe.cache()
+    if not cache.get_value(BUILT_KEY):
+        rebuild_template_schedule()
+
+    key = cache.make_key(SCHEDULE_KEY)
+    due = cache.zrangebyscore(key, "-inf", time.time())
+    if not due:
+        return 0
+    cache.zrem(key, *due)
+
+    # Members are ordered by time, so the latest transition of a template wins
+    statuses = {}
+    for member in due:
+        template, status, _ = frappe.safe_decode(member).rsplit("|", 2)
+        statuses[template] = status
+
+    for template, status in statuses.items():
+        for user in get_template_audience(template):
+            frappe.publish_realtime(
+                TRANSITION_EVENT,
+                {"template": template, "status": status},
+                user=user,
+                after_commit=False
+            )
+
+    return len(statuses)
+
+
+def get_template_audience(template):
+    """Users assigned to any restaurant the template applies to"""
+    values = frappe.db.get_value("Daily Audit Template", template,
+        ["restaurant", "applies_to_all_restaurants"], as_dict=True)
+    if not values or not (values.applies_to_all_restaurants or values.restaurant):
+        return []
+
+    restaurant_condition = "" if values.applies_to_all_restaurants else "AND re.parent = %(restaurant)s"
+    return frappe.db.sql(f"""
+        SELECT DISTINCT e.user_id
+        FROM `tabRestaurant Employee` re
+        INNER JOIN `tabEmployee` e ON e.name = re.employee
+        WHERE re.parenttype = 'Restaurant'
+            AND re.is_active = 1
+            AND re.employee_status = 'Active'
+            AND e.status = 'Active'
+            AND e.user_id IS NOT NULL
+            {restaurant_condition}
+    """, {"restaurant": values.restaurant}, pluck=True)
@@ -0,0 +1,97 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Static translation bundles.
+
+`translations/<lang>.csv` stays the editable source. This module compiles
+each CSV into a minified JSON file with a content hash in its name,
+
+    public/translations/<lang>.<hash>.json
+
+plus `public/translations/manifest.json` mapping each language to its file.
+Both are served by nginx from `/assets/restaurant_audit/translations/`, so
+pages load translations without reaching a Python worker.
+
+Bundles are compiled by `bench build` (through the `build` script in
+package.json), after every migrate, and on demand with
+`bench build-translation-bundles`. Only the standard library is used so the
+build script runs without a site.
+"""
+
+import csv
+import glob
+import hashlib
+import json
+import os
+
+APP_PATH = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FOLDER = os.path.join(APP_PATH, "translations")
+BUNDLE_FOLDER = os.path.join(APP_PATH, "public", "translations")
+MANIFEST_FILE = "manifest.json"
+
+
+def parse_translation_file(path):
+    translations = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for row in csv.reader(file):
+            if len(row) >= 2 and not row[0].startswith("#"):
+                translations[row[0]] = row[1]
+    return translations
+
+
+def build_bundles(source_folder=SOURCE_FOLDER, bundle_folder=BUNDLE_FOLDER):
+    """Compile every CSV into a hashed bundle and write the manifest.
+
+    Bundles that are no longer referenced are removed. Returns the manifest.
+    """
+    os.makedirs(bundle_folder, exist_ok=True)
+
+    manifest = {}
+    for path in sorted(glob.glob(os.path.join(source_folder, "*.csv"))):
+        lang = os.path.splitext(os.path.basename(path))[0]
+        content = json.dumps(
+            parse_translation_file(path), sort_keys=True, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        filename = f"{lang}.{hashlib.sha1(content).hexdigest()[:12]}.json"
+
+        if not os.path.exists(os.path.join(bundle_folder, filename)):
+            write_file(os.path.join(bundle_folder, filename), content)
+        manifest[lang] = filename
+
+    # The manifest goes last so it never points at a bundle not yet written
+    write_file(
+        os.path.join(bundle_folder, MANIFEST_FILE),
+        json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode("utf-8"),
+    )
+
+    current = set(manifest.values()) | {MANIFEST_FILE}
+    for path in glob.glob(os.path.join(bundle_folder, "*.json")):
+        if os.path.basename(path) not in current:
+            os.remove(path)
+
+    return manifest
+
+
+def get_manifest(bundle_folder=BUNDLE_FOLDER):
+    """{lang: bundle filename} of the last build, or {} when bundles are not built"""
+    try:
+        with open(os.path.join(bundle_folder, MANIFEST_FILE), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_file(path, content):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+
+def after_migrate():
+    build_bundles()
+
+
+if __name__ == "__main__":
+    for lang, filename in build_bundles().items():
+        print(f"restaurant_audit: translations/{lang}.csv -> public/translations/{filename}")
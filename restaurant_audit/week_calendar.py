@@ -0,0 +1,198 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Auditor week calendars.
+
+Every employee's week starts on the `start_week_day` set on most of their
+active Restaurant Employee rows; a tie goes to the day earliest in the week
+(Monday first), and Monday is used when none is set. The rule depends only
+on the set of active rows, not on which Restaurant was saved last. The
+rules of all employees, also keyed by their user, are loaded with one query
+and cached in Redis, so week math costs no query per call. The cache is
+cleared whenever a Restaurant, and so its employee table, is saved or
+deleted.
+
+`get_week_windows` computes week start and end dates for any number of
+(date, rule) pairs in one vectorized NumPy pass, for bulk scheduling and
+recomputation of stored week fields.
+
+When week start days change, `recompute_visit_weeks` rewrites the stored
+week fields of the affected auditors' recent and upcoming Scheduled Audit
+Visits in one UPDATE per rule.
+
+The Weekly Audit Rollup keeps Monday-based weeks; only per-auditor weeks
+come from here.
+"""
+
+from collections import Counter
+
+import frappe
+import numpy as np
+from frappe.utils import add_days, getdate
+
+WEEK_RULES_CACHE_KEY = "restaurant_audit:week_start_rules"
+
+DEFAULT_WEEK_START_DAY = "Monday"
+WEEKDAY_NUMBERS = {
+    "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
+    "Friday": 4, "Saturday": 5, "Sunday": 6
+}
+
+# 1970-01-01, day zero of datetime64[D], was a Thursday
+EPOCH_WEEKDAY = 3
+
+# Visits this many days back are recomputed too, so the current week is covered
+RECENT_DAYS = 28
+
+
+def get_week_start_rules():
+    """{"employees": {employee: day}, "users": {user: day}} of employees with a week start day set"""
+    return frappe.cache().get_value(WEEK_RULES_CACHE_KEY, _load_week_start_rules)
+
+
+def _load_week_start_rules():
+    day_counts, employee_users = {}, {}
+    for employee, user, day in frappe.db.sql("""
+        SELECT re.employee, e.user_id, re.start_week_day
+        FROM `tabRestaurant Employee` re
+        LEFT JOIN `tabEmployee` e ON e.name = re.employee
+        WHERE re.parenttype = 'Restaurant'
+            AND re.is_active = 1
+            AND IFNULL(re.start_week_day, '') != ''
+    """):
+        day_counts.setdefault(employee, Counter())[day] += 1
+        if user:
+            employee_users[employee] = user
+
+    rules = {"employees": {}, "users": {}}
+    for employee in sorted(day_counts):
+        rules["employees"][employee] = pick_week_start_day(day_counts[employee])
+        if employee in employee_users:
+            rules["users"].setdefault(employee_users[employee], rules["employees"][employee])
+    return rules
+
+
+def pick_week_start_day(day_counts):
+    """The most common day of a Counter of week start days, ties going to the earliest in the week"""
+    return min(day_counts, key=lambda day: (-day_counts[day], WEEKDAY_NUMBERS.get(day, 7)))
+
+
+def clear_week_start_rules(doc=None, method=None):
+    frappe.cache().delete_value(WEEK_RULES_CACHE_KEY)
+
+
+def get_week_start_day(employee=None, user=None):
+    """Week start day of an employee, or of the employee linked to a user"""
+    rules = get_week_start_rules()
+    if employee:
+        return rules["employees"].get(employee, DEFAULT_WEEK_START_DAY)
+    return rules["users"].get(user or frappe.session.user, DEFAULT_WEEK_START_DAY)
+
+
+def get_week_start(reference_date, week_start_day=DEFAULT_WEEK_START_DAY):
+    """Start of the week containing `reference_date` for weeks starting on `week_start_day`"""
+    reference_date = getdate(reference_date)
+    target = WEEKDAY_NUMBERS.get(week_start_day, 0)
+    return add_days(reference_date, -((reference_date.weekday() - target) % 7))
+
+
+def get_week(reference_date=None, week_start_day=DEFAULT_WEEK_START_DAY):
+    """(week_start, week_end) of the week containing `reference_date`"""
+    week_start = get_week_start(reference_date or getdate(), week_start_day)
+    return week_start, add_days(week_start, 6)
+
+
+def get_employee_week(employee, reference_date=None):
+    return get_week(reference_date, get_week_start_day(employee=employee))
+
+
+def get_user_week(user=None, reference_date=None):
+    return get_week(reference_date, get_week_start_day(user=user))
+
+
+def get_week_windows(dates, week_start_days):
+    """Week starts and ends for parallel lists of dates and week start days.
+
+    `week_start_days` may also be a single day for all dates. Returns two
+    lists of `datetime.date`.
+    """
+    if not len(dates):
+        return [], []
+
+    days = np.array([getdate(d) for d in dates], dtype="datetime64[D]")
+    if isinstance(week_start_days, str):
+        targets = WEEKDAY_NUMBERS.get(week_start_days, 0)
+    else:
+        targets = np.array([WEEKDAY_NUMBERS.get(day, 0) for day in week_start_days])
+
+    weekdays = (days.astype(np.int64) + EPOCH_WEEKDAY) % 7
+    starts = days - ((weekdays - targets) % 7).astype("timedelta64[D]")
+    ends = starts + np.timedelta64(6, "D")
+
+    return starts.astype(object).tolist(), ends.astype(object).tolist()
+
+
+def get_user_week_windows(users, dates):
+    """Week starts and ends of each (user, date) pair under that user's rule"""
+    rules = get_week_start_rules()["users"]
+    return get_week_windows(dates, [rules.get(user, DEFAULT_WEEK_START_DAY) for user in users])
+
+
+def enqueue_visit_week_recompute(employees):
+    """Recompute week fields of the employees' visits in the background, after commit"""
+    frappe.enqueue(
+        "restaurant_audit.week_calendar.recompute_visit_weeks",
+        queue="short",
+        enqueue_after_commit=True,
+        employees=sorted(employees),
+        notify_user=frappe.session.user,
+    )
+
+
+def recompute_visit_weeks(employees, from_date=None, notify_user=None):
+    """Rewrite week_start_date / week_end_date of the employees' visits from `from_date` on.
+
+    Visits of all auditors sharing a week start day are updated by one
+    set-based UPDATE, and only rows whose week actually moves are touched.
+    Defaults to the last RECENT_DAYS days. Returns the number of rows changed.
+    """
+    clear_week_start_rules()
+    from_date = getdate(from_date) if from_date else add_days(getdate(), -RECENT_DAYS)
+
+    users_by_day = {}
+    for employee, user in frappe.get_all("Employee",
+        filters={"name": ["in", list(employees)], "user_id": ["is", "set"]},
+        fields=["name", "user_id"],
+        as_list=True
+    ):
+        users_by_day.setdefault(get_week_start_day(employee=employee), []).append(user)
+
+    changed = 0
+    week_start = "DATE_SUB(visit_date, INTERVAL MOD(WEEKDAY(visit_date) - %(target)s + 7, 7) DAY)"
+    stale = f"""
+        auditor IN %(users)s
+        AND visit_date >= %(from_date)s
+        AND NOT (week_start_date <=> {week_start})
+    """
+    for day, users in users_by_day.items():
+        params = {"users": tuple(users), "from_date": from_date, "target": WEEKDAY_NUMBERS.get(day, 0)}
+        count = frappe.db.sql(f"SELECT COUNT(*) FROM `tabScheduled Audit Visit` WHERE {stale}", params)[0][0]
+        if not count:
+            continue
+
+        frappe.db.sql(f"""
+            UPDATE `tabScheduled Audit Visit`
+            SET week_start_date = {week_start},
+                week_end_date = DATE_ADD({week_start}, INTERVAL 6 DAY)
+            WHERE {stale}
+        """, params)
+        changed += count
+
+    frappe.db.commit()
+
+    frappe.logger().info(f"Recomputed week fields of {changed} scheduled visits for {len(employees)} employees")
+    if notify_user:
+        frappe.publish_realtime("msgprint",
+            f"Week dates updated on {changed} scheduled audit visits", user=notify_user)
+
+    return changed
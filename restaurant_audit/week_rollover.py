@@ -0,0 +1,148 @@
+# Copyright (c) 2025, Restaurant Audit App and contributors
+# For license information, please see license.txt
+
+"""Closing of the previous audit week.
+
+Pending Scheduled Audit Visits become Overdue only through
+`mark_visits_overdue`, which changes them in one UPDATE and refreshes the
+Weekly Audit Rollup rows they belong to. `overdue_notified` is set once the
+auditor has been told about the visit.
+
+The daily status job marks every past-due visit and then records how last
+week ended through `process_last_week`. The week that was processed and the
+outcome are stored as a global default, so a week is recorded once even
+across Redis flushes, and a Redis lock keeps concurrent workers from racing
+on the same boundary. Pages read the stored outcome through
+`get_last_week_status` instead of triggering the work themselves.
+"""
+
+import json
+
+import frappe
+from frappe.utils import add_days, getdate, now
+
+from restaurant_audit.restaurant_audit.doctype.weekly_audit_rollup.weekly_audit_rollup import (
+    get_week_start,
+    refresh_rollups,
+)
+
+OUTCOME_GLOBAL = "restaurant_audit_last_week_outcome"
+OUTCOME_CACHE_KEY = "restaurant_audit:last_week_outcome"
+LOCK_KEY = "restaurant_audit:last_week_lock"
+LOCK_TIMEOUT = 10 * 60
+
+
+def get_last_week_bounds(reference_date=None):
+    last_week_start = add_days(get_week_start(reference_date or getdate()), -7)
+    return last_week_start, add_days(last_week_start, 6)
+
+
+def get_stored_outcome():
+    return frappe.cache().get_value(OUTCOME_CACHE_KEY, _load_stored_outcome)
+
+
+def _load_stored_outcome():
+    return json.loads(frappe.db.get_global(OUTCOME_GLOBAL) or "{}")
+
+
+def get_last_week_status(reference_date=None):
+    """Outcome of closing last week, or a zero outcome while it is not processed yet"""
+    last_week_start, last_week_end = get_last_week_bounds(reference_date)
+    outcome = get_stored_outcome()
+    if outcome.get("last_week_start") == str(last_week_start):
+        return outcome
+
+    return {
+        "success": True,
+        "processed": False,
+        "updates_made": 0,
+        "overdue_scheduled": 0,
+        "incomplete_daily": 0,
+        "last_week_start": str(last_week_start),
+        "last_week_end": str(last_week_end),
+    }
+
+
+def mark_visits_overdue(filters, notified=0):
+    """Mark the Pending visits matching `filters` Overdue in one UPDATE; returns those visits"""
+    visits = frappe.get_all("Scheduled Audit Visit",
+        filters={**filters, "status": "Pending"},
+        fields=["name", "restaurant", "restaurant_name", "auditor", "visit_date"]
+    )
+    if not visits:
+        return []
+
+    frappe.db.sql("""
+        UPDATE `tabScheduled Audit Visit`
+        SET status = 'Overdue', overdue_notified = %(notified)s, modified = %(modified)s
+        WHERE name IN %(names)s AND status = 'Pending'
+    """, {"notified": notified, "modified": now(), "names": tuple(v.name for v in visits)})
+
+    refresh_rollups({
+        (v.restaurant, v.auditor, get_week_start(v.visit_date))
+        for v in visits if v.restaurant and v.auditor
+    })
+
+    return visits
+
+
+def set_overdue_notified(visits):
+    """Record that the auditors of these Overdue visits have been notified"""
+    if visits:
+        frappe.db.sql("""
+            UPDATE `tabScheduled Audit Visit`
+            SET overdue_notified = 1
+            WHERE name IN %(names)s
+        """, {"names": tuple(v.name for v in visits)})
+
+
+def process_last_week(reference_date=None):
+    """Record how last week ended, once per week; returns the outcome.
+
+    Runs after past-due visits have been marked, so every visit of last week
+    that was still Pending is Overdue by now.
+    """
+    last_week_start, last_week_end = get_last_week_bounds(reference_date)
+    outcome = get_stored_outcome()
+    if outcome.get("last_week_start") == str(last_week_start):
+        return outcome
+
+    cache = frappe.cache()
+    lock = cache.lock(cache.make_key(LOCK_KEY), timeout=LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return get_last_week_status(reference_date)
+
+    try:
+        # Another worker may have finished while we waited for the lock
+        frappe.db.rollback()
+        if _load_stored_outcome().get("last_week_start") == str(last_week_start):
+            cache.delete_value(OUTCOME_CACHE_KEY)
+            return get_stored_outcome()
+
+        overdue = frappe.db.count("Scheduled Audit Visit", {
+            "visit_date": ["between", [last_week_start, last_week_end]],
+            "status": "Overdue"
+        })
+
+        outcome = {
+            "success": True,
+            "processed": True,
+            "updates_made": overdue,
+            "overdue_scheduled": overdue,
+            "incomplete_daily": frappe.db.count("Audit Progress", {
+                "audit_date": ["between", [last_week_start, last_week_end]],
+                "is_completed": 0
+            }),
+            "last_week_start": str(last_week_start),
+            "last_week_end": str(last_week_end),
+            "processed_at": now(),
+        }
+
+        frappe.db.set_global(OUTCOME_GLOBAL, json.dumps(outcome))
+        frappe.db.commit()
+        cache.delete_value(OUTCOME_CACHE_KEY)
+
+        return outcome
+
+    finally:
+        lock.release()
@@ -0,0 +1,18 @@
+import frappe
+
+from restaurant_audit.page_state import dump_initial_state, get_audit_form_state
+
+no_cache = 1
+
+def get_context(context):
+    # Same login guard as the restaurants page
+    if frappe.session.user == "Guest":
+        frappe.local.response["type"] = "redirect"
+        frappe.local.response["location"] = "/audit-login"
+        raise frappe.Redirect
+
+    # Restaurant and checklist of the audit being opened, so the form renders without API calls
+    context.initial_state = dump_initial_state(get_audit_form_state(
+        restaurant=frappe.form_dict.get("restaurant"),
+        progress_id=frappe.form_dict.get("progress_id")
+    ))
@@ -1,9 +1,20 @@
 import frappe
 
+from restaurant_audit.page_state import dump_initial_state, get_audit_restaurants_state
+
+no_cache = 1
+
 def get_context(context):
     # This script runs before the page is loaded.
     # If the user is a "Guest" (not logged in), redirect them to your custom login page.
     if frappe.session.user == "Guest":
         frappe.local.response["type"] = "redirect"
         frappe.local.response["location"] = "/audit-login"
-        raise frappe.Redirect
\ No newline at end of file
+        raise frappe.Redirect
+
+    # Realtime namespace for daily template open/close events
+    context.sitename = frappe.local.site
+    context.socketio_port = frappe.conf.socketio_port or 9000
+
+    # Everything the page shows on load, so it renders without API calls
+    context.initial_state = dump_initial_state(get_audit_restaurants_state())
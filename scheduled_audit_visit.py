@@ -9,15 +9,12 @@ class ScheduledAuditVisit(Document):
     def before_save(self):
         """Calculate week start and end dates based on visit_date"""
         if self.visit_date:
-            visit_date = frappe.utils.getdate(self.visit_date)
+            from restaurant_audit.week_calendar import get_week, get_week_start_day
             
-            # Calculate week start (Monday) and end (Sunday)
-            days_since_monday = visit_date.weekday()
-            week_start = visit_date - timedelta(days=days_since_monday)
-            week_end = week_start + timedelta(days=6)
-            
-            self.week_start_date = week_start
-            self.week_end_date = week_end
+            # Week under the auditor's week start day (Monday without one)
+            self.week_start_date, self.week_end_date = get_week(
+                self.visit_date, get_week_start_day(user=self.auditor)
+            )
     
     def autoname(self):
         """Generate unique name based on restaurant and visit date"""
@@ -10,32 +10,9 @@ def get_week_start_for_employee(employee_id, reference_date=None):
     """
     Get the week start date for an employee based on their start_week_day preference
     """
-    if not reference_date:
-        reference_date = getdate()
+    from restaurant_audit.week_calendar import get_employee_week
     
-    # Get employee's start_week_day from Restaurant Employee table
-    employee_week_start = frappe.db.get_value("Restaurant Employee", 
-        {"employee": employee_id, "is_active": 1}, 
-        "start_week_day"
-    )
-    
-    if not employee_week_start:
-        # Default to Monday if not set
-        employee_week_start = "Monday"
-    
-    # Map day names to weekday numbers (Monday=0, Sunday=6)
-    day_mapping = {
-        "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
-        "Friday": 4, "Saturday": 5, "Sunday": 6
-    }
-    
-    target_weekday = day_mapping.get(employee_week_start, 0)
-    current_weekday = reference_date.weekday()
-    
-    # Calculate days to subtract to get to the start of the week
-    days_to_subtract = (current_weekday - target_weekday) % 7
-    
-    return add_days(reference_date, -days_to_subtract)
+    return get_employee_week(employee_id, reference_date)[0]
 
 def get_week_end_for_employee(employee_id, week_start):
     """